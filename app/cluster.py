@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import json
+import logging
+from typing import AsyncIterator, Iterable, Mapping
+
+import httpx
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+
+from .models import HostConfig
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+# response headers worth passing back from a node
+_FORWARDED_HEADERS = ("etag", "x-history-cursor", "x-history-reset")
+
+
+class HashRing:
+    """Consistent hash ring mapping host addresses to node URLs.
+
+    Each node is placed at ``replicas`` points so that adding or removing a
+    node only moves the addresses between it and its neighbours. Addresses
+    in ``groups`` are hashed by their group's key instead (see
+    :func:`parent_groups`), so a parent and its children share a node.
+    """
+
+    def __init__(
+        self, nodes: Iterable[str], replicas: int = 160, groups: Mapping[str, str] | None = None
+    ) -> None:
+        self.nodes = sorted(set(nodes))
+        self.groups = dict(groups or {})
+        points = [
+            (_hash(f"{node}#{replica}"), node)
+            for node in self.nodes
+            for replica in range(replicas)
+        ]
+        points.sort()
+        self._keys = [key for key, _node in points]
+        self._owners = [node for _key, node in points]
+
+    def owner(self, address: str) -> str:
+        if not self._keys:
+            raise ValueError("Hash ring has no nodes")
+        key = self.groups.get(address, address)
+        index = bisect.bisect(self._keys, _hash(key)) % len(self._keys)
+        return self._owners[index]
+
+
+def parent_groups(hosts: Iterable[HostConfig]) -> dict[str, str]:
+    """Map every host with a ``parent`` to the address at the top of its parent chain.
+
+    A node only sees its own hosts' statuses, so a child is only suppressed
+    while its parent is down if both are polled by the same node.
+    """
+
+    parents = {host.address: host.parent for host in hosts if host.parent}
+    groups: dict[str, str] = {}
+    for address in parents:
+        root, seen = address, {address}
+        while (parent := parents.get(root)) is not None and parent not in seen:
+            seen.add(parent)
+            root = parent
+        if root in parents:
+            # a misconfigured cycle has no top; its members share its smallest address
+            cycle, member = [root], parents[root]
+            while member != root:
+                cycle.append(member)
+                member = parents[member]
+            root = min(cycle)
+        groups[address] = root
+    return groups
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+def cluster_front() -> bool:
+    """True for an instance that only aggregates the nodes listed in ``cluster_nodes``."""
+
+    return bool(settings.cluster_nodes) and not settings.cluster_self
+
+
+class ClusterClient:
+    """Fans API reads out to the node owning each host and merges the answers."""
+
+    def __init__(
+        self,
+        nodes: Iterable[str],
+        groups: Mapping[str, str] | None = None,
+        timeout: float = 10.0,
+    ) -> None:
+        self.ring = HashRing(nodes, groups=groups)
+        self._client = httpx.AsyncClient(timeout=timeout)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    async def hosts(self, reachable_only: bool) -> list[dict]:
+        """Every node's host list, concatenated; unreachable nodes are skipped."""
+
+        async def _fetch(node: str) -> list[dict]:
+            try:
+                response = await self._client.get(
+                    f"{node}/api/hosts", params={"reachable_only": str(reachable_only).lower()}
+                )
+                response.raise_for_status()
+                return response.json()
+            except httpx.HTTPError as exc:
+                logger.warning("Cluster node %s unavailable: %s", node, exc)
+                return []
+
+        results = await asyncio.gather(*(_fetch(node) for node in self.ring.nodes))
+        return [host for hosts in results for host in hosts]
+
+    async def forward(self, request: Request, address: str) -> Response:
+        """Send ``request`` to the node that owns ``address`` and relay its response."""
+
+        node = self.ring.owner(address)
+        try:
+            response = await self._client.request(
+                request.method,
+                f"{node}{request.url.path}",
+                params=request.query_params,
+                content=await request.body(),
+                headers={"content-type": request.headers.get("content-type", "application/json")},
+            )
+        except httpx.HTTPError as exc:
+            raise HTTPException(status_code=502, detail=f"Cluster node {node} unavailable: {exc}")
+        headers = {
+            name: response.headers[name] for name in _FORWARDED_HEADERS if name in response.headers
+        }
+        return Response(
+            content=response.content,
+            status_code=response.status_code,
+            media_type=response.headers.get("content-type"),
+            headers=headers,
+        )
+
+    async def host(self, address: str) -> dict | None:
+        node = self.ring.owner(address)
+        try:
+            response = await self._client.get(f"{node}/api/hosts/{address}")
+        except httpx.HTTPError:
+            return None
+        return response.json() if response.status_code == 200 else None
+
+    async def stream(self, address: str | None = None) -> AsyncIterator[str]:
+        """One merged SSE stream: a combined snapshot, then every node's deltas.
+
+        With ``address`` the owning node's stream is relayed unchanged.
+        """
+
+        if address is not None:
+            node = self.ring.owner(address)
+            async with self._client.stream(
+                "GET", f"{node}/api/stream", params={"address": address}, timeout=None
+            ) as response:
+                async for chunk in response.aiter_text():
+                    yield chunk
+            return
+
+        frames: asyncio.Queue[str] = asyncio.Queue()
+
+        async def _relay(node: str) -> None:
+            # addresses this node has reported, to resync after a reconnect
+            known: set[str] = set()
+            while True:
+                try:
+                    async with self._client.stream(
+                        "GET", f"{node}/api/stream", timeout=None
+                    ) as response:
+                        event, data = None, []
+                        async for line in response.aiter_lines():
+                            if line.startswith("event:"):
+                                event = line[6:].strip()
+                            elif line.startswith("data:"):
+                                data.append(line[5:].strip())
+                            elif not line:
+                                if event in ("snapshot", "update", "removed"):
+                                    for frame in _relayed_frames(event, "".join(data), known):
+                                        await frames.put(frame)
+                                event, data = None, []
+                except httpx.HTTPError as exc:
+                    logger.warning("Cluster stream from %s lost: %s", node, exc)
+                await asyncio.sleep(5)
+
+        relays = [asyncio.create_task(_relay(node)) for node in self.ring.nodes]
+        try:
+            snapshot = await self.hosts(reachable_only=False)
+            yield f"event: snapshot\ndata: {json.dumps(snapshot, separators=(',', ':'))}\n\n"
+            while True:
+                try:
+                    yield await asyncio.wait_for(frames.get(), 15.0)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            for relay in relays:
+                relay.cancel()
+            await asyncio.gather(*relays, return_exceptions=True)
+
+
+def _relayed_frames(event: str, data: str, known: set[str]) -> list[str]:
+    """Translate one node's SSE event into frames for the merged stream.
+
+    A node's ``snapshot`` (sent on every reconnect) only covers its own hosts,
+    so it becomes an ``update`` for those hosts plus a ``removed`` for hosts
+    it reported before but no longer has; ``known`` tracks that set.
+    """
+
+    payload = json.loads(data)
+    if event == "removed":
+        known.difference_update(payload)
+        return [f"event: removed\ndata: {data}\n\n"]
+    addresses = {host["address"] for host in payload}
+    frames = [f"event: update\ndata: {data}\n\n"] if payload else []
+    if event == "snapshot":
+        gone = sorted(known - addresses)
+        if gone:
+            frames.append(f"event: removed\ndata: {json.dumps(gone, separators=(',', ':'))}\n\n")
+        known.clear()
+    known.update(addresses)
+    return frames
+
+
+router = APIRouter()
+
+
+def _cluster(request: Request) -> ClusterClient:
+    return request.app.state.cluster
+
+
+@router.get("/api/hosts")
+async def cluster_hosts(request: Request, reachable_only: bool = True):
+    hosts = await _cluster(request).hosts(reachable_only)
+    return Response(
+        content=json.dumps(hosts, separators=(",", ":")), media_type="application/json"
+    )
+
+
+@router.get("/api/stream")
+async def cluster_stream(request: Request, address: str | None = None):
+    return StreamingResponse(
+        _cluster(request).stream(address),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/api/hosts")
+async def cluster_add_hosts():
+    # the dashboard hides the add form on a front; this covers direct API calls
+    raise HTTPException(
+        status_code=501, detail="Add hosts through hosts.yaml or the API of the cluster nodes"
+    )
+
+
+@router.get("/api/hosts/{address}")
+@router.delete("/api/hosts/{address}")
+@router.get("/api/hosts/{address}/history")
+@router.get("/api/hosts/{address}/interfaces")
+async def cluster_forward(address: str, request: Request):
+    return await _cluster(request).forward(request, address)
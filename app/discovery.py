@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Iterable
+
+from .models import DiscoveryJobStatus
+
+logger = logging.getLogger(__name__)
+
+Probe = Callable[[str], Awaitable[bool]]
+Wanted = Callable[[str], bool]
+OnFound = Callable[[str], Awaitable[bool]]
+
+_job_ids = itertools.count(1)
+
+
+class DiscoveryJob:
+    """A rate-limited ping sweep over a range of addresses.
+
+    Probes are paced to ``rate`` per second with at most ``concurrency``
+    outstanding; each responding address is handed to ``on_found``, which
+    returns whether it was newly registered. Addresses ``wanted`` rejects
+    (already monitored, or owned by another node) are not probed but still
+    count as swept and skipped, so ``swept`` reaches ``total``.
+    """
+
+    def __init__(
+        self,
+        range_text: str,
+        addresses: Iterable[str],
+        total: int,
+        probe: Probe,
+        wanted: Wanted,
+        on_found: OnFound,
+        rate: float,
+        concurrency: int,
+    ) -> None:
+        self.status = DiscoveryJobStatus(
+            id=str(next(_job_ids)), range=range_text, total=total, rate=rate
+        )
+        self._addresses = addresses
+        self._probe = probe
+        self._wanted = wanted
+        self._on_found = on_found
+        self._concurrency = max(1, concurrency)
+        self.task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self.task = asyncio.create_task(self._run())
+        self.task.add_done_callback(self._on_done)
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        # a job cancelled before its first step never reaches _run's handlers
+        if self.status.state == "running":
+            self.status.state = "cancelled"
+            self.status.finished_at = datetime.utcnow()
+
+    def cancel(self) -> bool:
+        if self.task is None or self.task.done():
+            return False
+        self.task.cancel()
+        return True
+
+    async def _run(self) -> None:
+        status = self.status
+        slots = asyncio.Semaphore(self._concurrency)
+        pending: set[asyncio.Task] = set()
+        spacing = 1.0 / status.rate
+        next_send = time.monotonic()
+        try:
+            for address in self._addresses:
+                if not self._wanted(address):
+                    status.swept += 1
+                    status.skipped += 1
+                    continue
+                delay = next_send - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                # a sweep held up by the concurrency limit does not burst to catch up
+                next_send = max(next_send + spacing, time.monotonic())
+                await slots.acquire()
+                task = asyncio.create_task(self._sweep_one(address, slots))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+            status.state = "completed"
+        except asyncio.CancelledError:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            status.state = "cancelled"
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.exception("Discovery job %s failed", status.id)
+            status.state = "failed"
+            status.error = str(exc)
+        finally:
+            status.finished_at = datetime.utcnow()
+
+    async def _sweep_one(self, address: str, slots: asyncio.Semaphore) -> None:
+        status = self.status
+        # the slot is held until the found host is registered, too
+        try:
+            try:
+                alive = await self._probe(address)
+            except Exception as exc:  # pragma: no cover - network dependent
+                logger.debug("Discovery probe of %s failed: %s", address, exc)
+                alive = False
+            status.swept += 1
+            if not alive:
+                return
+            status.responded += 1
+            if await self._on_found(address):
+                status.added += 1
+                status.hosts.append(address)
+            else:
+                status.skipped += 1
+        finally:
+            slots.release()
+
+
+class DiscoveryManager:
+    """Starts discovery jobs and keeps the most recent ones for the status API."""
+
+    def __init__(self, probe: Probe, keep: int = 20) -> None:
+        self._probe = probe
+        self._keep = keep
+        self._jobs: OrderedDict[str, DiscoveryJob] = OrderedDict()
+
+    def start(
+        self,
+        range_text: str,
+        addresses: Iterable[str],
+        total: int,
+        wanted: Wanted,
+        on_found: OnFound,
+        rate: float,
+        concurrency: int,
+    ) -> DiscoveryJobStatus:
+        job = DiscoveryJob(
+            range_text, addresses, total, self._probe, wanted, on_found, rate, concurrency
+        )
+        self._jobs[job.status.id] = job
+        self._prune()
+        job.start()
+        return job.status
+
+    def get(self, job_id: str) -> DiscoveryJobStatus | None:
+        job = self._jobs.get(job_id)
+        return job.status if job else None
+
+    def jobs(self) -> list[DiscoveryJobStatus]:
+        return [job.status for job in reversed(self._jobs.values())]
+
+    def cancel(self, job_id: str) -> bool:
+        job = self._jobs.get(job_id)
+        return job.cancel() if job else False
+
+    async def stop(self) -> None:
+        tasks = [job.task for job in self._jobs.values() if job.cancel() and job.task]
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _prune(self) -> None:
+        finished = [
+            job_id for job_id, job in self._jobs.items() if job.status.state != "running"
+        ]
+        for job_id in finished[: max(0, len(self._jobs) - self._keep)]:
+            del self._jobs[job_id]
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import AsyncIterator, Iterable
+
+from .models import HostStatus
+
+
+class _Subscriber:
+    """Pending per-host changes for one client; newer updates replace older ones."""
+
+    __slots__ = ("address", "pending", "ready")
+
+    def __init__(self, address: str | None) -> None:
+        self.address = address
+        # address -> serialized status, or None when the host was removed
+        self.pending: dict[str, dict | None] = {}
+        self.ready = asyncio.Event()
+
+    def push(self, address: str, payload: dict | None) -> None:
+        if self.address is not None and address != self.address:
+            return
+        self.pending[address] = payload
+        self.ready.set()
+
+    def drain(self) -> dict[str, dict | None]:
+        pending, self.pending = self.pending, {}
+        self.ready.clear()
+        return pending
+
+
+class StatusBroadcaster:
+    """Fans host status changes out to server-sent-event subscribers.
+
+    Each status is serialized once per change regardless of how many clients
+    are connected, and a slow client only ever receives the latest state of
+    each host it has not yet been sent.
+    """
+
+    def __init__(self, keepalive_seconds: float = 15.0) -> None:
+        self.keepalive_seconds = keepalive_seconds
+        self._subscribers: set[_Subscriber] = set()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, status: HostStatus) -> None:
+        if not self._subscribers:
+            return
+        payload = status.model_dump(mode="json")
+        for subscriber in self._subscribers:
+            subscriber.push(status.address, payload)
+
+    def publish_removed(self, address: str) -> None:
+        for subscriber in self._subscribers:
+            subscriber.push(address, None)
+
+    async def stream(
+        self,
+        snapshot: Iterable[HostStatus],
+        address: str | None = None,
+    ) -> AsyncIterator[str]:
+        """Yield SSE frames: a ``snapshot`` first, then coalesced ``update``/``removed`` events."""
+
+        subscriber = _Subscriber(address)
+        self._subscribers.add(subscriber)
+        try:
+            initial = [
+                status.model_dump(mode="json")
+                for status in snapshot
+                if address is None or status.address == address
+            ]
+            yield _frame("snapshot", initial)
+            while True:
+                try:
+                    await asyncio.wait_for(subscriber.ready.wait(), self.keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                changes = subscriber.drain()
+                updates = [payload for payload in changes.values() if payload is not None]
+                removed = [key for key, payload in changes.items() if payload is None]
+                if updates:
+                    yield _frame("update", updates)
+                if removed:
+                    yield _frame("removed", removed)
+        finally:
+            self._subscribers.discard(subscriber)
+
+
+def _frame(event: str, data: object) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
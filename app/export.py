@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+from .history import FLOAT_FIELDS, INT_FIELDS, to_epoch
+from .models import ExportStats, HostStatus
+
+logger = logging.getLogger(__name__)
+
+_SPILL_SUFFIX = ".lp"
+
+
+def _escape_tag(value: str) -> str:
+    return value.replace("\\", "\\\\").replace(",", "\\,").replace("=", "\\=").replace(" ", "\\ ")
+
+
+def to_line(measurement: str, status: HostStatus, timestamp: datetime) -> str:
+    """One Influx line-protocol point for a recorded sample, with a nanosecond timestamp."""
+
+    fields = [
+        f"{name}={float(value)!r}"
+        for name in FLOAT_FIELDS
+        # line protocol has no representation for NaN or infinity
+        if (value := getattr(status, name)) is not None and math.isfinite(value)
+    ]
+    fields.extend(
+        f"{name}={value}i" for name in INT_FIELDS if (value := getattr(status, name)) is not None
+    )
+    fields.append(f"reachable={int(status.reachable)}i")
+    tags = f"address={_escape_tag(status.address)},name={_escape_tag(status.name or status.address)}"
+    nanoseconds = round(to_epoch(timestamp) * 1_000_000) * 1000
+    return f"{_escape_tag(measurement)},{tags} {','.join(fields)} {nanoseconds}"
+
+
+class SampleExporter:
+    """Pushes every recorded sample to a time-series database in Influx line protocol.
+
+    Samples are formatted as they are recorded and held in a bounded buffer; a
+    flush task posts them ``batch_size`` lines at a time whenever a full batch
+    is waiting, or every ``flush_seconds`` otherwise, over one pooled HTTP
+    client. A batch the receiver does not accept is written to ``spill_dir``
+    and resent, oldest first, once the receiver answers again. When the buffer
+    or the spill directory is full the oldest samples are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        measurement: str = "host",
+        batch_size: int = 5000,
+        flush_seconds: float = 5.0,
+        buffer_size: int = 100_000,
+        spill_dir: Path | None = None,
+        spill_max_bytes: int = 256 * 1024 * 1024,
+        authorization: str | None = None,
+        timeout: float = 10.0,
+    ) -> None:
+        self.url = url
+        self.measurement = measurement
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self.buffer_size = max(self.batch_size, buffer_size)
+        self.spill_dir = spill_dir
+        self.spill_max_bytes = spill_max_bytes
+        self._headers = {"Content-Type": "text/plain; charset=utf-8"}
+        if authorization:
+            self._headers["Authorization"] = authorization
+        self._timeout = timeout
+        self._buffer: deque[str] = deque()
+        self._ready = asyncio.Event()
+        self._http: httpx.AsyncClient | None = None
+        self._task: asyncio.Task | None = None
+        # spill segment paths oldest first, with their line counts and sizes
+        self._segments: deque[tuple[Path, int, int]] = deque()
+        self.stats = ExportStats()
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._http = httpx.AsyncClient(
+            timeout=self._timeout, limits=httpx.Limits(max_connections=1)
+        )
+        if self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            self._load_segments()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Send what is buffered within ``timeout``; spill whatever is left."""
+
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        try:
+            await asyncio.wait_for(self._flush(complete=True), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Sample export did not finish flushing at shutdown")
+        while self._buffer and self.spill_dir is not None:
+            await self._spill(self._take())
+        if self._buffer:
+            self.stats.dropped += len(self._buffer)
+            self._buffer.clear()
+        assert self._http is not None
+        await self._http.aclose()
+        self._http = None
+
+    def submit(self, status: HostStatus, timestamp: datetime) -> None:
+        """Queue one sample; never blocks, dropping the oldest when the buffer is full."""
+
+        if len(self._buffer) >= self.buffer_size:
+            self._buffer.popleft()
+            self.stats.dropped += 1
+        self._buffer.append(to_line(self.measurement, status, timestamp))
+        if len(self._buffer) >= self.batch_size:
+            self._ready.set()
+
+    def snapshot(self) -> ExportStats:
+        self.stats.queued = len(self._buffer)
+        self.stats.spilled_lines = sum(lines for _path, lines, _size in self._segments)
+        self.stats.spill_bytes = sum(size for _path, _lines, size in self._segments)
+        return self.stats
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._ready.wait(), self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._ready.clear()
+            try:
+                await self._flush()
+            except Exception:  # pragma: no cover - defensive
+                logger.exception("Sample export flush failed")
+
+    async def _flush(self, complete: bool = False) -> None:
+        healthy = await self._drain_spill()
+        while self._buffer:
+            batch = self._take()
+            if healthy:
+                try:
+                    healthy = await self._send(batch)
+                except asyncio.CancelledError:
+                    # stop() sends or spills it
+                    self._buffer.extendleft(reversed(batch))
+                    raise
+                if healthy:
+                    if not complete and len(self._buffer) < self.batch_size:
+                        # leave a partial batch for the next size or time trigger
+                        break
+                    continue
+            if self.spill_dir is None:
+                # nowhere to keep it; put it back and let the buffer bound apply
+                self._buffer.extendleft(reversed(batch))
+                while len(self._buffer) > self.buffer_size:
+                    self._buffer.popleft()
+                    self.stats.dropped += 1
+                break
+            await self._spill(batch)
+
+    def _take(self) -> list[str]:
+        count = min(self.batch_size, len(self._buffer))
+        return [self._buffer.popleft() for _ in range(count)]
+
+    async def _send(self, lines: list[str]) -> bool:
+        """Post one batch; ``False`` means the receiver is unavailable and it should be kept."""
+
+        assert self._http is not None
+        started = time.monotonic()
+        try:
+            response = await self._http.post(
+                self.url, content="\n".join(lines) + "\n", headers=self._headers
+            )
+        except httpx.HTTPError as exc:
+            self.stats.failed_batches += 1
+            self.stats.last_error = str(exc) or type(exc).__name__
+            logger.warning("Sample export to %s failed: %s", self.url, self.stats.last_error)
+            return False
+        if response.status_code == 429 or response.status_code >= 500:
+            self.stats.failed_batches += 1
+            self.stats.last_error = f"HTTP {response.status_code}"
+            logger.warning("Sample export to %s failed: HTTP %d", self.url, response.status_code)
+            return False
+        if response.status_code >= 400:
+            # resending a batch the receiver rejected as malformed cannot succeed
+            self.stats.rejected += len(lines)
+            self.stats.last_error = f"HTTP {response.status_code}: {response.text[:200]}"
+            logger.error("Sample export batch rejected: %s", self.stats.last_error)
+            return True
+        self.stats.sent += len(lines)
+        self.stats.batches += 1
+        self.stats.last_latency_s = time.monotonic() - started
+        return True
+
+    async def _drain_spill(self) -> bool:
+        while self._segments:
+            path, lines, size = self._segments[0]
+            try:
+                batch = (await asyncio.to_thread(path.read_text, "utf-8")).splitlines()
+            except OSError as exc:
+                logger.error("Unreadable export spill segment %s: %s", path, exc)
+                self.stats.dropped += lines
+                self._segments.popleft()
+                continue
+            if not await self._send(batch):
+                return False
+            self._segments.popleft()
+            await asyncio.to_thread(_unlink, path)
+        return True
+
+    async def _spill(self, lines: list[str]) -> None:
+        assert self.spill_dir is not None
+        path = self.spill_dir / f"{time.time_ns():020d}-{len(lines)}{_SPILL_SUFFIX}"
+        payload = "\n".join(lines) + "\n"
+        try:
+            size = await asyncio.to_thread(_write_segment, path, payload)
+        except OSError as exc:
+            logger.error("Could not spill %d export samples: %s", len(lines), exc)
+            self.stats.dropped += len(lines)
+            return
+        self._segments.append((path, len(lines), size))
+        total = sum(segment_size for _path, _lines, segment_size in self._segments)
+        while total > self.spill_max_bytes and len(self._segments) > 1:
+            oldest, oldest_lines, oldest_size = self._segments.popleft()
+            await asyncio.to_thread(_unlink, oldest)
+            self.stats.dropped += oldest_lines
+            total -= oldest_size
+
+    def _load_segments(self) -> None:
+        """Pick up segments spilled before a restart, oldest first."""
+
+        assert self.spill_dir is not None
+        for path in sorted(self.spill_dir.glob(f"*{_SPILL_SUFFIX}")):
+            try:
+                lines = int(path.stem.rsplit("-", 1)[1])
+                size = path.stat().st_size
+            except (IndexError, ValueError, OSError):
+                logger.warning("Ignoring unexpected file %s in export spill directory", path)
+                continue
+            self._segments.append((path, lines, size))
+
+
+def _write_segment(path: Path, payload: str) -> int:
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(payload, encoding="utf-8")
+    os.replace(temporary, path)
+    return path.stat().st_size
+
+
+def _unlink(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from array import array
+from datetime import datetime, timezone
+from typing import Iterable
+
+from .models import HostSample, HostStatus
+
+FLOAT_FIELDS = (
+    "latency_ms",
+    "latency_min_ms",
+    "latency_max_ms",
+    "packet_loss_pct",
+    "packet_success_pct",
+    "cpu_usage_pct",
+    "memory_used_pct",
+    "interface_temp_c",
+    "system_temp_c",
+    "interface_in_bps",
+    "interface_out_bps",
+)
+INT_FIELDS = ("packets_sent", "packets_received")
+
+
+def to_epoch(timestamp: datetime) -> float:
+    """Seconds since the epoch for the naive UTC datetimes used throughout the monitor."""
+
+    return timestamp.replace(tzinfo=timezone.utc).timestamp()
+
+
+def from_epoch(seconds: float) -> datetime:
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).replace(tzinfo=None)
+
+
+class StringTable:
+    """Interns PSU status tuples so each sample stores a small integer id."""
+
+    def __init__(self) -> None:
+        self._ids: dict[tuple[str, ...], int] = {(): 0}
+        self._values: list[tuple[str, ...]] = [()]
+
+    def intern(self, value: Iterable[str]) -> int:
+        key = tuple(value)
+        string_id = self._ids.get(key)
+        if string_id is None:
+            string_id = len(self._values)
+            self._ids[key] = string_id
+            self._values.append(key)
+        return string_id
+
+    def lookup(self, string_id: int) -> tuple[str, ...]:
+        return self._values[string_id]
+
+
+class HistoryBuffer:
+    """Fixed-capacity ring buffer of one host's samples, stored column by column.
+
+    Every metric lives in its own typed array; a per-column validity bitmap
+    records which slots hold ``None``. ``HostSample`` objects are only built
+    when :meth:`samples` is called.
+    """
+
+    __slots__ = (
+        "capacity",
+        "_strings",
+        "_start",
+        "_size",
+        "total",
+        "timestamps",
+        "columns",
+        "valid",
+        "reachable",
+        "psu",
+    )
+
+    def __init__(self, capacity: int, strings: StringTable) -> None:
+        self.capacity = max(1, capacity)
+        self._strings = strings
+        self._start = 0
+        self._size = 0
+        self.total = 0
+        bitmap_bytes = (self.capacity + 7) // 8
+        self.timestamps = array("d", bytes(8 * self.capacity))
+        self.columns: dict[str, array] = {
+            **{name: array("d", bytes(8 * self.capacity)) for name in FLOAT_FIELDS},
+            **{name: array("q", bytes(8 * self.capacity)) for name in INT_FIELDS},
+        }
+        self.valid = {name: bytearray(bitmap_bytes) for name in self.columns}
+        self.reachable = bytearray(bitmap_bytes)
+        self.psu = array("I", bytes(4 * self.capacity))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, status: HostStatus | HostSample, timestamp: datetime) -> None:
+        if self._size < self.capacity:
+            slot = (self._start + self._size) % self.capacity
+            self._size += 1
+        else:
+            slot = self._start
+            self._start = (self._start + 1) % self.capacity
+        self.total += 1
+
+        self.timestamps[slot] = to_epoch(timestamp)
+        for name, column in self.columns.items():
+            value = getattr(status, name)
+            if value is None:
+                _clear_bit(self.valid[name], slot)
+            else:
+                column[slot] = value
+                _set_bit(self.valid[name], slot)
+        if status.reachable:
+            _set_bit(self.reachable, slot)
+        else:
+            _clear_bit(self.reachable, slot)
+        self.psu[slot] = self._strings.intern(status.psu_statuses)
+
+    def _slots(self, skip: int = 0) -> Iterable[int]:
+        return ((self._start + offset) % self.capacity for offset in range(skip, self._size))
+
+    def samples(self, since: int | None = None) -> list[HostSample]:
+        """Materialize the buffered samples, oldest first.
+
+        ``since`` is a cursor (a previous value of :attr:`total`); only samples
+        appended after it are returned.
+        """
+
+        skip = 0
+        if since is not None:
+            oldest = self.total - self._size
+            skip = min(self._size, max(0, since - oldest))
+        samples: list[HostSample] = []
+        for slot in self._slots(skip):
+            psu_statuses = list(self._strings.lookup(self.psu[slot]))
+            metrics = {
+                name: column[slot] if _get_bit(self.valid[name], slot) else None
+                for name, column in self.columns.items()
+            }
+            samples.append(
+                HostSample(
+                    timestamp=from_epoch(self.timestamps[slot]),
+                    psu_status=", ".join(psu_statuses) if psu_statuses else None,
+                    psu_statuses=psu_statuses,
+                    reachable=_get_bit(self.reachable, slot),
+                    **metrics,
+                )
+            )
+        return samples
+
+
+class HistoryStore:
+    """Per-host history buffers sharing one PSU status intern table."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.strings = StringTable()
+        self._buffers: dict[str, HistoryBuffer] = {}
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._buffers
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def add(self, address: str) -> HistoryBuffer:
+        buffer = self._buffers.get(address)
+        if buffer is None:
+            buffer = HistoryBuffer(self.capacity, self.strings)
+            self._buffers[address] = buffer
+        return buffer
+
+    def remove(self, address: str) -> None:
+        self._buffers.pop(address, None)
+
+    def record(self, status: HostStatus, timestamp: datetime) -> None:
+        buffer = self._buffers.get(status.address)
+        if buffer is not None:
+            buffer.append(status, timestamp)
+
+    def record_sample(self, address: str, sample: HostSample) -> None:
+        buffer = self._buffers.get(address)
+        if buffer is not None:
+            buffer.append(sample, sample.timestamp)
+
+    def samples(self, address: str, since: int | None = None) -> list[HostSample]:
+        buffer = self._buffers.get(address)
+        return buffer.samples(since) if buffer else []
+
+    def cursor(self, address: str) -> int:
+        """Cursor to pass as ``since`` to receive only samples recorded from now on."""
+
+        buffer = self._buffers.get(address)
+        return buffer.total if buffer else 0
+
+
+def _set_bit(bitmap: bytearray, slot: int) -> None:
+    bitmap[slot >> 3] |= 1 << (slot & 7)
+
+
+def _clear_bit(bitmap: bytearray, slot: int) -> None:
+    bitmap[slot >> 3] &= ~(1 << (slot & 7)) & 0xFF
+
+
+def _get_bit(bitmap: bytearray, slot: int) -> bool:
+    return bool(bitmap[slot >> 3] & (1 << (slot & 7)))
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import itertools
+import logging
+import os
+import socket
+import struct
+import time
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+ICMPV6_ECHO_REQUEST = 128
+ICMPV6_ECHO_REPLY = 129
+
+_HEADER = struct.Struct("!BBHHH")
+_PAYLOAD = b"networkmonitoring-echo".ljust(32, b"\x00")
+# receive-buffer bytes reserved per outstanding echo: the kernel charges each
+# queued packet well over its size, and a raw socket also queues our own
+# requests when pinging local addresses
+_BUFFER_PER_ECHO = 4096
+# lets root raise the buffer past net.core.rmem_max
+_SO_RCVBUFFORCE = getattr(socket, "SO_RCVBUFFORCE", 33)
+
+
+@dataclass(slots=True)
+class PingResult:
+    """Outcome of a batch of echo requests sent to a single host."""
+
+    sent: int
+    rtts_ms: list[float] = field(default_factory=list)
+
+    @property
+    def received(self) -> int:
+        return len(self.rtts_ms)
+
+    @property
+    def packet_loss(self) -> float:
+        if not self.sent:
+            return 1.0
+        return (self.sent - self.received) / self.sent
+
+    @property
+    def rtt_avg_ms(self) -> float | None:
+        return sum(self.rtts_ms) / len(self.rtts_ms) if self.rtts_ms else None
+
+    @property
+    def rtt_min_ms(self) -> float | None:
+        return min(self.rtts_ms) if self.rtts_ms else None
+
+    @property
+    def rtt_max_ms(self) -> float | None:
+        return max(self.rtts_ms) if self.rtts_ms else None
+
+    def success(self) -> bool:
+        return bool(self.rtts_ms)
+
+
+def _checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+class _EchoSocket:
+    """One ICMP socket for an address family, shared by every outstanding probe."""
+
+    def __init__(self, family: int, max_outstanding: int) -> None:
+        self.family = family
+        proto = socket.IPPROTO_ICMP if family == socket.AF_INET else socket.IPPROTO_ICMPV6
+        try:
+            self.sock = socket.socket(family, socket.SOCK_RAW, proto)
+            self.raw = True
+        except PermissionError:
+            # unprivileged "ping" sockets (net.ipv4.ping_group_range)
+            self.sock = socket.socket(family, socket.SOCK_DGRAM, proto)
+            self.raw = False
+        self.sock.setblocking(False)
+        # echoes in flight are capped at what the receive buffer can queue, so
+        # a burst of probes is paced instead of its replies being dropped
+        self.capacity = self._size_receive_buffer(max_outstanding)
+        self.slots = asyncio.Semaphore(self.capacity)
+        self.request_type = ICMP_ECHO_REQUEST if family == socket.AF_INET else ICMPV6_ECHO_REQUEST
+        self.reply_type = ICMP_ECHO_REPLY if family == socket.AF_INET else ICMPV6_ECHO_REPLY
+
+    def _size_receive_buffer(self, max_outstanding: int) -> int:
+        wanted = max_outstanding * _BUFFER_PER_ECHO
+        for option in (_SO_RCVBUFFORCE, socket.SO_RCVBUF):
+            try:
+                self.sock.setsockopt(socket.SOL_SOCKET, option, wanted)
+                break
+            except OSError:
+                continue
+        granted = self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        capacity = max(1, granted // _BUFFER_PER_ECHO)
+        if capacity < max_outstanding:
+            logger.warning(
+                "ICMP receive buffer holds %d of %d echoes; sends will be paced "
+                "(raise net.core.rmem_max to avoid this)",
+                capacity,
+                max_outstanding,
+            )
+        return min(capacity, max_outstanding)
+
+    def build_request(self, identifier: int, sequence: int) -> bytes:
+        header = _HEADER.pack(self.request_type, 0, 0, identifier, sequence)
+        if self.family == socket.AF_INET6:
+            # the kernel fills in ICMPv6 checksums
+            return header + _PAYLOAD
+        checksum = _checksum(header + _PAYLOAD)
+        return _HEADER.pack(self.request_type, 0, checksum, identifier, sequence) + _PAYLOAD
+
+    def parse_reply(self, packet: bytes) -> tuple[int, int] | None:
+        """Return ``(identifier, sequence)`` for echo replies, ``None`` otherwise."""
+
+        if self.raw and self.family == socket.AF_INET:
+            packet = packet[(packet[0] & 0x0F) * 4 :]
+        if len(packet) < _HEADER.size:
+            return None
+        icmp_type, _code, _checksum_value, identifier, sequence = _HEADER.unpack_from(packet)
+        if icmp_type != self.reply_type:
+            return None
+        return identifier, sequence
+
+
+class IcmpEngine:
+    """Asyncio ICMP echo engine multiplexing every probe over one socket per family.
+
+    Replies are matched by source address and sequence number (plus the
+    identifier on raw sockets; unprivileged sockets let the kernel rewrite it).
+    Each socket's receive buffer is sized for ``max_outstanding`` echoes in
+    flight; if the kernel grants less, sends wait for earlier echoes to be
+    answered or time out.
+    """
+
+    def __init__(self, max_outstanding: int = 1024) -> None:
+        self.max_outstanding = max(1, max_outstanding)
+        self._identifier = os.getpid() & 0xFFFF
+        self._sequence = itertools.count()
+        self._sockets: dict[int, _EchoSocket] = {}
+        self._pending: dict[tuple[str, int], tuple[asyncio.Future, float]] = {}
+
+    def _socket_for(self, family: int) -> _EchoSocket:
+        echo_socket = self._sockets.get(family)
+        if echo_socket is None:
+            echo_socket = _EchoSocket(family, self.max_outstanding)
+            asyncio.get_running_loop().add_reader(
+                echo_socket.sock.fileno(), self._on_readable, echo_socket
+            )
+            self._sockets[family] = echo_socket
+            logger.info(
+                "Opened %s ICMP%s socket",
+                "raw" if echo_socket.raw else "datagram",
+                "v6" if family == socket.AF_INET6 else "",
+            )
+        return echo_socket
+
+    def _on_readable(self, echo_socket: _EchoSocket) -> None:
+        received_at = time.perf_counter()
+        while True:
+            try:
+                packet, source = echo_socket.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as exc:  # pragma: no cover - network dependent
+                logger.debug("ICMP receive failed: %s", exc)
+                return
+            parsed = echo_socket.parse_reply(packet)
+            if parsed is None:
+                continue
+            identifier, sequence = parsed
+            if echo_socket.raw and identifier != self._identifier:
+                continue
+            pending = self._pending.pop((source[0], sequence), None)
+            if pending is None:
+                continue
+            future, sent_at = pending
+            if not future.done():
+                future.set_result((received_at - sent_at) * 1000)
+
+    def _next_sequence(self, address: str) -> int:
+        for _ in range(0x10000):
+            sequence = next(self._sequence) & 0xFFFF
+            if (address, sequence) not in self._pending:
+                return sequence
+        raise RuntimeError("ICMP sequence space exhausted")
+
+    async def _resolve(self, address: str) -> tuple[int, str]:
+        try:
+            parsed = ipaddress.ip_address(address)
+        except ValueError:
+            loop = asyncio.get_running_loop()
+            infos = await loop.getaddrinfo(address, None, type=socket.SOCK_RAW)
+            family, *_rest, sockaddr = infos[0]
+            return family, sockaddr[0]
+        family = socket.AF_INET6 if parsed.version == 6 else socket.AF_INET
+        return family, parsed.compressed
+
+    async def ping(self, address: str, count: int = 3, timeout: float = 2.0) -> PingResult:
+        """Send ``count`` echo requests and wait up to ``timeout`` after the last for replies."""
+
+        family, target = await self._resolve(address)
+        echo_socket = self._socket_for(family)
+        loop = asyncio.get_running_loop()
+        futures: list[asyncio.Future] = []
+        keys: list[tuple[str, int]] = []
+        try:
+            for _ in range(count):
+                await echo_socket.slots.acquire()
+                future = loop.create_future()
+                # the slot frees up once the echo is answered or abandoned
+                future.add_done_callback(lambda _future: echo_socket.slots.release())
+                futures.append(future)
+                sequence = self._next_sequence(target)
+                key = (target, sequence)
+                self._pending[key] = (future, time.perf_counter())
+                keys.append(key)
+                packet = echo_socket.build_request(self._identifier, sequence)
+                await loop.sock_sendto(echo_socket.sock, packet, (target, 0))
+            await asyncio.wait(futures, timeout=timeout)
+        finally:
+            for key in keys:
+                self._pending.pop(key, None)
+            rtts = [
+                future.result() for future in futures if future.done() and not future.cancelled()
+            ]
+            for future in futures:
+                if not future.done():
+                    future.cancel()
+        return PingResult(sent=len(futures), rtts_ms=rtts)
+
+    def close(self) -> None:
+        for echo_socket in self._sockets.values():
+            try:
+                asyncio.get_running_loop().remove_reader(echo_socket.sock.fileno())
+            except RuntimeError:
+                pass
+            echo_socket.sock.close()
+        self._sockets.clear()
+        for future, _sent_at in self._pending.values():
+            if not future.done():
+                future.cancel()
+        self._pending.clear()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import math
+from array import array
+from datetime import datetime
+
+from .models import InterfaceRate
+
+IF_NAME_COLUMN = "1.3.6.1.2.1.31.1.1.1.1"  # ifName
+IF_HC_IN_COLUMN = "1.3.6.1.2.1.31.1.1.1.6"  # ifHCInOctets
+IF_HC_OUT_COLUMN = "1.3.6.1.2.1.31.1.1.1.10"  # ifHCOutOctets
+IF_IN_COLUMN = "1.3.6.1.2.1.2.2.1.10"  # ifInOctets
+IF_OUT_COLUMN = "1.3.6.1.2.1.2.2.1.16"  # ifOutOctets
+
+
+class InterfaceTable:
+    """Counters and rates for every interface on one host, held in flat typed arrays.
+
+    Rows are ordered by ifIndex; unknown rates are stored as NaN so the rate
+    arrays stay ``array('d')`` rather than lists of optional floats.
+    """
+
+    __slots__ = (
+        "indexes",
+        "names",
+        "in_octets",
+        "out_octets",
+        "in_bps",
+        "out_bps",
+        "counter_mod",
+        "timestamp",
+    )
+
+    def __init__(self) -> None:
+        self.indexes = array("L")
+        self.names: list[str | None] = []
+        self.in_octets = array("Q")
+        self.out_octets = array("Q")
+        self.in_bps = array("d")
+        self.out_bps = array("d")
+        self.counter_mod = 2**64
+        self.timestamp: datetime | None = None
+
+    def __len__(self) -> int:
+        return len(self.indexes)
+
+    def update(
+        self,
+        counters: dict[int, tuple[int, int]],
+        names: dict[int, str],
+        counter_mod: int,
+        now: datetime,
+    ) -> None:
+        """Replace the counters with a fresh walk and derive per-interface bps."""
+
+        indexes = array("L", sorted(counters))
+        in_octets = array("Q", (counters[index][0] for index in indexes))
+        out_octets = array("Q", (counters[index][1] for index in indexes))
+        in_bps = array("d", [math.nan]) * len(indexes)
+        out_bps = array("d", [math.nan]) * len(indexes)
+
+        elapsed = (now - self.timestamp).total_seconds() if self.timestamp else 0.0
+        if elapsed > 0 and counter_mod == self.counter_mod:
+            if indexes == self.indexes:
+                previous_rows = range(len(indexes))
+            else:
+                positions = {index: row for row, index in enumerate(self.indexes)}
+                previous_rows = [positions.get(index, -1) for index in indexes]
+            for row, previous_row in enumerate(previous_rows):
+                if previous_row < 0:
+                    continue
+                in_bps[row] = _rate(in_octets[row], self.in_octets[previous_row], counter_mod, elapsed)
+                out_bps[row] = _rate(
+                    out_octets[row], self.out_octets[previous_row], counter_mod, elapsed
+                )
+
+        self.indexes = indexes
+        self.names = [names.get(index) for index in indexes]
+        self.in_octets = in_octets
+        self.out_octets = out_octets
+        self.in_bps = in_bps
+        self.out_bps = out_bps
+        self.counter_mod = counter_mod
+        self.timestamp = now
+
+    def rates(self) -> list[InterfaceRate]:
+        return [
+            InterfaceRate(
+                if_index=self.indexes[row],
+                name=self.names[row],
+                in_bps=_optional(self.in_bps[row]),
+                out_bps=_optional(self.out_bps[row]),
+            )
+            for row in range(len(self.indexes))
+        ]
+
+
+def _rate(current: int, previous: int, modulus: int, elapsed: float) -> float:
+    if current < previous:
+        current += modulus
+    return ((current - previous) * 8) / elapsed
+
+
+def _optional(value: float) -> float | None:
+    return None if math.isnan(value) else value
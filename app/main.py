@@ -2,25 +2,39 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from datetime import datetime
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Literal
 
-from fastapi import Depends, FastAPI, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi import Request
 
+from .cluster import (
+    ClusterClient,
+    HashRing,
+    cluster_front,
+    parent_groups,
+    router as cluster_router,
+)
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
 from .models import (
+    DiscoveryJobStatus,
     HostRangeRequest,
-    HostRangeResponse,
+    HostRollup,
     HostSample,
     HostStatus,
+    InterfaceRate,
+    MonitorStats,
     SettingsPayload,
     SettingsUpdate,
 )
 from .monitor import MonitorService, load_hosts
+from .rollups import pick_resolution
 from .settings import persist_settings, settings
+from .storage import SampleStorage
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -29,6 +43,9 @@ app = FastAPI(title="SNMP Network Monitor", version="0.1.0")
 BASE_DIR = Path(__file__).parent.parent
 TEMPLATES = Jinja2Templates(directory=str(BASE_DIR / "app" / "templates"))
 app.mount("/static", StaticFiles(directory=str(BASE_DIR / "app" / "static")), name="static")
+if cluster_front():
+    # registered first so these routes shadow the local ones below
+    app.include_router(cluster_router)
 
 
 async def get_monitor() -> MonitorService:
@@ -42,7 +59,31 @@ async def startup_event() -> None:
     if not hosts:
         logger.warning("No hosts configured; using demo defaults")
         hosts = load_hosts(Path(__file__).parent / "demo_hosts.yaml")
-    monitor = MonitorService(hosts)
+    app.state.cluster = None
+    ring = (
+        HashRing(settings.cluster_nodes, groups=parent_groups(hosts))
+        if settings.cluster_nodes
+        else None
+    )
+    if ring is not None and settings.cluster_self:
+        hosts = [host for host in hosts if ring.owner(host.address) == settings.cluster_self]
+        logger.info("Cluster node %s owns %d hosts", settings.cluster_self, len(hosts))
+    elif ring is not None:
+        logger.info("Cluster front for %d nodes", len(ring.nodes))
+        app.state.cluster = ClusterClient(ring.nodes, ring.groups)
+        hosts = []
+    storage = (
+        SampleStorage(
+            Path(settings.history_db_path),
+            settings.history_retention_days,
+            rollup_retention_days=settings.history_rollup_retention_days,
+        )
+        if settings.history_db_path
+        else None
+    )
+    monitor = MonitorService(hosts, storage=storage)
+    if ring is not None and settings.cluster_self:
+        monitor.owns = lambda address: ring.owner(address) == settings.cluster_self
     app.state.monitor = monitor
     asyncio.create_task(monitor.start())
 
@@ -51,21 +92,67 @@ async def startup_event() -> None:
 async def shutdown_event() -> None:
     monitor: MonitorService = app.state.monitor  # type: ignore[attr-defined]
     await monitor.stop()
+    if app.state.cluster is not None:  # type: ignore[attr-defined]
+        await app.state.cluster.close()  # type: ignore[attr-defined]
 
 
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request, monitor: Annotated[MonitorService, Depends(get_monitor)]):
     statuses = monitor.get_statuses(reachable_only=True)
     return TEMPLATES.TemplateResponse(
-        "index.html", {"request": request, "statuses": statuses, "settings": settings}
+        "index.html",
+        {
+            "request": request,
+            "statuses": statuses,
+            "settings": settings,
+            "cluster_front": cluster_front(),
+        },
+    )
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(",")
     )
 
 
 @app.get("/api/hosts", response_model=list[HostStatus])
 async def hosts(
-    monitor: Annotated[MonitorService, Depends(get_monitor)], reachable_only: bool = True
+    request: Request,
+    monitor: Annotated[MonitorService, Depends(get_monitor)],
+    reachable_only: bool = True,
 ):
-    return monitor.get_statuses(reachable_only=reachable_only)
+    """Return host statuses from a cached snapshot, or 304 if ``If-None-Match`` is current."""
+
+    etag, body = monitor.get_statuses_json(reachable_only=reachable_only)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/api/stream")
+async def status_stream(
+    monitor: Annotated[MonitorService, Depends(get_monitor)], address: str | None = None
+):
+    """Server-sent events: a full ``snapshot``, then ``update``/``removed`` deltas."""
+
+    return StreamingResponse(
+        monitor.events.stream(monitor.get_statuses(), address=address),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/metrics")
+async def metrics(monitor: Annotated[MonitorService, Depends(get_monitor)]):
+    """Prometheus exposition of every host's latest measurements."""
+
+    return Response(content=monitor.metrics.render(), media_type=METRICS_CONTENT_TYPE)
 
 
 @app.get("/api/hosts/{address}", response_model=HostStatus)
@@ -76,42 +163,108 @@ async def host_detail(address: str, monitor: Annotated[MonitorService, Depends(g
     return host
 
 
-@app.get("/api/hosts/{address}/history", response_model=list[HostSample])
-async def host_history(address: str, monitor: Annotated[MonitorService, Depends(get_monitor)]):
+@app.get("/api/hosts/{address}/history", response_model=list[HostSample] | list[HostRollup])
+async def host_history(
+    address: str,
+    response: Response,
+    monitor: Annotated[MonitorService, Depends(get_monitor)],
+    start: Annotated[datetime | None, Query(alias="from")] = None,
+    end: Annotated[datetime | None, Query(alias="to")] = None,
+    limit: Annotated[int | None, Query(ge=1)] = None,
+    resolution: Literal["auto", "raw", "1m", "5m", "1h"] = "auto",
+    since: Annotated[int | None, Query(ge=0)] = None,
+):
+    """Return a host's history.
+
+    Without parameters this is the in-memory buffer. ``since`` takes the
+    ``X-History-Cursor`` header of a previous response and returns only newer
+    samples; ``X-History-Reset`` marks a cursor from before a restart, in which
+    case the full buffer is returned. ``from``/``to``/``resolution`` read
+    ranges and rollups from storage.
+    """
+
+    host = monitor.get_status(address)
+    if not host:
+        raise HTTPException(status_code=404, detail="Host not found")
+    in_memory = start is None and end is None and limit is None and resolution in ("auto", "raw")
+    if since is not None or in_memory:
+        cursor = monitor.get_history_cursor(address)
+        response.headers["X-History-Cursor"] = str(cursor)
+        if since is not None and since > cursor:
+            response.headers["X-History-Reset"] = "true"
+            since = None
+        return monitor.get_history(address, since)
+    if resolution == "auto":
+        if start is None:
+            resolution = "raw"
+        else:
+            span = ((end or datetime.utcnow()) - start).total_seconds()
+            resolution = pick_resolution(
+                span, settings.monitor_interval_seconds, settings.history_max_points
+            )
+    if resolution != "raw":
+        rollups = await monitor.get_rollups(address, resolution, start, end)
+        return rollups[-limit:] if limit else rollups
+    return await monitor.get_history_range(address, start, end, limit)
+
+
+@app.get("/api/hosts/{address}/interfaces", response_model=list[InterfaceRate])
+async def host_interfaces(address: str, monitor: Annotated[MonitorService, Depends(get_monitor)]):
     host = monitor.get_status(address)
     if not host:
         raise HTTPException(status_code=404, detail="Host not found")
-    return monitor.get_history(address)
+    return monitor.get_interfaces(address)
+
+
+@app.get("/api/monitor/stats", response_model=MonitorStats)
+async def monitor_stats(monitor: Annotated[MonitorService, Depends(get_monitor)]):
+    return monitor.get_stats()
 
 
 @app.post("/api/rescan")
 async def rescan(monitor: Annotated[MonitorService, Depends(get_monitor)]):
-    await monitor._check_all_hosts()  # noqa: SLF001
+    await monitor.rescan()
     return {"status": "ok"}
 
 
-@app.post("/api/hosts", response_model=HostRangeResponse)
+@app.post("/api/hosts", response_model=DiscoveryJobStatus, status_code=202)
 async def add_hosts(
     payload: HostRangeRequest, monitor: Annotated[MonitorService, Depends(get_monitor)]
 ):
+    """Start a background discovery sweep; poll ``/api/discovery/{id}`` for progress."""
+
     try:
-        hosts = monitor.hosts_from_range(
+        return monitor.start_discovery(
             payload.range,
             community=payload.community,
             snmp_port=payload.snmp_port,
             interface_index=payload.interface_index,
+            rate=payload.sweep_rate,
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
-    added = monitor.add_hosts(hosts)
-    for host in added:
-        await monitor._check_host(host)
 
-    skipped = len(hosts) - len(added)
-    return HostRangeResponse(
-        added=len(added), skipped=skipped, hosts=[host.address for host in added]
-    )
+@app.get("/api/discovery", response_model=list[DiscoveryJobStatus])
+async def discovery_jobs(monitor: Annotated[MonitorService, Depends(get_monitor)]):
+    return monitor.discovery.jobs()
+
+
+@app.get("/api/discovery/{job_id}", response_model=DiscoveryJobStatus)
+async def discovery_job(job_id: str, monitor: Annotated[MonitorService, Depends(get_monitor)]):
+    job = monitor.discovery.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Discovery job not found")
+    return job
+
+
+@app.delete("/api/discovery/{job_id}")
+async def cancel_discovery(job_id: str, monitor: Annotated[MonitorService, Depends(get_monitor)]):
+    if not monitor.discovery.get(job_id):
+        raise HTTPException(status_code=404, detail="Discovery job not found")
+    if not monitor.discovery.cancel(job_id):
+        raise HTTPException(status_code=409, detail="Discovery job already finished")
+    return {"status": "cancelling"}
 
 
 @app.delete("/api/hosts/{address}")
@@ -129,6 +282,9 @@ async def host_page(
     monitor: Annotated[MonitorService, Depends(get_monitor)],
 ):
     host = monitor.get_status(address)
+    if not host and app.state.cluster is not None:  # type: ignore[attr-defined]
+        remote = await app.state.cluster.host(address)  # type: ignore[attr-defined]
+        host = HostStatus(**remote) if remote else None
     if not host:
         raise HTTPException(status_code=404, detail="Host not found")
     return TEMPLATES.TemplateResponse(
@@ -139,7 +295,8 @@ async def host_page(
 @app.get("/settings", response_class=HTMLResponse)
 async def settings_page(request: Request) -> HTMLResponse:
     return TEMPLATES.TemplateResponse(
-        "settings.html", {"request": request, "settings": settings}
+        "settings.html",
+        {"request": request, "settings": settings, "cluster_front": cluster_front()},
     )
 
 
@@ -164,6 +321,7 @@ async def update_settings(payload: SettingsUpdate) -> SettingsPayload:
 
     settings.apply_overrides(updates)
     persist_settings(settings)
+    app.state.monitor.settings_updated()  # type: ignore[attr-defined]
     return SettingsPayload(**settings.model_dump())
 
 
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import math
+from typing import Callable
+
+from .history import to_epoch
+from .models import HostStatus
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_Getter = Callable[[HostStatus], "float | int | bool | None"]
+
+# (metric name, help text, value getter); every family is a gauge
+_GAUGES: tuple[tuple[str, str, _Getter], ...] = (
+    ("monitor_host_reachable", "1 if the last ping got a reply", lambda s: s.reachable),
+    (
+        "monitor_host_suppressed",
+        "1 while the host's parent is unreachable and its checks are skipped",
+        lambda s: s.suppressed_by is not None,
+    ),
+    ("monitor_host_latency_ms", "Average ping round trip", lambda s: s.latency_ms),
+    ("monitor_host_latency_min_ms", "Fastest ping round trip", lambda s: s.latency_min_ms),
+    ("monitor_host_latency_max_ms", "Slowest ping round trip", lambda s: s.latency_max_ms),
+    ("monitor_host_packet_loss_pct", "Ping packet loss", lambda s: s.packet_loss_pct),
+    ("monitor_host_packets_sent", "Pings sent in the last check", lambda s: s.packets_sent),
+    (
+        "monitor_host_packets_received",
+        "Ping replies in the last check",
+        lambda s: s.packets_received,
+    ),
+    ("monitor_host_cpu_usage_pct", "CPU usage reported over SNMP", lambda s: s.cpu_usage_pct),
+    (
+        "monitor_host_memory_used_pct",
+        "Memory usage reported over SNMP",
+        lambda s: s.memory_used_pct,
+    ),
+    (
+        "monitor_host_interface_temp_c",
+        "Interface temperature in degrees Celsius",
+        lambda s: s.interface_temp_c,
+    ),
+    (
+        "monitor_host_system_temp_c",
+        "System temperature in degrees Celsius",
+        lambda s: s.system_temp_c,
+    ),
+    (
+        "monitor_host_interface_in_bps",
+        "Inbound throughput of the monitored interface",
+        lambda s: s.interface_in_bps,
+    ),
+    (
+        "monitor_host_interface_out_bps",
+        "Outbound throughput of the monitored interface",
+        lambda s: s.interface_out_bps,
+    ),
+    (
+        "monitor_host_last_checked_timestamp_seconds",
+        "Unix time of the last completed check",
+        lambda s: to_epoch(s.last_checked) if s.last_checked else None,
+    ),
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value: float | int | bool) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+class MetricsExporter:
+    """Prometheus text exposition of host statuses, maintained as checks finish.
+
+    Each sample line is rendered once, when a check changes it, and kept per
+    metric family. A scrape only re-joins the families whose lines changed
+    since the previous scrape; otherwise the cached body is served as is.
+    """
+
+    def __init__(self) -> None:
+        # address -> (host name, rendered label set)
+        self._labels: dict[str, tuple[str, str]] = {}
+        self._lines: dict[str, dict[str, str]] = {name: {} for name, _help, _get in _GAUGES}
+        self._blocks: dict[str, str] = {
+            name: f"# HELP {name} {help_text}\n# TYPE {name} gauge\n"
+            for name, help_text, _get in _GAUGES
+        }
+        self._dirty: set[str] = set()
+        self._body = "".join(self._blocks.values()).encode("utf-8")
+
+    def update(self, status: HostStatus) -> None:
+        """Re-render the sample lines of one host whose status changed."""
+
+        address = status.address
+        cached = self._labels.get(address)
+        if cached is None or cached[0] != status.name:
+            cached = (status.name, f'{{address="{_escape(address)}",name="{_escape(status.name)}"}}')
+            self._labels[address] = cached
+        labels = cached[1]
+        for name, _help, get in _GAUGES:
+            lines = self._lines[name]
+            value = get(status)
+            if value is None:
+                if lines.pop(address, None) is not None:
+                    self._dirty.add(name)
+                continue
+            line = f"{name}{labels} {_format(value)}\n"
+            if lines.get(address) != line:
+                lines[address] = line
+                self._dirty.add(name)
+
+    def remove(self, address: str) -> None:
+        self._labels.pop(address, None)
+        for name, lines in self._lines.items():
+            if lines.pop(address, None) is not None:
+                self._dirty.add(name)
+
+    def render(self) -> bytes:
+        if self._dirty:
+            for name, help_text, _get in _GAUGES:
+                if name in self._dirty:
+                    self._blocks[name] = (
+                        f"# HELP {name} {help_text}\n# TYPE {name} gauge\n"
+                        + "".join(self._lines[name].values())
+                    )
+            self._dirty.clear()
+            self._body = "".join(self._blocks.values()).encode("utf-8")
+        return self._body
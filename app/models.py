@@ -14,6 +14,9 @@ class HostConfig:
     snmp_community: str
     snmp_port: int
     interface_index: int = 1
+    all_interfaces: bool = False
+    interval_seconds: float | None = None
+    parent: str | None = None
 
 
 class HostStatus(BaseModel):
@@ -37,6 +40,9 @@ class HostStatus(BaseModel):
     reachable: bool = False
     last_checked: Optional[datetime] = None
     snmp_sysname: Optional[str] = None
+    snmp_breaker: str = "closed"
+    snmp_skipped: int = 0
+    suppressed_by: Optional[str] = None
     last_alert: Optional[datetime] = None
     notes: list[str] = Field(default_factory=list)
 
@@ -45,6 +51,8 @@ class HostStatus(BaseModel):
     def state(self) -> str:
         if not self.last_checked:
             return "pending"
+        if self.suppressed_by:
+            return "unreachable-via-parent"
         return "ok" if self.reachable else "alert"
 
     class Config:
@@ -73,6 +81,107 @@ class HostSample(BaseModel):
     reachable: bool
 
 
+class HostRollup(BaseModel):
+    """Aggregate of the samples in one time bucket.
+
+    Metric fields hold the bucket average so charts can plot rollups and raw
+    samples alike; ``minimum``/``maximum``/``counts`` are keyed by metric name.
+    """
+
+    timestamp: datetime
+    resolution: str
+    count: int
+    reachable_pct: Optional[float] = None
+    latency_ms: Optional[float] = None
+    packet_loss_pct: Optional[float] = None
+    cpu_usage_pct: Optional[float] = None
+    memory_used_pct: Optional[float] = None
+    interface_temp_c: Optional[float] = None
+    system_temp_c: Optional[float] = None
+    interface_in_bps: Optional[float] = None
+    interface_out_bps: Optional[float] = None
+    minimum: dict[str, float] = Field(default_factory=dict)
+    maximum: dict[str, float] = Field(default_factory=dict)
+    counts: dict[str, int] = Field(default_factory=dict)
+
+
+class InterfaceRate(BaseModel):
+    """Current throughput of one interface from a full interface-table walk."""
+
+    if_index: int
+    name: Optional[str] = None
+    in_bps: Optional[float] = None
+    out_bps: Optional[float] = None
+
+
+class CycleStats(BaseModel):
+    """Timing summary for the most recent polling cycle."""
+
+    started_at: Optional[datetime] = None
+    duration_s: Optional[float] = None
+    hosts_checked: int = 0
+    hosts_timed_out: int = 0
+    concurrency_limit: int = 0
+    deadline_s: Optional[float] = None
+
+
+class SchedulerStats(BaseModel):
+    """Counters for the per-host check scheduler."""
+
+    interval_s: float = 0.0
+    scheduled: int = 0
+    in_flight: int = 0
+    checks_completed: int = 0
+    checks_timed_out: int = 0
+    checks_suppressed: int = 0
+    dispatch_lag_s: float = 0.0
+
+
+class ChannelStats(BaseModel):
+    """Delivery counters for one notification channel."""
+
+    queued: int = 0
+    sent: int = 0
+    failed: int = 0
+    retries: int = 0
+    dropped: int = 0
+    last_latency_s: Optional[float] = None
+    max_latency_s: float = 0.0
+
+
+class NotificationStats(BaseModel):
+    email: ChannelStats
+    slack: ChannelStats
+    pending_digest: int = 0
+    digests_sent: int = 0
+
+
+class ExportStats(BaseModel):
+    """Counters for the line-protocol sample exporter."""
+
+    queued: int = 0
+    sent: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    rejected: int = 0
+    dropped: int = 0
+    spilled_lines: int = 0
+    spill_bytes: int = 0
+    last_latency_s: Optional[float] = None
+    last_error: Optional[str] = None
+
+
+class MonitorStats(BaseModel):
+    """Runtime statistics about the monitor itself."""
+
+    hosts: int
+    cycle: CycleStats
+    scheduler: SchedulerStats
+    shard_hosts: list[int] = Field(default_factory=list)
+    notifications: NotificationStats
+    export: Optional[ExportStats] = None
+
+
 class HostRangeRequest(BaseModel):
     """Payload for adding a range of hosts from the dashboard."""
 
@@ -84,12 +193,27 @@ class HostRangeRequest(BaseModel):
     interface_index: Optional[int] = Field(
         None, ge=1, description="Interface index to use for SNMP metrics"
     )
+    sweep_rate: Optional[float] = Field(
+        None, gt=0, description="Discovery pings per second (defaults to the global setting)"
+    )
 
 
-class HostRangeResponse(BaseModel):
-    added: int
-    skipped: int
-    hosts: list[str]
+class DiscoveryJobStatus(BaseModel):
+    """Progress of a background ping sweep started by a range add."""
+
+    id: str
+    range: str
+    state: str = "running"
+    total: int
+    swept: int = 0
+    responded: int = 0
+    added: int = 0
+    skipped: int = 0
+    hosts: list[str] = Field(default_factory=list)
+    rate: float
+    started_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
 
 
 class SettingsPayload(BaseModel):
@@ -1,29 +1,85 @@
 from __future__ import annotations
 
 import asyncio
-import ipaddress
 import logging
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Callable, Iterable
 
+from pydantic import TypeAdapter
 from pythonping import ping
-from pysnmp.hlapi import (  # type: ignore
-    CommunityData,
-    ContextData,
-    ObjectIdentity,
-    ObjectType,
-    SnmpEngine,
-    UdpTransportTarget,
-    getCmd,
-)
 
-from .models import HostConfig, HostSample, HostStatus
+from .discovery import DiscoveryManager
+from .events import StatusBroadcaster
+from .export import SampleExporter
+from .history import HistoryStore, to_epoch
+from .icmp import IcmpEngine, PingResult
+from .interfaces import (
+    IF_HC_IN_COLUMN,
+    IF_HC_OUT_COLUMN,
+    IF_IN_COLUMN,
+    IF_NAME_COLUMN,
+    IF_OUT_COLUMN,
+    InterfaceTable,
+)
+from .metrics import MetricsExporter
+from .models import (
+    CycleStats,
+    DiscoveryJobStatus,
+    HostConfig,
+    HostRollup,
+    HostSample,
+    HostStatus,
+    InterfaceRate,
+    MonitorStats,
+    SchedulerStats,
+)
 from .notifications import NotificationManager
+from .registry import AddressRange, HostRegistry, parse_range
+from .rollups import TIERS, RollupStore, merge_rows, to_rollup
+from .scheduler import HostScheduler
 from .settings import settings
+from .snmp import (
+    TOO_BIG,
+    CircuitBreaker,
+    OidChain,
+    SnmpClient,
+    SnmpError,
+    SnmpResponseError,
+    SnmpTimeout,
+    is_missing,
+    plan_requests,
+    supported_oids,
+)
+from .storage import SampleStorage
+
+if TYPE_CHECKING:
+    from .workers import ResultRecord, ShardPool
 
 logger = logging.getLogger(__name__)
 
+SYSNAME_OID = "1.3.6.1.2.1.1.5.0"  # SNMPv2-MIB::sysName.0
+SYSUPTIME_OID = "1.3.6.1.2.1.1.3.0"  # SNMPv2-MIB::sysUpTime.0
+CPU_IDLE_OID = "1.3.6.1.4.1.2021.11.9.0"  # ssCpuIdle
+MEM_TOTAL_OID = "1.3.6.1.4.1.2021.4.5.0"  # memTotalReal
+MEM_AVAIL_OID = "1.3.6.1.4.1.2021.4.6.0"  # memAvailReal
+LM_TEMP_OID = "1.3.6.1.4.1.2021.13.16.2.1.3.{index}"  # lmTempSensorsValue
+ENT_SENSOR_OID = "1.3.6.1.2.1.99.1.1.1.4.{index}"  # entPhySensorValue
+HR_DEVICE_STATUS_OID = "1.3.6.1.2.1.25.3.2.1.5.{index}"  # hrDeviceStatus
+UPS_OUTPUT_SOURCE_OID = "1.3.6.1.2.1.33.1.2.2.1.4.{index}"  # upsOutputSource
+IF_HC_IN_OID = "1.3.6.1.2.1.31.1.1.1.6.{index}"  # ifHCInOctets
+IF_HC_OUT_OID = "1.3.6.1.2.1.31.1.1.1.10.{index}"  # ifHCOutOctets
+IF_IN_OID = "1.3.6.1.2.1.2.2.1.10.{index}"  # ifInOctets
+IF_OUT_OID = "1.3.6.1.2.1.2.2.1.16.{index}"  # ifOutOctets
+PSU_INDEXES = (1, 2)
+
+_STATUS_LIST = TypeAdapter(list[HostStatus])
+
+
+def _as_float(value: object | None) -> float | None:
+    return float(value) if value is not None else None  # type: ignore[arg-type]
+
 
 def load_hosts(config_path: Path) -> list[HostConfig]:
     """Load hosts from a YAML file with keys name, address and optional SNMP settings."""
@@ -40,21 +96,92 @@ def load_hosts(config_path: Path) -> list[HostConfig]:
                 snmp_community=entry.get("snmp_community", settings.snmp_community),
                 snmp_port=int(entry.get("snmp_port", settings.snmp_port)),
                 interface_index=int(entry.get("interface_index", 1)),
+                all_interfaces=bool(entry.get("all_interfaces", False)),
+                interval_seconds=(
+                    float(entry["interval_seconds"]) if entry.get("interval_seconds") else None
+                ),
+                parent=entry.get("parent"),
             )
         )
+    # parents may be given by name or address; store addresses
+    addresses = {host.name: host.address for host in hosts}
+    for host in hosts:
+        if host.parent:
+            host.parent = addresses.get(host.parent, host.parent)
     return hosts
 
 
 class MonitorService:
-    def __init__(self, hosts: Iterable[HostConfig]):
-        self.hosts = list(hosts)
+    def __init__(self, hosts: Iterable[HostConfig], storage: SampleStorage | None = None):
+        self.hosts = HostRegistry(hosts)
         self.statuses: dict[str, HostStatus] = {
             host.address: HostStatus(name=host.name, address=host.address) for host in self.hosts
         }
-        self.history: dict[str, list[HostSample]] = {host.address: [] for host in self.hosts}
+        self.history = HistoryStore(settings.history_capacity)
+        for host in self.hosts:
+            self.history.add(host.address)
+        self.storage = storage
+        self.rollups = RollupStore(storage)
+        for host in self.hosts:
+            self.rollups.add(host.address)
+        self.events = StatusBroadcaster()
+        self.metrics = MetricsExporter()
+        self.exporter = (
+            SampleExporter(
+                settings.export_url,
+                measurement=settings.export_measurement,
+                batch_size=settings.export_batch_size,
+                flush_seconds=settings.export_flush_seconds,
+                buffer_size=settings.export_buffer_size,
+                spill_dir=Path(settings.export_spill_dir) if settings.export_spill_dir else None,
+                spill_max_bytes=settings.export_spill_max_bytes,
+                authorization=settings.export_authorization,
+            )
+            if settings.export_url
+            else None
+        )
+        # bumped on every status change; the epoch keeps ETags unique across restarts
+        self.version = 0
+        self._epoch = f"{time.time_ns():x}"
+        self._snapshots: dict[bool, tuple[int, bytes]] = {}
         self._task: asyncio.Task | None = None
         self.notifications = NotificationManager()
         self._previous_counters: dict[str, tuple[int, int, datetime, int]] = {}
+        self._cycle_lock = asyncio.Lock()
+        self.icmp = IcmpEngine(
+            max_outstanding=max(
+                settings.max_concurrent_checks * settings.ping_count,
+                settings.discovery_concurrency,
+            )
+        )
+        self._icmp_fallback = False
+        self.snmp = SnmpClient()
+        self._max_varbinds: dict[str, int] = {}
+        self._snmp_breakers: dict[str, CircuitBreaker] = {}
+        # address -> (learned at, OIDs the agent answered), and last sysUpTime seen
+        self._oid_capabilities: dict[str, tuple[float, list[str]]] = {}
+        self._sys_uptime: dict[str, float] = {}
+        self.interface_tables: dict[str, InterfaceTable] = {}
+        self.last_cycle = CycleStats()
+        self.scheduler = HostScheduler(
+            settings.monitor_interval_seconds,
+            jitter=settings.schedule_jitter,
+            max_backoff=settings.failure_backoff_max,
+            recheck_seconds=settings.state_change_recheck_seconds,
+        )
+        for host in self.hosts:
+            self.scheduler.add(host.address, host.interval_seconds)
+        self.scheduler_stats = SchedulerStats()
+        self._check_slots = asyncio.Semaphore(max(1, settings.max_concurrent_checks))
+        self._in_flight: set[asyncio.Task] = set()
+        self._wake = asyncio.Event()
+        self.discovery = DiscoveryManager(self._discovery_probe)
+        self.shards: ShardPool | None = None
+        # in cluster mode, whether this node owns an address found by discovery
+        self.owns: Callable[[str], bool] | None = None
+        self._remote_interfaces: dict[str, list[InterfaceRate]] = {}
+        # monotonic time of each suppressed host's last canary ping
+        self._last_canary: dict[str, float] = {}
 
     def get_statuses(self, reachable_only: bool = False) -> list[HostStatus]:
         statuses = list(self.statuses.values())
@@ -62,17 +189,128 @@ class MonitorService:
             return [status for status in statuses if status.reachable]
         return statuses
 
+    def get_statuses_json(self, reachable_only: bool = False) -> tuple[str, bytes]:
+        """Return an ETag and the serialized status list, cached until the next change."""
+
+        cached = self._snapshots.get(reachable_only)
+        if cached is None or cached[0] != self.version:
+            cached = (self.version, _STATUS_LIST.dump_json(self.get_statuses(reachable_only)))
+            self._snapshots[reachable_only] = cached
+        version, body = cached
+        etag = f'"{self._epoch}-{version}{"-r" if reachable_only else ""}"'
+        return etag, body
+
     def get_status(self, address: str) -> HostStatus | None:
         return self.statuses.get(address)
 
-    def get_history(self, address: str) -> list[HostSample]:
-        return self.history.get(address, [])
+    def get_history(self, address: str, since: int | None = None) -> list[HostSample]:
+        return self.history.samples(address, since)
+
+    def get_history_cursor(self, address: str) -> int:
+        return self.history.cursor(address)
+
+    async def get_history_range(
+        self,
+        address: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        limit: int | None = None,
+    ) -> list[HostSample]:
+        """Read samples in ``[start, end]`` from durable storage, or the in-memory buffer."""
+
+        if self.storage is None:
+            samples = [
+                sample
+                for sample in self.get_history(address)
+                if (start is None or sample.timestamp >= start)
+                and (end is None or sample.timestamp <= end)
+            ]
+            return samples[-limit:] if limit else samples
+        return await asyncio.to_thread(self.storage.read_range, address, start, end, limit)
+
+    async def get_rollups(
+        self,
+        address: str,
+        resolution: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[HostRollup]:
+        """Return ``resolution`` buckets in ``[start, end]``, including the one still open."""
+
+        if resolution not in TIERS:
+            raise ValueError(f"Unknown resolution {resolution!r}")
+        start_epoch = to_epoch(start) if start else 0.0
+        end_epoch = to_epoch(end) if end else float("inf")
+        if self.storage is None:
+            rows = self.rollups.rows(address, resolution, start_epoch, end_epoch)
+        else:
+            rows = await asyncio.to_thread(
+                self.storage.read_rollups, resolution, address, start_epoch, end_epoch
+            )
+            current = self.rollups.open_row(address, resolution)
+            if current is not None and start_epoch <= current[0] <= end_epoch:
+                # a stored row for the open bucket was saved before a restart
+                stored = next((row for row in rows if row[0] == current[0]), None)
+                rows = [row for row in rows if row[0] != current[0]]
+                rows.append(merge_rows(stored, current) if stored else current)
+        return [to_rollup(resolution, row) for row in rows]
+
+    def get_interfaces(self, address: str) -> list[InterfaceRate]:
+        if address in self._remote_interfaces:
+            return self._remote_interfaces[address]
+        table = self.interface_tables.get(address)
+        return table.rates() if table else []
+
+    def get_stats(self) -> MonitorStats:
+        stats = self.scheduler_stats
+        stats.interval_s = self.scheduler.interval
+        stats.scheduled = len(self.scheduler)
+        stats.in_flight = len(self._in_flight)
+        return MonitorStats(
+            hosts=len(self.hosts),
+            cycle=self.last_cycle,
+            scheduler=stats,
+            shard_hosts=self.shards.sizes() if self.shards else [],
+            notifications=self.notifications.stats(),
+            export=self.exporter.snapshot() if self.exporter is not None else None,
+        )
+
+    def settings_updated(self) -> None:
+        """Apply changed settings to the running scheduler and the polling workers."""
+
+        if self.scheduler.set_interval(settings.monitor_interval_seconds):
+            self._wake.set()
+        if self.shards:
+            # workers judge latency and loss against the thresholds themselves
+            self.shards.broadcast("settings", settings.to_storage())
 
     async def start(self) -> None:
         if self._task:
             return
+        self.notifications.start()
+        if self.exporter is not None:
+            self.exporter.start()
+        if self.storage is not None:
+            await asyncio.to_thread(self._warm_history)
+        if settings.poll_workers > 0:
+            from .workers import ShardPool
+
+            self.shards = ShardPool(settings.poll_workers, self._apply_worker_results)
+            self.shards.start(self.hosts.snapshot())
+            logger.info(
+                "Polling %d hosts in %d worker processes", len(self.hosts), self.shards.count
+            )
+            return
         self._task = asyncio.create_task(self._run_loop())
 
+    def _warm_history(self) -> None:
+        """Refill the in-memory buffers from durable storage after a restart."""
+
+        assert self.storage is not None
+        for host in self.hosts.snapshot():
+            for sample in self.storage.read_range(host.address, limit=self.history.capacity):
+                self.history.record_sample(host.address, sample)
+
     async def stop(self) -> None:
         if self._task:
             self._task.cancel()
@@ -81,95 +319,266 @@ class MonitorService:
             except asyncio.CancelledError:
                 logger.info("Monitoring loop cancelled")
             self._task = None
+        await self.discovery.stop()
+        if self.shards:
+            await self.shards.stop()
+            self.shards = None
+        for task in list(self._in_flight):
+            task.cancel()
+        await asyncio.gather(*self._in_flight, return_exceptions=True)
+        await self.notifications.stop()
+        if self.exporter is not None:
+            await self.exporter.stop()
+        self.icmp.close()
+        self.snmp.close()
+        self.rollups.flush()
+        if self.storage is not None:
+            await asyncio.to_thread(self.storage.close)
 
     async def _run_loop(self) -> None:
+        """Start each host's check when it comes due, then sleep until the next one."""
+
         logger.info("Starting monitoring loop for %d hosts", len(self.hosts))
         while True:
-            await self._check_all_hosts()
-            await asyncio.sleep(settings.monitor_interval_seconds)
+            due = self.scheduler.pop_due(time.monotonic())
+            for address, lag in due:
+                host = self.hosts.get(address)
+                if host is None:
+                    continue
+                task = asyncio.create_task(self._scheduled_check(host))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+            if due:
+                self.scheduler_stats.dispatch_lag_s = max(lag for _, lag in due)
+            self._wake.clear()
+            delay = self.scheduler.next_delay(time.monotonic())
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
 
-    async def _check_all_hosts(self) -> None:
-        for host in self.hosts:
-            await self._check_host(host)
+    async def _scheduled_check(self, host: HostConfig) -> None:
+        """Run one scheduled check under the global concurrency limit and reschedule the host."""
 
-    def expand_range(self, range_text: str) -> list[str]:
-        """Expand CIDR, start-end pairs, or single IPs into a list of addresses."""
+        timeout = settings.cycle_deadline_seconds or host.interval_seconds or self.scheduler.interval
+        reachable = False
+        async with self._check_slots:
+            try:
+                await asyncio.wait_for(self._check_host(host), timeout)
+                status = self.statuses.get(host.address)
+                reachable = bool(status and status.reachable)
+                self.scheduler_stats.checks_completed += 1
+            except asyncio.TimeoutError:
+                self.scheduler_stats.checks_timed_out += 1
+                logger.warning("Check of %s cancelled after %.1fs", host.address, timeout)
+            except Exception as exc:
+                logger.error("Host check failed: %s", exc)
+        self.scheduler.done(host.address, reachable)
+        self._wake.set()
+
+    async def rescan(self) -> None:
+        """Check every host now, in the worker processes when sharded."""
+
+        if self.shards:
+            self.shards.broadcast("rescan")
+            return
+        await self._check_all_hosts()
 
-        cleaned = range_text.strip()
-        if "-" in cleaned:
-            start_raw, end_raw = [part.strip() for part in cleaned.split("-", 1)]
-            start_ip = ipaddress.ip_address(start_raw)
-            end_ip = ipaddress.ip_address(end_raw)
-            if start_ip.version != end_ip.version or int(end_ip) < int(start_ip):
-                raise ValueError("Invalid IP range ordering")
-            distance = int(end_ip) - int(start_ip)
-            return [str(ipaddress.ip_address(int(start_ip) + offset)) for offset in range(distance + 1)]
+    async def _apply_worker_results(self, records: list[ResultRecord]) -> None:
+        from .workers import apply_result
 
-        try:
-            network = ipaddress.ip_network(cleaned, strict=False)
-            return [str(host) for host in network.hosts()] or [str(network.network_address)]
-        except ValueError:
-            # fall back to single IP
-            ipaddress.ip_address(cleaned)
-            return [cleaned]
+        for record in records:
+            status = self.statuses.get(record[0])
+            if status is None:
+                # removed while the worker was checking it
+                continue
+            interfaces = apply_result(status, record)
+            if interfaces is not None:
+                self._remote_interfaces[status.address] = interfaces
+            await self._finish_check(status, status.last_checked or datetime.utcnow())
+
+    async def _check_all_hosts(self) -> None:
+        """Check every host concurrently, bounded by the global concurrency limit.
+
+        Checks still running when the cycle deadline (defaulting to the polling
+        interval) expires are cancelled so one cycle never bleeds into the next.
+        """
+
+        async with self._cycle_lock:
+            hosts = self.hosts.snapshot()
+            limit = max(1, settings.max_concurrent_checks)
+            deadline = settings.cycle_deadline_seconds or settings.monitor_interval_seconds
+            semaphore = asyncio.Semaphore(limit)
+            started_at = datetime.utcnow()
+            started = time.monotonic()
+
+            async def _bounded_check(host: HostConfig) -> None:
+                async with semaphore:
+                    await self._check_host(host)
+
+            tasks = [asyncio.create_task(_bounded_check(host)) for host in hosts]
+            timed_out = 0
+            if tasks:
+                done, pending = await asyncio.wait(tasks, timeout=deadline)
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                timed_out = len(pending)
+                for task in done:
+                    if not task.cancelled() and task.exception():
+                        logger.error("Host check failed: %s", task.exception())
+
+            duration = time.monotonic() - started
+            self.last_cycle = CycleStats(
+                started_at=started_at,
+                duration_s=duration,
+                hosts_checked=len(hosts) - timed_out,
+                hosts_timed_out=timed_out,
+                concurrency_limit=limit,
+                deadline_s=deadline,
+            )
+            if timed_out:
+                logger.warning(
+                    "Polling cycle hit its %.1fs deadline; %d of %d host checks cancelled",
+                    deadline,
+                    timed_out,
+                    len(hosts),
+                )
+            logger.info("Checked %d hosts in %.2fs", len(hosts) - timed_out, duration)
+
+    def expand_range(self, range_text: str) -> AddressRange:
+        """Lazily expand CIDR, start-end pairs, or single IPs, up to ``max_range_addresses``."""
+
+        return parse_range(range_text, settings.max_range_addresses)
 
     def add_hosts(self, hosts: Iterable[HostConfig]) -> list[HostConfig]:
         """Add hosts to the monitor, skipping duplicates."""
 
-        added: list[HostConfig] = []
-        for host in hosts:
-            if host.address in self.statuses:
-                continue
-            self.hosts.append(host)
+        added = self.hosts.add_many(hosts)
+        if self.shards:
+            self.shards.add(added)
+        for host in added:
+            self.scheduler.add(host.address, host.interval_seconds)
             self.statuses[host.address] = HostStatus(name=host.name, address=host.address)
-            self.history.setdefault(host.address, [])
-            added.append(host)
+            self.history.add(host.address)
+            self.rollups.add(host.address)
+            self._status_changed(self.statuses[host.address])
+        if added:
+            # the loop may be sleeping until an older due time, or indefinitely
+            self._wake.set()
         return added
 
     def remove_host(self, address: str) -> bool:
         """Remove a host from monitoring. Returns True if it existed."""
 
-        removed = self.statuses.pop(address, None)
-        if not removed:
-            return False
-        self.hosts = [host for host in self.hosts if host.address != address]
-        self.history.pop(address, None)
-        self._previous_counters.pop(address, None)
-        return True
-
-    def hosts_from_range(
+        return bool(self.remove_hosts([address]))
+
+    def remove_hosts(self, addresses: Iterable[str]) -> list[str]:
+        """Remove hosts from monitoring; returns the addresses that existed."""
+
+        removed = [host.address for host in self.hosts.remove_many(addresses)]
+        if self.shards:
+            self.shards.remove(removed)
+        for address in removed:
+            self.statuses.pop(address, None)
+            self.scheduler.remove(address)
+            self.history.remove(address)
+            self.rollups.remove(address)
+            self.version += 1
+            self.events.publish_removed(address)
+            self.metrics.remove(address)
+            self._previous_counters.pop(address, None)
+            self._max_varbinds.pop(address, None)
+            self._snmp_breakers.pop(address, None)
+            self._oid_capabilities.pop(address, None)
+            self._sys_uptime.pop(address, None)
+            self.interface_tables.pop(address, None)
+            self._remote_interfaces.pop(address, None)
+            self._last_canary.pop(address, None)
+        return removed
+
+    def start_discovery(
         self,
         range_text: str,
         community: str | None = None,
         snmp_port: int | None = None,
         interface_index: int | None = None,
-    ) -> list[HostConfig]:
+        rate: float | None = None,
+    ) -> DiscoveryJobStatus:
+        """Sweep a range in the background, registering and polling only hosts that answer.
+
+        Raises ``ValueError`` for an unparseable range.
+        """
+
         addresses = self.expand_range(range_text)
         community_value = community or settings.snmp_community
         snmp_port_value = snmp_port or settings.snmp_port
         interface_index_value = interface_index if interface_index is not None else 1
-        return [
-            HostConfig(
+
+        async def _on_found(address: str) -> bool:
+            host = HostConfig(
                 name=address,
                 address=address,
                 snmp_community=community_value,
                 snmp_port=snmp_port_value,
                 interface_index=interface_index_value,
             )
-            for address in addresses
-        ]
+            if not self.add_hosts([host]):
+                return False
+            # polled by the scheduler, or its worker, under the usual concurrency limit
+            self._expedite([address])
+            return True
+
+        def _wanted(address: str) -> bool:
+            return address not in self.hosts and (self.owns is None or self.owns(address))
+
+        return self.discovery.start(
+            range_text,
+            addresses,
+            addresses.size,
+            _wanted,
+            _on_found,
+            rate or settings.discovery_rate_per_second,
+            settings.discovery_concurrency,
+        )
+
+    def _expedite(self, addresses: list[str], delay: float = 0.0) -> None:
+        """Bring the next check of ``addresses`` forward to at most ``delay`` from now."""
+
+        if self.shards:
+            self.shards.expedite(addresses, delay)
+        for address in addresses:
+            self.scheduler.expedite(address, delay)
+        self._wake.set()
+
+    async def _discovery_probe(self, address: str) -> bool:
+        result = await self._ping(address, count=1, timeout=settings.discovery_timeout_seconds)
+        return result.success()
 
     async def _check_host(self, host: HostConfig) -> None:
-        status = self.statuses[host.address]
+        status = self.statuses.get(host.address)
+        if status is None:
+            # removed while the cycle was in flight
+            return
         now = datetime.utcnow()
+        was_reachable = status.reachable
+        parent = self._down_parent(host)
+        if parent is not None and not await self._canary(host):
+            self._mark_suppressed(status, parent)
+            self.scheduler_stats.checks_suppressed += 1
+            status.last_checked = now
+            await self._finish_check(status, now)
+            return
+        status.suppressed_by = None
+        self._last_canary.pop(host.address, None)
         try:
-            result = await asyncio.to_thread(ping, host.address, count=3, timeout=2)
+            result = await self._ping(host.address)
             status.latency_ms = result.rtt_avg_ms
-            status.latency_min_ms = getattr(result, "rtt_min_ms", None)
-            status.latency_max_ms = getattr(result, "rtt_max_ms", None)
+            status.latency_min_ms = result.rtt_min_ms
+            status.latency_max_ms = result.rtt_max_ms
             status.packet_loss_pct = result.packet_loss * 100
-            status.packets_sent = getattr(result, "stats_packets_sent", None)
-            status.packets_received = getattr(result, "stats_packets_returned", None)
+            status.packets_sent = result.sent
+            status.packets_received = result.received
             if status.packet_loss_pct is not None:
                 status.packet_success_pct = max(0.0, 100.0 - status.packet_loss_pct)
             elif status.packets_sent:
@@ -186,194 +595,313 @@ class MonitorService:
             if status.latency_ms and status.latency_ms > settings.latency_threshold_ms:
                 status.notes.append(f"High latency: {status.latency_ms:.1f} ms")
 
-            status.snmp_sysname = await asyncio.to_thread(self._fetch_sysname, host)
-            status.cpu_usage_pct, status.memory_used_pct = await asyncio.to_thread(
-                self._fetch_health_metrics, host
-            )
+            breaker = self._snmp_breakers.get(host.address)
+            if breaker is None:
+                breaker = self._snmp_breakers[host.address] = CircuitBreaker(
+                    settings.snmp_breaker_threshold, settings.snmp_breaker_cooldown_seconds
+                )
+            # a host that does not answer ping, or whose agent keeps timing out,
+            # would only block on SNMP timeouts
+            skip_snmp = not status.reachable or not breaker.allow(time.monotonic())
+            if skip_snmp:
+                status.snmp_skipped += 1
+                values = {}
+            elif host.all_interfaces:
+                values, _ = await asyncio.gather(
+                    self._poll_snmp(host), self._collect_interface_table(host, now)
+                )
+            else:
+                values = await self._poll_snmp(host)
+            status.snmp_breaker = breaker.state
+            if not skip_snmp:
+                status.snmp_sysname = self._parse_sysname(values)
+            status.cpu_usage_pct, status.memory_used_pct = self._parse_health_metrics(values)
             (
                 status.interface_temp_c,
                 status.system_temp_c,
                 status.psu_statuses,
-            ) = await asyncio.to_thread(self._fetch_environment_metrics, host)
+            ) = self._parse_environment_metrics(host, values)
             status.psu_status = ", ".join(status.psu_statuses) if status.psu_statuses else None
             (
                 status.interface_in_bps,
                 status.interface_out_bps,
-            ) = await asyncio.to_thread(self._fetch_interface_throughput, host, now)
+            ) = self._parse_interface_throughput(host, values, now)
         except Exception as exc:  # pragma: no cover - network dependent
-            status.reachable = False
-            status.latency_ms = None
-            status.latency_min_ms = None
-            status.latency_max_ms = None
-            status.packet_loss_pct = None
-            status.packet_success_pct = None
-            status.packets_sent = None
-            status.packets_received = None
-            status.cpu_usage_pct = None
-            status.memory_used_pct = None
-            status.interface_temp_c = None
-            status.system_temp_c = None
-            status.interface_in_bps = None
-            status.interface_out_bps = None
-            status.psu_status = None
-            status.psu_statuses = []
+            self._clear_metrics(status)
             status.notes = [f"Error checking host: {exc}"]
         status.last_checked = now
+        if status.reachable and not was_reachable:
+            # children skipped while this host was down can be checked again
+            children = self.hosts.children(host.address)
+            for child in children:
+                self.scheduler.expedite(child, settings.state_change_recheck_seconds)
+            if children:
+                self._wake.set()
+        await self._finish_check(status, now)
+
+    def _down_parent(self, host: HostConfig) -> str | None:
+        """The address of ``host``'s parent if its last check found it unreachable."""
+
+        if not host.parent:
+            return None
+        parent = self.statuses.get(host.parent)
+        if parent is None or parent.last_checked is None or parent.reachable:
+            return None
+        return host.parent
+
+    async def _canary(self, host: HostConfig) -> bool:
+        """Send one ping per ``dependency_canary_seconds`` to a host behind a down parent."""
+
+        now = time.monotonic()
+        last = self._last_canary.get(host.address)
+        if last is not None and now - last < settings.dependency_canary_seconds:
+            return False
+        self._last_canary[host.address] = now
+        try:
+            result = await self._ping(host.address, count=1)
+        except Exception:  # pragma: no cover - network dependent
+            return False
+        return result.success()
+
+    def _mark_suppressed(self, status: HostStatus, parent: str) -> None:
+        parent_status = self.statuses.get(parent)
+        parent_name = parent_status.name if parent_status else parent
+        self._clear_metrics(status)
+        status.suppressed_by = parent
+        status.notes = [f"Unreachable via parent {parent_name} ({parent})"]
+
+    @staticmethod
+    def _clear_metrics(status: HostStatus) -> None:
+        status.reachable = False
+        status.latency_ms = None
+        status.latency_min_ms = None
+        status.latency_max_ms = None
+        status.packet_loss_pct = None
+        status.packet_success_pct = None
+        status.packets_sent = None
+        status.packets_received = None
+        status.cpu_usage_pct = None
+        status.memory_used_pct = None
+        status.interface_temp_c = None
+        status.system_temp_c = None
+        status.interface_in_bps = None
+        status.interface_out_bps = None
+        status.psu_status = None
+        status.psu_statuses = []
+
+    async def _finish_check(self, status: HostStatus, now: datetime) -> None:
+        """Record, alert on and publish a completed check."""
 
         self._record_sample(status, now)
         await self._maybe_notify(status)
+        self._status_changed(status)
 
-    def _record_sample(self, status: HostStatus, timestamp: datetime) -> None:
-        samples = self.history.setdefault(status.address, [])
-        samples.append(
-            HostSample(
-                timestamp=timestamp,
-                latency_ms=status.latency_ms,
-                latency_min_ms=status.latency_min_ms,
-                latency_max_ms=status.latency_max_ms,
-                packet_loss_pct=status.packet_loss_pct,
-                packet_success_pct=status.packet_success_pct,
-                packets_sent=status.packets_sent,
-                packets_received=status.packets_received,
-                cpu_usage_pct=status.cpu_usage_pct,
-                memory_used_pct=status.memory_used_pct,
-                interface_temp_c=status.interface_temp_c,
-                system_temp_c=status.system_temp_c,
-                interface_in_bps=status.interface_in_bps,
-                interface_out_bps=status.interface_out_bps,
-                psu_status=status.psu_status,
-                psu_statuses=status.psu_statuses,
-                reachable=status.reachable,
-            )
+    def _status_changed(self, status: HostStatus) -> None:
+        self.version += 1
+        self.events.publish(status)
+        self.metrics.update(status)
+
+    async def _ping(
+        self, address: str, count: int | None = None, timeout: float | None = None
+    ) -> PingResult:
+        """Ping an address through the shared ICMP engine, or pythonping without socket access."""
+
+        count = count or settings.ping_count
+        timeout = timeout or settings.ping_timeout_seconds
+        if not self._icmp_fallback:
+            try:
+                return await self.icmp.ping(address, count=count, timeout=timeout)
+            except PermissionError:
+                logger.warning("ICMP sockets unavailable; falling back to pythonping threads")
+                self._icmp_fallback = True
+        responses = await asyncio.to_thread(ping, address, count=count, timeout=timeout)
+        return PingResult(
+            sent=len(responses),
+            rtts_ms=[response.time_elapsed_ms for response in responses if response.success],
         )
-        max_samples = 200
-        if len(samples) > max_samples:
-            del samples[:-max_samples]
 
+    def _record_sample(self, status: HostStatus, timestamp: datetime) -> None:
+        self.history.record(status, timestamp)
+        self.rollups.record(status.address, status, timestamp)
+        if self.storage is not None:
+            self.storage.append(status, timestamp)
+        if self.exporter is not None:
+            self.exporter.submit(status, timestamp)
 
-    def _community(self, host: HostConfig) -> CommunityData:
-        """Return SNMP v2c community settings for a host."""
+    def _snmp_oid_chains(self, host: HostConfig) -> list[OidChain]:
+        """Every OID a host check can use, as fallback chains in parser order.
 
-        return CommunityData(host.snmp_community, mpModel=1)
+        PSU status OIDs are separate chains because an hrDeviceStatus of
+        ``unknown`` still falls back to upsOutputSource.
+        """
 
-    def _fetch_sysname(self, host: HostConfig) -> str | None:
-        try:
-            iterator = getCmd(
-                SnmpEngine(),
-                self._community(host),
-                UdpTransportTarget((host.address, host.snmp_port), timeout=2, retries=0),
-                ContextData(),
-                ObjectType(ObjectIdentity("SNMPv2-MIB", "sysName", 0)),
-            )
-            error_indication, error_status, error_index, var_binds = next(iterator)
-            if error_indication or error_status:
-                return None
-            for _, value in var_binds:
-                return str(value)
-        except Exception:
-            return None
-        return None
+        index = host.interface_index
+        return [
+            ((SYSUPTIME_OID,),),
+            ((SYSNAME_OID,),),
+            ((CPU_IDLE_OID,),),
+            ((MEM_TOTAL_OID,),),
+            ((MEM_AVAIL_OID,),),
+            ((LM_TEMP_OID.format(index=index),), (ENT_SENSOR_OID.format(index=index),)),
+            ((LM_TEMP_OID.format(index=2),), (ENT_SENSOR_OID.format(index=2),)),
+            *(((HR_DEVICE_STATUS_OID.format(index=psu),),) for psu in PSU_INDEXES),
+            *(((UPS_OUTPUT_SOURCE_OID.format(index=psu),),) for psu in PSU_INDEXES),
+            (
+                (IF_HC_IN_OID.format(index=index), IF_HC_OUT_OID.format(index=index)),
+                (IF_IN_OID.format(index=index), IF_OUT_OID.format(index=index)),
+            ),
+        ]
 
-    def _fetch_health_metrics(self, host: HostConfig) -> tuple[float | None, float | None]:
-        """Fetch CPU idle, total, and available memory to derive health stats."""
+    def _snmp_oids(self, host: HostConfig) -> list[str]:
+        """The OIDs to request: those the agent is known to answer, or every candidate."""
 
-        cpu_idle_oid = ObjectIdentity("1.3.6.1.4.1.2021.11.9.0")  # ssCpuIdle
-        mem_total_oid = ObjectIdentity("1.3.6.1.4.1.2021.4.5.0")  # memTotalReal
-        mem_avail_oid = ObjectIdentity("1.3.6.1.4.1.2021.4.6.0")  # memAvailReal
+        learned = self._oid_capabilities.get(host.address)
+        if learned and time.monotonic() - learned[0] < settings.snmp_capability_ttl_seconds:
+            return learned[1]
+        return [oid for chain in self._snmp_oid_chains(host) for group in chain for oid in group]
 
-        try:
-            iterator = getCmd(
-                SnmpEngine(),
-                self._community(host),
-                UdpTransportTarget((host.address, host.snmp_port), timeout=2, retries=0),
-                ContextData(),
-                ObjectType(cpu_idle_oid),
-                ObjectType(mem_total_oid),
-                ObjectType(mem_avail_oid),
-            )
-            error_indication, error_status, error_index, var_binds = next(iterator)
-            if error_indication or error_status:
-                return None, None
+    async def _poll_snmp(self, host: HostConfig) -> dict[str, object]:
+        """GET the host's OIDs and keep its capability cache current.
 
-            values: dict[str, float] = {}
-            for var_bind in var_binds:
-                oid, value = var_bind
-                values[str(oid)] = float(value)
+        A full candidate list is sent until the agent's answers have been
+        learned; after that only the OIDs it answered are requested. The cache
+        is dropped when its TTL expires, when sysUpTime goes backwards (the
+        agent restarted, possibly with new firmware) or when a learned OID
+        stops answering.
+        """
 
-            cpu_idle = values.get(str(cpu_idle_oid.getOid()))
-            mem_total = values.get(str(mem_total_oid.getOid()))
-            mem_avail = values.get(str(mem_avail_oid.getOid()))
+        learned = self._oid_capabilities.get(host.address)
+        oids = self._snmp_oids(host)
+        discovering = learned is None or oids is not learned[1]
+        values, complete = await self._snmp_get(host, oids)
+        if not complete or not values:
+            return values
 
-            cpu_usage = 100.0 - cpu_idle if cpu_idle is not None else None
-            memory_used_pct = (
-                ((mem_total - mem_avail) / mem_total) * 100 if mem_total else None
+        try:
+            uptime = _as_float(values.get(SYSUPTIME_OID))
+        except (TypeError, ValueError):
+            uptime = None
+        previous_uptime = self._sys_uptime.get(host.address)
+        if uptime is not None:
+            self._sys_uptime[host.address] = uptime
+        restarted = uptime is not None and previous_uptime is not None and uptime < previous_uptime
+        if discovering:
+            self._oid_capabilities[host.address] = (
+                time.monotonic(),
+                supported_oids(self._snmp_oid_chains(host), values),
             )
-            return cpu_usage, memory_used_pct
-        except Exception:
+        elif restarted or any(oid not in values for oid in oids):
+            self._oid_capabilities.pop(host.address, None)
+        return values
+
+    async def _snmp_get(
+        self, host: HostConfig, oids: list[str]
+    ) -> tuple[dict[str, object], bool]:
+        """Fetch ``oids`` in as few GET PDUs as the agent accepts.
+
+        Agents answering ``tooBig`` get their PDUs halved (and the smaller size
+        remembered); a varbind the agent rejects outright is dropped from its
+        PDU, which is then retried. Values missing on the agent are omitted.
+        Also returns whether every PDU was answered.
+        """
+
+        values: dict[str, object] = {}
+        max_varbinds = self._max_varbinds.get(host.address, settings.snmp_max_varbinds)
+        queue = plan_requests(oids, max_varbinds)
+        timed_out = False
+        while queue:
+            chunk = queue.pop(0)
+            try:
+                error_status, error_index, var_binds = await self.snmp.get(
+                    host.address,
+                    host.snmp_port,
+                    host.snmp_community,
+                    chunk,
+                    timeout=settings.snmp_timeout_seconds,
+                    retries=settings.snmp_retries,
+                )
+            except SnmpTimeout:
+                # a timed out agent will not answer the remaining PDUs either
+                timed_out = True
+                break
+            except SnmpResponseError as exc:
+                logger.warning("Skipping SNMP GET of %d OIDs: %s", len(chunk), exc)
+                continue
+            if error_status:
+                if error_status == TOO_BIG and len(chunk) > 1:
+                    half = len(chunk) // 2
+                    self._max_varbinds[host.address] = max(1, half)
+                    queue[:0] = [chunk[:half], chunk[half:]]
+                elif 0 < error_index <= len(chunk) and len(chunk) > 1:
+                    rejected = error_index - 1
+                    queue.insert(0, chunk[:rejected] + chunk[rejected + 1 :])
+                continue
+            for oid, value in var_binds:
+                if not is_missing(value):
+                    values[oid] = value
+        breaker = self._snmp_breakers.get(host.address)
+        if breaker is not None:
+            breaker.record(not timed_out, time.monotonic())
+        return values, not timed_out
+
+    def _parse_sysname(self, values: dict[str, object]) -> str | None:
+        value = values.get(SYSNAME_OID)
+        return str(value) if value is not None else None
+
+    def _parse_health_metrics(
+        self, values: dict[str, object]
+    ) -> tuple[float | None, float | None]:
+        """Derive CPU usage and memory use from CPU idle, total, and available memory."""
+
+        try:
+            cpu_idle = _as_float(values.get(CPU_IDLE_OID))
+            mem_total = _as_float(values.get(MEM_TOTAL_OID))
+            mem_avail = _as_float(values.get(MEM_AVAIL_OID))
+        except (TypeError, ValueError):
             return None, None
 
-    def _fetch_environment_metrics(
-        self, host: HostConfig
+        cpu_usage = 100.0 - cpu_idle if cpu_idle is not None else None
+        memory_used_pct = (
+            ((mem_total - mem_avail) / mem_total) * 100
+            if mem_total and mem_avail is not None
+            else None
+        )
+        return cpu_usage, memory_used_pct
+
+    def _parse_environment_metrics(
+        self, host: HostConfig, values: dict[str, object]
     ) -> tuple[float | None, float | None, list[str]]:
-        """Fetch interface + system temperatures and PSU status via best-effort SNMP."""
-
-        interface_temp_oids = [
-            ObjectIdentity(
-                f"1.3.6.1.4.1.2021.13.16.2.1.3.{host.interface_index}"
-            ),  # lmTempSensorsValue.{idx}
-            ObjectIdentity(
-                f"1.3.6.1.2.1.99.1.1.1.4.{host.interface_index}"
-            ),  # entPhySensorValue.{idx}
-        ]
-        system_temp_oids = [
-            ObjectIdentity("1.3.6.1.4.1.2021.13.16.2.1.3.2"),  # lmTempSensorsValue.2
-            ObjectIdentity("1.3.6.1.2.1.99.1.1.1.4.2"),  # entPhySensorValue.2
-        ]
-        hr_device_status = "1.3.6.1.2.1.25.3.2.1.5.{index}"
-        ups_output_source = "1.3.6.1.2.1.33.1.2.2.1.4.{index}"
-
-        def _first_value(identities: list[ObjectIdentity]) -> float | int | str | None:
-            for oid in identities:
-                try:
-                    iterator = getCmd(
-                        SnmpEngine(),
-                        self._community(host),
-                        UdpTransportTarget((host.address, host.snmp_port), timeout=2, retries=0),
-                        ContextData(),
-                        ObjectType(oid),
-                    )
-                    error_indication, error_status, _error_index, var_binds = next(iterator)
-                    if error_indication or error_status:
-                        continue
-                    for _, value in var_binds:
-                        return value  # type: ignore[return-value]
-                except Exception:
-                    continue
+        """Read interface + system temperatures and PSU status from best-effort OIDs."""
+
+        def _first_value(oids: list[str]) -> object | None:
+            for oid in oids:
+                if oid in values:
+                    return values[oid]
             return None
 
-        raw_interface_temp = _first_value(interface_temp_oids)
-        interface_temp_c = None
-        if raw_interface_temp is not None:
+        def _temperature(oids: list[str]) -> float | None:
             try:
-                interface_temp_c = float(raw_interface_temp)
+                return _as_float(_first_value(oids))
             except (TypeError, ValueError):
-                interface_temp_c = None
+                return None
 
-        raw_system_temp = _first_value(system_temp_oids)
-        system_temp_c = None
-        if raw_system_temp is not None:
-            try:
-                system_temp_c = float(raw_system_temp)
-            except (TypeError, ValueError):
-                system_temp_c = None
+        interface_temp_c = _temperature(
+            [
+                LM_TEMP_OID.format(index=host.interface_index),
+                ENT_SENSOR_OID.format(index=host.interface_index),
+            ]
+        )
+        system_temp_c = _temperature(
+            [LM_TEMP_OID.format(index=2), ENT_SENSOR_OID.format(index=2)]
+        )
 
         psu_statuses: list[str] = []
 
-        def _decode_hr_device_status(value: float | int | str | None) -> str | None:
+        def _decode_hr_device_status(value: object | None) -> str | None:
             if value is None:
                 return None
             try:
-                psu_state = int(value)
+                psu_state = int(value)  # type: ignore[call-overload]
                 psu_status_map = {
                     1: "unknown",
                     2: "ok",
@@ -385,11 +913,11 @@ class MonitorService:
             except (TypeError, ValueError):
                 return str(value)
 
-        def _decode_ups_output_source(value: float | int | str | None) -> str | None:
+        def _decode_ups_output_source(value: object | None) -> str | None:
             if value is None:
                 return None
             try:
-                source_state = int(value)
+                source_state = int(value)  # type: ignore[call-overload]
                 source_map = {
                     1: "other",
                     2: None,  # "none" means the source is not active/present
@@ -404,11 +932,12 @@ class MonitorService:
                 return str(value)
 
         def _psu_status(index: int) -> str | None:
-            hr_value = _first_value([ObjectIdentity(hr_device_status.format(index=index))])
-            decoded_hr = _decode_hr_device_status(hr_value)
-
-            ups_value = _first_value([ObjectIdentity(ups_output_source.format(index=index))])
-            decoded_ups = _decode_ups_output_source(ups_value)
+            decoded_hr = _decode_hr_device_status(
+                values.get(HR_DEVICE_STATUS_OID.format(index=index))
+            )
+            decoded_ups = _decode_ups_output_source(
+                values.get(UPS_OUTPUT_SOURCE_OID.format(index=index))
+            )
 
             chosen = decoded_hr or decoded_ups
 
@@ -417,7 +946,7 @@ class MonitorService:
 
             return chosen
 
-        for index in (1, 2):
+        for index in PSU_INDEXES:
             status_value = _psu_status(index)
             if status_value is None:
                 continue
@@ -426,82 +955,103 @@ class MonitorService:
 
         return interface_temp_c, system_temp_c, psu_statuses
 
-    def _fetch_interface_throughput(
-        self, host: HostConfig, now: datetime
+    def _parse_interface_throughput(
+        self, host: HostConfig, values: dict[str, object], now: datetime
     ) -> tuple[float | None, float | None]:
         """Compute interface throughput in bits per second using counter deltas."""
 
-        high_cap_in = ObjectIdentity(
-            f"1.3.6.1.2.1.31.1.1.1.6.{host.interface_index}"
-        )
-        high_cap_out = ObjectIdentity(
-            f"1.3.6.1.2.1.31.1.1.1.10.{host.interface_index}"
-        )
-        legacy_in = ObjectIdentity(f"1.3.6.1.2.1.2.2.1.10.{host.interface_index}")
-        legacy_out = ObjectIdentity(f"1.3.6.1.2.1.2.2.1.16.{host.interface_index}")
-
-        def _fetch_counters(oids: list[ObjectIdentity]) -> dict[str, int]:
-            iterator = getCmd(
-                SnmpEngine(),
-                self._community(host),
-                UdpTransportTarget((host.address, host.snmp_port), timeout=2, retries=0),
-                ContextData(),
-                *(ObjectType(oid) for oid in oids),
-            )
-            counters: dict[str, int] = {}
-            error_indication, error_status, _error_index, var_binds = next(iterator)
-            if error_indication or error_status:
-                return counters
-            for oid, value in var_binds:
-                try:
-                    counters[str(oid)] = int(value)
-                except (TypeError, ValueError):
-                    continue
-            return counters
-
-        try:
-            values = _fetch_counters([high_cap_in, high_cap_out])
-            counter_mod = 2**64
+        def _counters(in_oid: str, out_oid: str) -> tuple[int | None, int | None]:
+            try:
+                in_value = values.get(in_oid.format(index=host.interface_index))
+                out_value = values.get(out_oid.format(index=host.interface_index))
+                return (
+                    int(in_value) if in_value is not None else None,  # type: ignore[call-overload]
+                    int(out_value) if out_value is not None else None,  # type: ignore[call-overload]
+                )
+            except (TypeError, ValueError):
+                return None, None
 
-            if not values:
-                values = _fetch_counters([legacy_in, legacy_out])
-                counter_mod = 2**32
+        in_octets, out_octets = _counters(IF_HC_IN_OID, IF_HC_OUT_OID)
+        counter_mod = 2**64
+        if in_octets is None and out_octets is None:
+            in_octets, out_octets = _counters(IF_IN_OID, IF_OUT_OID)
+            counter_mod = 2**32
+        if in_octets is None or out_octets is None:
+            return None, None
 
-            in_octets = values.get(str(high_cap_in.getOid())) or values.get(
-                str(legacy_in.getOid())
-            )
-            out_octets = values.get(str(high_cap_out.getOid())) or values.get(
-                str(legacy_out.getOid())
-            )
-            if in_octets is None or out_octets is None:
-                return None, None
+        previous = self._previous_counters.get(host.address)
+        self._previous_counters[host.address] = (in_octets, out_octets, now, counter_mod)
+        if not previous:
+            return None, None
 
-            previous = self._previous_counters.get(host.address)
-            self._previous_counters[host.address] = (in_octets, out_octets, now, counter_mod)
-            if not previous:
-                return None, None
+        prev_in, prev_out, prev_time, prev_mod = previous
+        elapsed = (now - prev_time).total_seconds()
+        if elapsed <= 0:
+            return None, None
 
-            prev_in, prev_out, prev_time, prev_mod = previous
-            elapsed = (now - prev_time).total_seconds()
-            if elapsed <= 0:
-                return None, None
+        def _compute_rate(current: int, previous_value: int, modulus: int) -> float | None:
+            if current < previous_value:
+                current += modulus
+            if current < previous_value:
+                return None
+            return ((current - previous_value) * 8) / elapsed
 
-            def _compute_rate(current: int, previous_value: int, modulus: int) -> float | None:
-                if current < previous_value:
-                    current += modulus
-                if current < previous_value:
-                    return None
-                return ((current - previous_value) * 8) / elapsed
+        return (
+            _compute_rate(in_octets, prev_in, prev_mod),
+            _compute_rate(out_octets, prev_out, prev_mod),
+        )
 
-            return (
-                _compute_rate(in_octets, prev_in, prev_mod),
-                _compute_rate(out_octets, prev_out, prev_mod),
+    async def _collect_interface_table(self, host: HostConfig, now: datetime) -> None:
+        """Walk ifXTable (or ifTable on 32-bit-only agents) and update the host's rates."""
+
+        async def _walk(columns: list[str]) -> dict[str, list[tuple[str, object]]]:
+            return await self.snmp.walk_columns(
+                host.address,
+                host.snmp_port,
+                host.snmp_community,
+                columns,
+                max_repetitions=settings.snmp_bulk_max_repetitions,
+                timeout=settings.snmp_timeout_seconds,
+                retries=settings.snmp_retries,
             )
-        except Exception:
-            return None, None
+
+        try:
+            rows = await _walk([IF_NAME_COLUMN, IF_HC_IN_COLUMN, IF_HC_OUT_COLUMN])
+            in_column, out_column, counter_mod = IF_HC_IN_COLUMN, IF_HC_OUT_COLUMN, 2**64
+            if not rows[IF_HC_IN_COLUMN]:
+                rows.update(await _walk([IF_IN_COLUMN, IF_OUT_COLUMN]))
+                in_column, out_column, counter_mod = IF_IN_COLUMN, IF_OUT_COLUMN, 2**32
+        except SnmpTimeout:
+            return
+        except SnmpError as exc:
+            # the previous table, and the host's other metrics, stay as they are
+            logger.warning("Interface walk of %s failed: %s", host.address, exc)
+            return
+
+        def _by_index(column: str) -> dict[int, object]:
+            return {int(suffix): value for suffix, value in rows.get(column, []) if suffix.isdigit()}
+
+        in_octets = _by_index(in_column)
+        out_octets = _by_index(out_column)
+        try:
+            counters = {
+                index: (int(in_octets[index]), int(out_octets[index]))  # type: ignore[call-overload]
+                for index in in_octets.keys() & out_octets.keys()
+            }
+        except (TypeError, ValueError) as exc:
+            logger.warning("Interface walk of %s returned a non-counter value: %s", host.address, exc)
+            return
+        if not counters:
+            return
+        names = {index: str(value) for index, value in _by_index(IF_NAME_COLUMN).items()}
+        table = self.interface_tables.setdefault(host.address, InterfaceTable())
+        table.update(counters, names, counter_mod, now)
 
     async def _maybe_notify(self, status: HostStatus) -> None:
         """Send alerts when a host enters an alerting state or recovers."""
+        if status.suppressed_by:
+            # the parent's own alert covers hosts behind it
+            return
         threshold_exceeded = not status.reachable or any(status.notes)
         now = datetime.utcnow()
         should_alert = False
@@ -528,5 +1078,6 @@ class MonitorService:
             f"Notes: {details}\n"
         )
 
-        self.notifications.send_email(subject, body)
-        await self.notifications.send_slack(f"{subject}\n{details}")
+        self.notifications.notify(
+            subject, body, details, recovery=subject_prefix == "RECOVERY"
+        )
@@ -1,20 +1,174 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import smtplib
+import time
 from email.message import EmailMessage
+from typing import Awaitable, Callable
 
 import httpx
 
+from .models import ChannelStats, NotificationStats
 from .settings import settings
 
 logger = logging.getLogger(__name__)
 
+# lines listed in a Slack digest before the rest are summarised as a count
+_DIGEST_SLACK_LINES = 40
+
+
+class RetryAfter(Exception):
+    """Raised by a delivery the remote side asked to retry after ``delay`` seconds."""
+
+    def __init__(self, delay: float) -> None:
+        super().__init__(f"rate limited; retry after {delay:.1f}s")
+        self.delay = delay
+
+
+class _TokenBucket:
+    """Paces calls to ``rate`` per second with bursts of up to ``burst``."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = max(rate, 1e-3)
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for ``seconds``, as a server's ``Retry-After`` asks."""
+
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+
+class _Channel:
+    """A bounded outbound queue drained by dedicated worker tasks with retry/backoff."""
+
+    def __init__(
+        self,
+        name: str,
+        deliver: Callable[[object], Awaitable[None]],
+        workers: int,
+    ) -> None:
+        self.name = name
+        self._deliver = deliver
+        self._worker_count = max(1, workers)
+        self._queue: asyncio.Queue[tuple[float, object]] = asyncio.Queue(
+            maxsize=max(1, settings.notification_queue_size)
+        )
+        self._workers: list[asyncio.Task] = []
+        self.stats = ChannelStats()
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._work()) for _ in range(self._worker_count)
+            ]
+
+    def submit(self, item: object) -> bool:
+        try:
+            self._queue.put_nowait((time.monotonic(), item))
+        except asyncio.QueueFull:
+            self.stats.dropped += 1
+            logger.warning("%s notification queue full; dropping message", self.name)
+            return False
+        return True
+
+    async def stop(self, timeout: float) -> None:
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "%d %s notifications undelivered at shutdown", self._queue.qsize(), self.name
+            )
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def snapshot(self) -> ChannelStats:
+        self.stats.queued = self._queue.qsize()
+        return self.stats
+
+    async def _work(self) -> None:
+        while True:
+            queued_at, item = await self._queue.get()
+            try:
+                await self._send_with_retries(item)
+                latency = time.monotonic() - queued_at
+                self.stats.sent += 1
+                self.stats.last_latency_s = latency
+                self.stats.max_latency_s = max(self.stats.max_latency_s, latency)
+            except Exception as exc:  # pragma: no cover - operational best effort
+                self.stats.failed += 1
+                logger.error("Giving up on %s notification: %s", self.name, exc)
+            finally:
+                self._queue.task_done()
+
+    async def _send_with_retries(self, item: object) -> None:
+        attempts = max(1, settings.notification_retries + 1)
+        for attempt in range(attempts):
+            try:
+                await self._deliver(item)
+                return
+            except Exception as exc:  # pragma: no cover - operational best effort
+                if attempt + 1 == attempts:
+                    raise
+                self.stats.retries += 1
+                delay = settings.notification_backoff_seconds * 2**attempt
+                if isinstance(exc, RetryAfter):
+                    delay = max(delay, exc.delay)
+                logger.warning(
+                    "%s delivery failed (%s); retrying in %.1fs", self.name, exc, delay
+                )
+                await asyncio.sleep(delay)
+
 
 class NotificationManager:
+    """Queues alerts for email and Slack delivery off the polling path.
+
+    Email goes through one long-lived SMTP session (opened on first use and
+    re-established when the server drops it or the settings change), driven
+    from a worker thread. Slack posts share one pooled ``httpx.AsyncClient``
+    and a token bucket that also honours ``Retry-After`` on 429 responses.
+
+    Alerts passed to :meth:`notify` are held for ``notification_digest_seconds``
+    and then sent as a single digest per channel, so a mass outage costs one
+    email and one Slack post rather than one of each per host.
+    """
+
     def __init__(self) -> None:
         self.smtp_enabled: bool | None = None
         self.slack_enabled: bool | None = None
+        self._smtp: smtplib.SMTP | None = None
+        self._smtp_key: tuple | None = None
+        self._http: httpx.AsyncClient | None = None
+        self._email = _Channel("email", self._deliver_email, workers=1)
+        self._slack = _Channel("slack", self._deliver_slack, workers=settings.notification_workers)
+        self._slack_bucket = _TokenBucket(
+            settings.slack_rate_per_second, settings.slack_burst
+        )
+        # (subject, email body, one-line summary, is a recovery) awaiting the digest
+        self._pending: list[tuple[str, str, str, bool]] = []
+        self._digest_task: asyncio.Task | None = None
+        self.digests_sent = 0
 
     @property
     def smtp_configured(self) -> bool:
@@ -30,6 +184,69 @@ class NotificationManager:
     def slack_configured(self) -> bool:
         return bool(settings.slack_webhook_url)
 
+    def start(self) -> None:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=10.0, limits=httpx.Limits(max_connections=settings.notification_workers)
+            )
+        self._email.start()
+        self._slack.start()
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        if self._digest_task is not None:
+            self._digest_task.cancel()
+            self._digest_task = None
+        self._flush_digest()
+        await asyncio.gather(self._email.stop(timeout), self._slack.stop(timeout))
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        await asyncio.to_thread(self._close_smtp)
+
+    def stats(self) -> NotificationStats:
+        return NotificationStats(
+            email=self._email.snapshot(),
+            slack=self._slack.snapshot(),
+            pending_digest=len(self._pending),
+            digests_sent=self.digests_sent,
+        )
+
+    def notify(self, subject: str, body: str, summary: str, recovery: bool = False) -> None:
+        """Queue one alert or recovery on every channel, batched into the digest window."""
+
+        if settings.notification_digest_seconds <= 0:
+            self.send_email(subject, body)
+            self.send_slack(f"{subject}\n{summary}")
+            return
+        self._pending.append((subject, body, summary, recovery))
+        if self._digest_task is None:
+            self._digest_task = asyncio.create_task(self._digest_after_window())
+
+    async def _digest_after_window(self) -> None:
+        await asyncio.sleep(settings.notification_digest_seconds)
+        self._digest_task = None
+        self._flush_digest()
+
+    def _flush_digest(self) -> None:
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        if len(pending) == 1:
+            subject, body, summary, _recovery = pending[0]
+            self.send_email(subject, body)
+            self.send_slack(f"{subject}\n{summary}")
+            return
+        recoveries = sum(1 for *_rest, recovery in pending if recovery)
+        alerts = len(pending) - recoveries
+        subject = f"DIGEST: {alerts} alert(s), {recoveries} recovery(ies)"
+        self.send_email(subject, "\n".join(body for _subject, body, *_rest in pending))
+        lines = [f"{title} — {summary}" for title, _body, summary, _recovery in pending]
+        if len(lines) > _DIGEST_SLACK_LINES:
+            extra = len(lines) - _DIGEST_SLACK_LINES
+            lines = lines[:_DIGEST_SLACK_LINES] + [f"…and {extra} more"]
+        self.send_slack("\n".join([subject, *lines]))
+        self.digests_sent += 1
+
     def _build_email(self, subject: str, body: str) -> EmailMessage:
         message = EmailMessage()
         message["Subject"] = subject
@@ -39,27 +256,62 @@ class NotificationManager:
         return message
 
     def send_email(self, subject: str, body: str) -> None:
+        """Queue an email; returns immediately."""
+
         if not self.smtp_configured:
             logger.info("SMTP not configured; skipping email delivery")
             return
-        message = self._build_email(subject, body)
-        try:
-            with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as smtp:
-                smtp.starttls()
-                smtp.login(settings.smtp_username, settings.smtp_password)
-                smtp.send_message(message)
-                logger.info("Sent email alert: %s", subject)
-        except Exception as exc:  # pragma: no cover - operational best effort
-            logger.exception("Failed to send email: %s", exc)
-
-    async def send_slack(self, text: str) -> None:
+        self._email.submit(self._build_email(subject, body))
+
+    def send_slack(self, text: str) -> None:
+        """Queue a Slack message; returns immediately."""
+
         if not self.slack_configured:
             logger.info("Slack webhook not configured; skipping notification")
             return
+        self._slack.submit(text)
+
+    async def _deliver_email(self, message: object) -> None:
+        await asyncio.to_thread(self._send_smtp, message)
+        logger.info("Sent email alert: %s", message["Subject"])  # type: ignore[index]
+
+    def _send_smtp(self, message: EmailMessage) -> None:
+        key = (settings.smtp_host, settings.smtp_port, settings.smtp_username)
+        if self._smtp is not None and key != self._smtp_key:
+            self._close_smtp()
+        if self._smtp is None:
+            smtp = smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=30)
+            smtp.starttls()
+            smtp.login(settings.smtp_username, settings.smtp_password)
+            self._smtp, self._smtp_key = smtp, key
+        try:
+            self._smtp.send_message(message)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            # the relay closed the idle session; the retry reconnects
+            self._close_smtp()
+            raise
+
+    def _close_smtp(self) -> None:
+        if self._smtp is None:
+            return
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(settings.slack_webhook_url, json={"text": text})
-                resp.raise_for_status()
-                logger.info("Sent slack alert")
-        except Exception as exc:  # pragma: no cover - operational best effort
-            logger.exception("Failed to send slack message: %s", exc)
+            self._smtp.quit()
+        except Exception:  # pragma: no cover - already disconnected
+            self._smtp.close()
+        self._smtp = None
+        self._smtp_key = None
+
+    async def _deliver_slack(self, text: object) -> None:
+        if self._http is None:
+            raise RuntimeError("Notification manager not started")
+        await self._slack_bucket.acquire()
+        resp = await self._http.post(settings.slack_webhook_url, json={"text": text})
+        if resp.status_code == 429:
+            try:
+                delay = float(resp.headers.get("retry-after", "1"))
+            except ValueError:
+                delay = 1.0
+            self._slack_bucket.pause(delay)
+            raise RetryAfter(delay)
+        resp.raise_for_status()
+        logger.info("Sent slack alert")
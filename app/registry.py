@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import ipaddress
+from typing import Iterable, Iterator
+
+from .models import HostConfig
+
+
+class AddressRange:
+    """A lazily expanded, inclusive range of IP addresses.
+
+    Only the two endpoints are stored, so a large IPv6 prefix costs nothing
+    until (and unless) it is iterated.
+    """
+
+    __slots__ = ("first", "last")
+
+    def __init__(
+        self,
+        first: ipaddress.IPv4Address | ipaddress.IPv6Address,
+        last: ipaddress.IPv4Address | ipaddress.IPv6Address,
+    ) -> None:
+        self.first = first
+        self.last = last
+
+    @property
+    def size(self) -> int:
+        # not __len__: an IPv6 prefix can exceed what len() may return
+        return int(self.last) - int(self.first) + 1
+
+    def __iter__(self) -> Iterator[str]:
+        first = self.first
+        for offset in range(self.size):
+            yield str(first + offset)
+
+
+def parse_range(range_text: str, max_addresses: int | None = None) -> AddressRange:
+    """Parse a CIDR block, start-end pair or single IP.
+
+    Networks exclude their network and broadcast addresses (IPv6 only the
+    subnet-router anycast address) like ``ip_network().hosts()``. Raises
+    ``ValueError`` for malformed input or a range larger than ``max_addresses``.
+    """
+
+    cleaned = range_text.strip()
+    if "-" in cleaned:
+        start_raw, end_raw = [part.strip() for part in cleaned.split("-", 1)]
+        start_ip = ipaddress.ip_address(start_raw)
+        end_ip = ipaddress.ip_address(end_raw)
+        if start_ip.version != end_ip.version or int(end_ip) < int(start_ip):
+            raise ValueError("Invalid IP range ordering")
+        addresses = AddressRange(start_ip, end_ip)
+    else:
+        try:
+            network = ipaddress.ip_network(cleaned, strict=False)
+        except ValueError:
+            # fall back to single IP
+            address = ipaddress.ip_address(cleaned)
+            addresses = AddressRange(address, address)
+        else:
+            first, last = network.network_address, network.broadcast_address
+            if network.num_addresses > 2 and network.version == 4:
+                first, last = first + 1, last - 1
+            elif network.num_addresses > 2:
+                first = first + 1
+            addresses = AddressRange(first, last)
+    if max_addresses is not None and addresses.size > max_addresses:
+        raise ValueError(
+            f"Range covers {addresses.size} addresses; at most {max_addresses} can be added at once"
+        )
+    return addresses
+
+
+class HostRegistry:
+    """Monitored hosts keyed by address.
+
+    Adds and removes are dictionary operations. Readers that iterate (the
+    poller, a full rescan) take :meth:`snapshot`, an immutable tuple rebuilt
+    at most once per change, so concurrent API edits never disturb a running
+    iteration.
+    """
+
+    def __init__(self, hosts: Iterable[HostConfig] = ()) -> None:
+        self._hosts: dict[str, HostConfig] = {}
+        self._children: dict[str, set[str]] = {}
+        self._snapshot: tuple[HostConfig, ...] | None = None
+        self.add_many(hosts)
+
+    def __contains__(self, address: object) -> bool:
+        return address in self._hosts
+
+    def __len__(self) -> int:
+        return len(self._hosts)
+
+    def __iter__(self) -> Iterator[HostConfig]:
+        return iter(self.snapshot())
+
+    def get(self, address: str) -> HostConfig | None:
+        return self._hosts.get(address)
+
+    def children(self, address: str) -> set[str]:
+        """Addresses of the hosts whose ``parent`` is ``address``."""
+
+        return self._children.get(address, set())
+
+    def snapshot(self) -> tuple[HostConfig, ...]:
+        if self._snapshot is None:
+            self._snapshot = tuple(self._hosts.values())
+        return self._snapshot
+
+    def add_many(self, hosts: Iterable[HostConfig]) -> list[HostConfig]:
+        """Register hosts whose address is not already present; returns those added."""
+
+        added: list[HostConfig] = []
+        for host in hosts:
+            if host.address in self._hosts:
+                continue
+            self._hosts[host.address] = host
+            if host.parent:
+                self._children.setdefault(host.parent, set()).add(host.address)
+            added.append(host)
+        if added:
+            self._snapshot = None
+        return added
+
+    def remove_many(self, addresses: Iterable[str]) -> list[HostConfig]:
+        """Unregister addresses; returns the hosts that were present."""
+
+        removed: list[HostConfig] = []
+        for address in addresses:
+            host = self._hosts.pop(address, None)
+            if host is not None:
+                if host.parent and host.parent in self._children:
+                    self._children[host.parent].discard(address)
+                removed.append(host)
+        if removed:
+            self._snapshot = None
+        return removed
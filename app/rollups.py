@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import math
+from array import array
+from collections import deque
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from .history import from_epoch, to_epoch
+from .models import HostRollup, HostSample, HostStatus
+
+if TYPE_CHECKING:
+    from .storage import SampleStorage
+
+ROLLUP_FIELDS = (
+    "latency_ms",
+    "packet_loss_pct",
+    "cpu_usage_pct",
+    "memory_used_pct",
+    "interface_temp_c",
+    "system_temp_c",
+    "interface_in_bps",
+    "interface_out_bps",
+)
+TIERS: dict[str, int] = {"1m": 60, "5m": 300, "1h": 3600}
+# one day of minutes, one week of five-minute buckets, thirty days of hours
+TIER_CAPACITY: dict[str, int] = {"1m": 1440, "5m": 2016, "1h": 720}
+
+# per metric: min, max, sum, count
+_STATS = 4
+
+
+class _Bucket:
+    """Streaming min/max/sum/count accumulators for one host, tier and bucket."""
+
+    __slots__ = ("start", "count", "reachable", "stats")
+
+    def __init__(self, start: float) -> None:
+        self.start = start
+        self.count = 0
+        self.reachable = 0
+        self.stats = array("d", [math.inf, -math.inf, 0.0, 0.0] * len(ROLLUP_FIELDS))
+
+    def add(self, sample: HostStatus | HostSample) -> None:
+        self.count += 1
+        self.reachable += int(sample.reachable)
+        stats = self.stats
+        for position, name in enumerate(ROLLUP_FIELDS):
+            value = getattr(sample, name)
+            if value is None:
+                continue
+            offset = position * _STATS
+            if value < stats[offset]:
+                stats[offset] = value
+            if value > stats[offset + 1]:
+                stats[offset + 1] = value
+            stats[offset + 2] += value
+            stats[offset + 3] += 1
+
+    def row(self) -> tuple[float, ...]:
+        """Flat ``(start, count, reachable, min, max, sum, count, ...)`` record."""
+
+        return (self.start, self.count, self.reachable, *self.stats)
+
+
+def rollup_columns() -> list[str]:
+    """Column names matching :meth:`_Bucket.row` after the bucket start."""
+
+    columns = ["count", "reachable"]
+    for name in ROLLUP_FIELDS:
+        columns.extend((f"{name}_min", f"{name}_max", f"{name}_sum", f"{name}_count"))
+    return columns
+
+
+def merge_rows(first: tuple[float, ...], second: tuple[float, ...]) -> tuple[float, ...]:
+    """Combine two rows of the same bucket, e.g. one persisted before a restart and its reopened successor."""
+
+    start, count, reachable, *stats = first
+    _start, other_count, other_reachable, *other = second
+    merged: list[float] = []
+    for offset in range(0, len(stats), _STATS):
+        merged.extend(
+            (
+                min(stats[offset], other[offset]),
+                max(stats[offset + 1], other[offset + 1]),
+                stats[offset + 2] + other[offset + 2],
+                stats[offset + 3] + other[offset + 3],
+            )
+        )
+    return (start, count + other_count, reachable + other_reachable, *merged)
+
+
+def merge_sql(table: str) -> str:
+    """Upsert for ``table`` that folds a row into an existing one like :func:`merge_rows`."""
+
+    columns = ["address", "ts", *rollup_columns()]
+    updates = []
+    for column in columns[2:]:
+        if column.endswith("_min"):
+            updates.append(f"{column} = min({column}, excluded.{column})")
+        elif column.endswith("_max"):
+            updates.append(f"{column} = max({column}, excluded.{column})")
+        else:
+            updates.append(f"{column} = {column} + excluded.{column}")
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+        f"ON CONFLICT (address, ts) DO UPDATE SET {', '.join(updates)}"
+    )
+
+
+def to_rollup(resolution: str, row: tuple[float, ...]) -> HostRollup:
+    start, count, reachable, *stats = row
+    averages: dict[str, float | None] = {}
+    minimum: dict[str, float] = {}
+    maximum: dict[str, float] = {}
+    counts: dict[str, int] = {}
+    for position, name in enumerate(ROLLUP_FIELDS):
+        low, high, total, seen = stats[position * _STATS : (position + 1) * _STATS]
+        if not seen:
+            averages[name] = None
+            continue
+        averages[name] = total / seen
+        minimum[name] = low
+        maximum[name] = high
+        counts[name] = int(seen)
+    return HostRollup(
+        timestamp=from_epoch(start),
+        resolution=resolution,
+        count=int(count),
+        reachable_pct=100.0 * reachable / count if count else None,
+        minimum=minimum,
+        maximum=maximum,
+        counts=counts,
+        **averages,
+    )
+
+
+class RollupStore:
+    """Maintains 1m/5m/1h rollups per host as samples are recorded.
+
+    Closed buckets are kept in bounded in-memory rings and, when durable
+    storage is configured, handed to it for persistence.
+    """
+
+    def __init__(self, storage: SampleStorage | None = None) -> None:
+        self.storage = storage
+        self._open: dict[str, dict[str, _Bucket]] = {}
+        self._closed: dict[str, dict[str, deque[tuple[float, ...]]]] = {}
+
+    def add(self, address: str) -> None:
+        self._open.setdefault(address, {})
+        self._closed.setdefault(
+            address, {tier: deque(maxlen=TIER_CAPACITY[tier]) for tier in TIERS}
+        )
+
+    def remove(self, address: str) -> None:
+        self._open.pop(address, None)
+        self._closed.pop(address, None)
+
+    def record(self, address: str, sample: HostStatus | HostSample, timestamp: datetime) -> None:
+        open_buckets = self._open.get(address)
+        if open_buckets is None:
+            return
+        epoch = to_epoch(timestamp)
+        for tier, seconds in TIERS.items():
+            start = epoch - epoch % seconds
+            bucket = open_buckets.get(tier)
+            if bucket is None or bucket.start != start:
+                if bucket is not None:
+                    self._close(address, tier, bucket)
+                bucket = _Bucket(start)
+                open_buckets[tier] = bucket
+            bucket.add(sample)
+
+    def _close(self, address: str, tier: str, bucket: _Bucket) -> None:
+        row = bucket.row()
+        self._closed[address][tier].append(row)
+        if self.storage is not None:
+            self.storage.append_rollup(tier, address, row)
+
+    def flush(self) -> None:
+        """Close every open bucket, e.g. before shutdown."""
+
+        for address, open_buckets in self._open.items():
+            for tier, bucket in open_buckets.items():
+                self._close(address, tier, bucket)
+            open_buckets.clear()
+
+    def open_row(self, address: str, tier: str) -> tuple[float, ...] | None:
+        bucket = self._open.get(address, {}).get(tier)
+        return bucket.row() if bucket else None
+
+    def rows(
+        self, address: str, tier: str, start: float, end: float
+    ) -> list[tuple[float, ...]]:
+        """In-memory closed buckets plus the open one, within ``[start, end]``."""
+
+        closed = self._closed.get(address, {}).get(tier, ())
+        rows = [row for row in closed if start <= row[0] <= end]
+        current = self.open_row(address, tier)
+        if current is not None and start <= current[0] <= end:
+            rows.append(current)
+        return rows
+
+
+def pick_resolution(span_seconds: float, interval_seconds: float, max_points: int) -> str:
+    """Choose the finest tier that keeps a ``span_seconds`` chart under ``max_points``."""
+
+    if span_seconds / max(interval_seconds, 1) <= max_points:
+        return "raw"
+    for tier, seconds in TIERS.items():
+        if span_seconds / seconds <= max_points:
+            return tier
+    return next(reversed(TIERS))
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import random
+import time
+
+
+class _Entry:
+    """Scheduling state for one host."""
+
+    __slots__ = ("interval", "token", "failures", "reachable", "due")
+
+    def __init__(self, interval: float | None) -> None:
+        self.interval = interval
+        # the token of the host's live heap item; older items are stale
+        self.token = -1
+        self.failures = 0
+        self.reachable: bool | None = None
+        self.due: float | None = None
+
+
+class HostScheduler:
+    """Min-heap of per-host due times.
+
+    New hosts start at a random phase within their interval so probes are
+    spread evenly instead of firing in one burst. After each check the next
+    due time is the host's interval (its own override or the default) with
+    jitter, shortened right after a reachability change and stretched
+    exponentially while a host keeps failing. Heap items are invalidated
+    lazily: rescheduling a host gives it a fresh token from a scheduler-wide
+    counter (so a host removed and added again cannot revive its old items),
+    and items whose token no longer matches are dropped when they reach the top.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        jitter: float = 0.1,
+        max_backoff: int = 8,
+        recheck_seconds: float = 5.0,
+    ) -> None:
+        self.interval = interval
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.recheck_seconds = recheck_seconds
+        self._entries: dict[str, _Entry] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._tokens = itertools.count()
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, address: str, interval: float | None = None) -> None:
+        if address in self._entries:
+            return
+        entry = _Entry(interval)
+        self._entries[address] = entry
+        self._push(address, entry, time.monotonic() + random.uniform(0, self._base(entry)))
+
+    def remove(self, address: str) -> None:
+        self._entries.pop(address, None)
+
+    def set_interval(self, interval: float) -> bool:
+        """Change the default interval and re-spread hosts that use it."""
+
+        if interval == self.interval:
+            return False
+        self.interval = interval
+        now = time.monotonic()
+        for address, entry in self._entries.items():
+            if entry.interval is None and entry.due is not None:
+                self._push(address, entry, now + random.uniform(0, interval))
+        return True
+
+    def expedite(self, address: str, delay: float) -> None:
+        """Bring a waiting host's next check forward to at most ``delay`` from now."""
+
+        entry = self._entries.get(address)
+        due = time.monotonic() + delay
+        if entry is not None and entry.due is not None and entry.due > due:
+            self._push(address, entry, due)
+
+    def pop_due(self, now: float) -> list[tuple[str, float]]:
+        """Remove every host due at ``now`` with how late it is; they stay out until :meth:`done`."""
+
+        due: list[tuple[str, float]] = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            when, token, address = heapq.heappop(heap)
+            entry = self._entries.get(address)
+            if entry is None or entry.token != token:
+                continue
+            entry.due = None
+            due.append((address, now - when))
+        return due
+
+    def done(self, address: str, reachable: bool) -> float | None:
+        """Schedule the next check after one finished; returns the delay chosen."""
+
+        entry = self._entries.get(address)
+        if entry is None:
+            return None
+        changed = entry.reachable is not None and entry.reachable != reachable
+        entry.reachable = reachable
+        entry.failures = 0 if reachable else entry.failures + 1
+        base = self._base(entry)
+        if changed:
+            delay = min(base, self.recheck_seconds)
+        else:
+            delay = base * min(2 ** max(0, entry.failures - 1), self.max_backoff)
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        self._push(address, entry, time.monotonic() + delay)
+        return delay
+
+    def next_delay(self, now: float) -> float | None:
+        """Seconds until the earliest live heap item, or ``None`` when nothing is scheduled."""
+
+        heap = self._heap
+        while heap:
+            _, token, address = heap[0]
+            entry = self._entries.get(address)
+            if entry is not None and entry.token == token:
+                return max(0.0, heap[0][0] - now)
+            heapq.heappop(heap)
+        return None
+
+    def _base(self, entry: _Entry) -> float:
+        return entry.interval or self.interval
+
+    def _push(self, address: str, entry: _Entry, due: float) -> None:
+        entry.token = next(self._tokens)
+        entry.due = due
+        heapq.heappush(self._heap, (due, entry.token, address))
@@ -5,9 +5,14 @@ import json
 
 from pydantic_settings import BaseSettings
 
+from .models import SettingsUpdate
+
 
 BASE_DIR = Path(__file__).parent.parent
 SETTINGS_PATH = BASE_DIR / "config" / "settings.json"
+# only what the settings page edits is saved; deployment and identity
+# settings (cluster, workers, storage paths, export) always come from env
+PERSISTED_FIELDS = tuple(SettingsUpdate.model_fields)
 
 
 class Settings(BaseSettings):
@@ -16,6 +21,34 @@ class Settings(BaseSettings):
     monitor_interval_seconds: int = 30
     latency_threshold_ms: float = 150.0
     packet_loss_threshold_pct: float = 30.0
+    max_concurrent_checks: int = 256
+    poll_workers: int = 0
+    cluster_nodes: list[str] = []
+    cluster_self: str | None = None
+    cycle_deadline_seconds: float | None = None
+    schedule_jitter: float = 0.1
+    failure_backoff_max: int = 8
+    state_change_recheck_seconds: float = 5.0
+    dependency_canary_seconds: float = 300.0
+    ping_count: int = 3
+    ping_timeout_seconds: float = 2.0
+    max_range_addresses: int = 65536
+    discovery_rate_per_second: float = 500.0
+    discovery_concurrency: int = 1024
+    discovery_timeout_seconds: float = 1.0
+    history_capacity: int = 200
+    history_db_path: str | None = str(BASE_DIR / "data" / "history.sqlite3")
+    history_retention_days: int = 7
+    history_rollup_retention_days: int = 90
+    history_max_points: int = 500
+    export_url: str | None = None
+    export_authorization: str | None = None
+    export_measurement: str = "host"
+    export_batch_size: int = 5000
+    export_flush_seconds: float = 5.0
+    export_buffer_size: int = 100_000
+    export_spill_dir: str | None = str(BASE_DIR / "data" / "export-spill")
+    export_spill_max_bytes: int = 256 * 1024 * 1024
 
     smtp_host: str | None = None
     smtp_port: int = 587
@@ -26,8 +59,23 @@ class Settings(BaseSettings):
 
     slack_webhook_url: str | None = None
 
+    notification_queue_size: int = 1000
+    notification_workers: int = 4
+    notification_retries: int = 3
+    notification_backoff_seconds: float = 2.0
+    notification_digest_seconds: float = 10.0
+    slack_rate_per_second: float = 1.0
+    slack_burst: int = 3
+
     snmp_community: str = "public"
     snmp_port: int = 161
+    snmp_max_varbinds: int = 32
+    snmp_timeout_seconds: float = 2.0
+    snmp_retries: int = 0
+    snmp_bulk_max_repetitions: int = 25
+    snmp_breaker_threshold: int = 3
+    snmp_breaker_cooldown_seconds: float = 300.0
+    snmp_capability_ttl_seconds: float = 3600.0
 
     class Config:
         env_prefix = "MONITOR_"
@@ -45,7 +93,7 @@ class Settings(BaseSettings):
     def to_storage(self) -> dict:
         """Return a dict safe for writing to disk."""
 
-        return self.model_dump()
+        return self.model_dump(include=set(PERSISTED_FIELDS))
 
 
 def load_settings() -> Settings:
@@ -53,7 +101,10 @@ def load_settings() -> Settings:
     if SETTINGS_PATH.exists():
         with SETTINGS_PATH.open("r", encoding="utf-8") as handle:
             overrides = json.load(handle)
-        settings.apply_overrides(overrides)
+        # files saved by older versions hold every field
+        settings.apply_overrides(
+            {key: value for key, value in overrides.items() if key in PERSISTED_FIELDS}
+        )
     return settings
 
 
@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import random
+import socket
+from typing import Iterable
+
+from pyasn1.codec.ber import decoder, encoder  # type: ignore
+from pyasn1.error import PyAsn1Error  # type: ignore
+from pysnmp.proto import api  # type: ignore
+from pysnmp.proto.rfc1905 import EndOfMibView, NoSuchInstance, NoSuchObject  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+TOO_BIG = 1  # PDU error-status tooBig(1)
+
+_V2C = api.protoModules[api.protoVersion2c]
+
+VarBinds = list[tuple[str, object]]
+# alternative OID groups in preference order; the first group the agent answers wins
+OidChain = tuple[tuple[str, ...], ...]
+
+
+class SnmpError(Exception):
+    """Base class for failed SNMP requests."""
+
+
+class SnmpTimeout(SnmpError):
+    """Raised when an agent does not answer within the timeout and retries."""
+
+
+class SnmpResponseError(SnmpError):
+    """Raised for a response that cannot be used: undecodable, or an error part-way through a walk."""
+
+
+def plan_requests(oids: Iterable[str], max_varbinds: int) -> list[list[str]]:
+    """Deduplicate ``oids`` and split them into GET PDUs of at most ``max_varbinds``."""
+
+    unique = list(dict.fromkeys(oids))
+    size = max(1, max_varbinds)
+    return [unique[start : start + size] for start in range(0, len(unique), size)]
+
+
+def supported_oids(chains: Iterable[OidChain], values: dict[str, object]) -> list[str]:
+    """For each chain, the OIDs of the first group with any OID present in ``values``."""
+
+    selected: list[str] = []
+    for chain in chains:
+        for group in chain:
+            if any(oid in values for oid in group):
+                selected.extend(group)
+                break
+    return selected
+
+
+def is_missing(value: object) -> bool:
+    """True for the SNMPv2 exception values an agent returns for absent OIDs."""
+
+    return isinstance(value, (NoSuchObject, NoSuchInstance, EndOfMibView))
+
+
+class CircuitBreaker:
+    """Per-host SNMP circuit breaker.
+
+    ``threshold`` consecutive timeouts open the breaker; while open no requests
+    are sent. Once ``cooldown`` seconds have passed a single half-open probe is
+    allowed through, which closes the breaker on success or re-opens it on
+    another timeout.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    __slots__ = ("threshold", "cooldown", "state", "failures", "opened_at")
+
+    def __init__(self, threshold: int = 3, cooldown: float = 300.0) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow(self, now: float) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if now - self.opened_at >= self.cooldown:
+            # also re-arms a half-open probe that never reported back
+            self.state = self.HALF_OPEN
+            self.opened_at = now
+            return True
+        # open and cooling down, or a half-open probe is already in flight
+        return False
+
+    def record(self, ok: bool, now: float) -> None:
+        if ok:
+            self.state = self.CLOSED
+            self.failures = 0
+            return
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+            self.state = self.OPEN
+            self.opened_at = now
+
+
+def _oid_key(oid: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in oid.split("."))
+
+
+class _SnmpProtocol(asyncio.DatagramProtocol):
+    def __init__(self, client: SnmpClient) -> None:
+        self._client = client
+
+    def datagram_received(self, data: bytes, addr: tuple) -> None:
+        self._client._on_datagram(data, addr)
+
+    def error_received(self, exc: Exception) -> None:  # pragma: no cover - network dependent
+        logger.debug("SNMP socket error: %s", exc)
+
+
+class SnmpClient:
+    """SNMPv2c client running on the event loop over one UDP socket per family.
+
+    Any number of requests can be outstanding at once; responses are matched
+    to their callers by request-id (and source address), so throughput is
+    bounded by the network rather than by a thread pool.
+    """
+
+    def __init__(self, timeout: float = 2.0, retries: int = 0) -> None:
+        self.timeout = timeout
+        self.retries = retries
+        self._transports: dict[int, asyncio.DatagramTransport] = {}
+        self._transport_lock = asyncio.Lock()
+        self._pending: dict[int, tuple[str, asyncio.Future]] = {}
+        self._request_id = random.randrange(1, 0x7FFFFFFF)
+
+    @property
+    def outstanding(self) -> int:
+        return len(self._pending)
+
+    async def _transport_for(self, family: int) -> asyncio.DatagramTransport:
+        transport = self._transports.get(family)
+        if transport is None:
+            async with self._transport_lock:
+                transport = self._transports.get(family)
+                if transport is None:
+                    loop = asyncio.get_running_loop()
+                    transport, _protocol = await loop.create_datagram_endpoint(
+                        lambda: _SnmpProtocol(self), family=family
+                    )
+                    self._transports[family] = transport
+        return transport
+
+    async def _resolve(self, address: str) -> tuple[int, str]:
+        try:
+            parsed = ipaddress.ip_address(address)
+        except ValueError:
+            loop = asyncio.get_running_loop()
+            infos = await loop.getaddrinfo(address, None, type=socket.SOCK_DGRAM)
+            family, *_rest, sockaddr = infos[0]
+            return family, sockaddr[0]
+        family = socket.AF_INET6 if parsed.version == 6 else socket.AF_INET
+        return family, parsed.compressed
+
+    def _next_request_id(self) -> int:
+        while True:
+            self._request_id = self._request_id % 0x7FFFFFFF + 1
+            if self._request_id not in self._pending:
+                return self._request_id
+
+    def _on_datagram(self, data: bytes, addr: tuple) -> None:
+        try:
+            message, _rest = decoder.decode(data, asn1Spec=_V2C.Message())
+            pdu = _V2C.apiMessage.getPDU(message)
+            request_id = int(_V2C.apiPDU.getRequestID(pdu))
+        except (PyAsn1Error, ValueError) as exc:
+            logger.debug("Discarding malformed SNMP datagram from %s: %s", addr[0], exc)
+            return
+        pending = self._pending.get(request_id)
+        if pending is None or pending[0] != addr[0]:
+            return
+        future = pending[1]
+        if not future.done():
+            future.set_result(pdu)
+
+    async def _request(
+        self,
+        address: str,
+        port: int,
+        community: str,
+        pdu: object,
+        timeout: float | None,
+        retries: int | None,
+    ) -> tuple[int, int, VarBinds]:
+        family, target = await self._resolve(address)
+        transport = await self._transport_for(family)
+        request_id = self._next_request_id()
+        _V2C.apiPDU.setRequestID(pdu, request_id)
+        message = _V2C.Message()
+        _V2C.apiMessage.setDefaults(message)
+        _V2C.apiMessage.setCommunity(message, community)
+        _V2C.apiMessage.setPDU(message, pdu)
+        payload = encoder.encode(message)
+
+        timeout = self.timeout if timeout is None else timeout
+        retries = self.retries if retries is None else retries
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = (target, future)
+        try:
+            for _attempt in range(retries + 1):
+                transport.sendto(payload, (target, port))
+                try:
+                    response = await asyncio.wait_for(asyncio.shield(future), timeout)
+                    break
+                except asyncio.TimeoutError:
+                    continue
+            else:
+                raise SnmpTimeout(f"No SNMP response from {address}:{port}")
+        finally:
+            self._pending.pop(request_id, None)
+            if not future.done():
+                future.cancel()
+
+        try:
+            var_binds = [
+                (str(oid), value) for oid, value in _V2C.apiPDU.getVarBinds(response)
+            ]
+            return (
+                int(_V2C.apiPDU.getErrorStatus(response)),
+                int(_V2C.apiPDU.getErrorIndex(response)),
+                var_binds,
+            )
+        except (PyAsn1Error, TypeError, ValueError) as exc:
+            raise SnmpResponseError(f"Malformed SNMP response from {address}:{port}: {exc}")
+
+    async def get(
+        self,
+        address: str,
+        port: int,
+        community: str,
+        oids: Iterable[str],
+        *,
+        timeout: float | None = None,
+        retries: int | None = None,
+    ) -> tuple[int, int, VarBinds]:
+        """Send one GET and return ``(error_status, error_index, var_binds)``."""
+
+        pdu = _V2C.GetRequestPDU()
+        _V2C.apiPDU.setDefaults(pdu)
+        _V2C.apiPDU.setVarBinds(pdu, [(oid, _V2C.Null("")) for oid in oids])
+        return await self._request(address, port, community, pdu, timeout, retries)
+
+    async def get_bulk(
+        self,
+        address: str,
+        port: int,
+        community: str,
+        oids: Iterable[str],
+        *,
+        non_repeaters: int = 0,
+        max_repetitions: int = 25,
+        timeout: float | None = None,
+        retries: int | None = None,
+    ) -> tuple[int, int, VarBinds]:
+        """Send one GETBULK and return ``(error_status, error_index, var_binds)``."""
+
+        pdu = _V2C.GetBulkRequestPDU()
+        _V2C.apiBulkPDU.setDefaults(pdu)
+        _V2C.apiBulkPDU.setNonRepeaters(pdu, non_repeaters)
+        _V2C.apiBulkPDU.setMaxRepetitions(pdu, max_repetitions)
+        _V2C.apiBulkPDU.setVarBinds(pdu, [(oid, _V2C.Null("")) for oid in oids])
+        return await self._request(address, port, community, pdu, timeout, retries)
+
+    async def walk_columns(
+        self,
+        address: str,
+        port: int,
+        community: str,
+        columns: list[str],
+        *,
+        max_repetitions: int = 25,
+        timeout: float | None = None,
+        retries: int | None = None,
+    ) -> dict[str, list[tuple[str, object]]]:
+        """Walk several table columns side by side with GETBULK.
+
+        Returns ``{column: [(index_suffix, value), ...]}``; a column stops as soon
+        as the agent leaves its subtree, so a table of N rows costs roughly
+        ``N / max_repetitions`` round trips regardless of how many columns it has.
+        Columns the agent rejects on the first request come back empty; an
+        error status later in the walk raises :class:`SnmpResponseError`, as
+        the rows would be incomplete.
+        """
+
+        rows: dict[str, list[tuple[str, object]]] = {column: [] for column in columns}
+        cursors = {column: column for column in columns}
+        first = True
+        while cursors:
+            active = list(cursors)
+            error_status, _error_index, var_binds = await self.get_bulk(
+                address,
+                port,
+                community,
+                [cursors[column] for column in active],
+                max_repetitions=max_repetitions,
+                timeout=timeout,
+                retries=retries,
+            )
+            if error_status and not first:
+                raise SnmpResponseError(
+                    f"SNMP error status {error_status} from {address}:{port} during a walk"
+                )
+            first = False
+            if error_status or not var_binds:
+                break
+            finished: set[str] = set()
+            for position, (oid, value) in enumerate(var_binds):
+                column = active[position % len(active)]
+                if column in finished:
+                    continue
+                try:
+                    outside = (
+                        is_missing(value)
+                        or not oid.startswith(column + ".")
+                        or _oid_key(oid) <= _oid_key(cursors[column])
+                    )
+                except ValueError:
+                    raise SnmpResponseError(f"Malformed OID {oid!r} from {address}:{port}")
+                if outside:
+                    finished.add(column)
+                    continue
+                rows[column].append((oid[len(column) + 1 :], value))
+                cursors[column] = oid
+            for column in finished:
+                cursors.pop(column, None)
+        return rows
+
+    def close(self) -> None:
+        for transport in self._transports.values():
+            transport.close()
+        self._transports.clear()
+        for _target, future in self._pending.values():
+            if not future.done():
+                future.cancel()
+        self._pending.clear()
@@ -1,55 +1,160 @@
+const hostsByAddress = new Map();
+let renderScheduled = false;
+
+const ROW_HEIGHT = 56;
+const OVERSCAN_ROWS = 8;
+const tableBody = document.getElementById('table-body');
+const tableSpacer = document.createElement('div');
+tableSpacer.className = 'table__spacer';
+const emptyRow = document.createElement('div');
+emptyRow.className = 'table__row table__row--empty';
+emptyRow.textContent = 'No active hosts detected.';
+// address -> { row, cells, values, index } for the rows currently in the DOM
+const renderedRows = new Map();
+let visibleHosts = [];
+let tableInitialized = false;
+
+function scheduleRender() {
+  if (renderScheduled) return;
+  renderScheduled = true;
+  requestAnimationFrame(() => {
+    renderScheduled = false;
+    renderHosts([...hostsByAddress.values()].filter((host) => host.reachable));
+  });
+}
+
+function storeHosts(hosts, replace = false) {
+  if (replace) hostsByAddress.clear();
+  hosts.forEach((host) => hostsByAddress.set(host.address, host));
+  scheduleRender();
+}
+
 async function fetchHosts() {
   const response = await fetch('/api/hosts?reachable_only=true');
   if (!response.ok) return;
-  const hosts = await response.json();
-  const tableBody = document.getElementById('table-body');
-  tableBody.innerHTML = '';
+  storeHosts(await response.json(), true);
+}
+
+function cellValues(host) {
+  return [
+    host.state,
+    host.name,
+    host.latency_ms != null ? host.latency_ms.toFixed(1) : '—',
+    host.packet_loss_pct != null ? host.packet_loss_pct.toFixed(1) : '—',
+    host.snmp_sysname || '—',
+    host.last_checked ? new Date(host.last_checked).toLocaleTimeString() : '—',
+    host.notes && host.notes.length ? host.notes.join('; ') : '—',
+  ];
+}
+
+function createRow(address) {
+  const row = document.createElement('div');
+  row.className = 'table__row table__row--virtual';
+  row.setAttribute('role', 'row');
+  row.innerHTML = `
+    <div class="table__cell">
+      <span class="badge" aria-hidden="true"></span>
+      <div>
+        <div class="host"></div>
+        <div class="muted"><a></a></div>
+      </div>
+    </div>
+    <div class="table__cell"></div>
+    <div class="table__cell"></div>
+    <div class="table__cell"></div>
+    <div class="table__cell"></div>
+    <div class="table__cell table__cell--truncate"></div>
+    <div class="table__cell table__cell--actions"><button class="ghost">Delete</button></div>
+  `;
+  const link = row.querySelector('a');
+  link.href = `/hosts/${address}`;
+  link.textContent = address;
+  row.querySelector('button').dataset.address = address;
+  const [first, ...rest] = row.children;
+  const cells = {
+    badge: first.querySelector('.badge'),
+    text: [first.querySelector('.host'), ...rest.slice(0, 5)],
+  };
+  return { row, cells, values: [], index: -1 };
+}
+
+function patchRow(entry, host, index) {
+  const values = cellValues(host);
+  if (values[0] !== entry.values[0]) entry.cells.badge.className = `badge badge--${values[0]}`;
+  for (let i = 1; i < values.length; i += 1) {
+    if (values[i] !== entry.values[i]) entry.cells.text[i - 1].textContent = values[i];
+  }
+  entry.values = values;
+  if (index !== entry.index) {
+    entry.row.style.transform = `translateY(${index * ROW_HEIGHT}px)`;
+    entry.index = index;
+  }
+}
+
+function renderHosts(hosts) {
+  if (!tableInitialized) {
+    tableBody.classList.add('table__body--virtual');
+    tableBody.replaceChildren(tableSpacer);
+    tableBody.addEventListener('scroll', renderWindow, { passive: true });
+    tableInitialized = true;
+  }
+  visibleHosts = hosts;
+  tableSpacer.style.height = `${hosts.length * ROW_HEIGHT}px`;
   if (!hosts.length) {
-    const empty = document.createElement('div');
-    empty.className = 'table__row table__row--empty';
-    empty.textContent = 'No active hosts detected.';
-    tableBody.appendChild(empty);
-    return;
+    if (!emptyRow.isConnected) tableBody.appendChild(emptyRow);
+  } else if (emptyRow.isConnected) {
+    emptyRow.remove();
   }
-  hosts.forEach((host) => {
-    const row = document.createElement('div');
-    row.className = 'table__row';
-    row.innerHTML = `
-      <div class="table__cell">
-        <span class="badge badge--${host.state}" aria-hidden="true"></span>
-        <div>
-          <div class="host">${host.name}</div>
-          <div class="muted"><a href="/hosts/${host.address}">${host.address}</a></div>
-        </div>
-      </div>
-      <div class="table__cell">${host.latency_ms != null ? host.latency_ms.toFixed(1) : '—'}</div>
-      <div class="table__cell">${host.packet_loss_pct != null ? host.packet_loss_pct.toFixed(1) : '—'}</div>
-      <div class="table__cell">${host.snmp_sysname || '—'}</div>
-      <div class="table__cell">${host.last_checked ? new Date(host.last_checked).toLocaleTimeString() : '—'}</div>
-      <div class="table__cell">${host.notes && host.notes.length ? host.notes.join('; ') : '—'}</div>
-      <div class="table__cell table__cell--actions"><button class="ghost" data-address="${host.address}">Delete</button></div>
-    `;
-    tableBody.appendChild(row);
-  });
+  renderWindow();
+}
 
-  document.querySelectorAll('.table__cell--actions button').forEach((button) => {
-    button.addEventListener('click', async (event) => {
-      const address = event.currentTarget.getAttribute('data-address');
-      event.currentTarget.disabled = true;
-      try {
-        const response = await fetch(`/api/hosts/${address}`, { method: 'DELETE' });
-        if (!response.ok) {
-          event.currentTarget.disabled = false;
-          return;
-        }
-        await fetchHosts();
-      } catch (error) {
-        event.currentTarget.disabled = false;
-      }
-    });
+function renderWindow() {
+  const first = Math.max(0, Math.floor(tableBody.scrollTop / ROW_HEIGHT) - OVERSCAN_ROWS);
+  const last = Math.min(
+    visibleHosts.length,
+    Math.ceil((tableBody.scrollTop + tableBody.clientHeight) / ROW_HEIGHT) + OVERSCAN_ROWS,
+  );
+  const keep = new Set();
+  for (let index = first; index < last; index += 1) {
+    const host = visibleHosts[index];
+    let entry = renderedRows.get(host.address);
+    if (!entry) {
+      entry = createRow(host.address);
+      renderedRows.set(host.address, entry);
+      tableBody.appendChild(entry.row);
+    }
+    patchRow(entry, host, index);
+    keep.add(host.address);
+  }
+  renderedRows.forEach((entry, address) => {
+    if (keep.has(address)) return;
+    entry.row.remove();
+    renderedRows.delete(address);
   });
 }
 
+async function deleteHost(button) {
+  const { address } = button.dataset;
+  button.disabled = true;
+  try {
+    const response = await fetch(`/api/hosts/${address}`, { method: 'DELETE' });
+    if (!response.ok) {
+      button.disabled = false;
+      return;
+    }
+    hostsByAddress.delete(address);
+    scheduleRender();
+  } catch (error) {
+    button.disabled = false;
+  }
+}
+
+tableBody.addEventListener('click', (event) => {
+  const button = event.target.closest('.table__cell--actions button');
+  if (button) deleteHost(button);
+});
+window.addEventListener('resize', renderWindow);
+
 async function triggerRescan() {
   const button = document.getElementById('rescan');
   button.disabled = true;
@@ -63,9 +168,23 @@ async function triggerRescan() {
   }
 }
 
-fetchHosts();
-const pollIntervalMs = Math.max(4000, Number(document.body.dataset.pollInterval || '8') * 1000);
-setInterval(fetchHosts, pollIntervalMs);
+function subscribeToStatus() {
+  const source = new EventSource('/api/stream');
+  source.addEventListener('snapshot', (event) => storeHosts(JSON.parse(event.data), true));
+  source.addEventListener('update', (event) => storeHosts(JSON.parse(event.data)));
+  source.addEventListener('removed', (event) => {
+    JSON.parse(event.data).forEach((address) => hostsByAddress.delete(address));
+    scheduleRender();
+  });
+}
+
+if (window.EventSource) {
+  subscribeToStatus();
+} else {
+  fetchHosts();
+  const pollIntervalMs = Math.max(4000, Number(document.body.dataset.pollInterval || '8') * 1000);
+  setInterval(fetchHosts, pollIntervalMs);
+}
 
 document.getElementById('rescan').addEventListener('click', triggerRescan);
 
@@ -76,9 +195,9 @@ const snmpPortInput = document.getElementById('snmp-port');
 const interfaceIndexInput = document.getElementById('interface-index');
 const statusEl = document.getElementById('add-status');
 
-addForm.addEventListener('submit', async (event) => {
+addForm?.addEventListener('submit', async (event) => {
   event.preventDefault();
-  statusEl.textContent = 'Adding hosts...';
+  statusEl.textContent = 'Starting discovery sweep...';
   const payload = {
     range: rangeInput.value.trim(),
     community: communityInput.value.trim() || null,
@@ -100,14 +219,18 @@ addForm.addEventListener('submit', async (event) => {
       return;
     }
 
-    const result = await response.json();
     statusEl.classList.remove('text--error');
-    statusEl.textContent = `Added ${result.added} host(s)` + (result.skipped ? `, skipped ${result.skipped}` : '');
-    if (result.added) {
-      await fetchHosts();
-    }
+    watchDiscovery(await response.json());
   } catch (error) {
     statusEl.textContent = error.message || 'Unexpected error';
     statusEl.classList.add('text--error');
   }
 });
+
+const watchDiscovery = discoveryWatcher(
+  statusEl,
+  document.getElementById('cancel-discovery'),
+  (job) => {
+    if (job.added && !window.EventSource) fetchHosts();
+  },
+);
@@ -28,28 +28,64 @@ let systemChart;
 let interfaceChart;
 let throughputChart;
 let latestSampleTimestamp;
+let historyCursor;
+const historyCapacity = Number(document.body.dataset.historyCapacity || '200');
+
+// Per chart, one extractor per dataset, in dataset order.
+const chartSeries = {
+  health: [(entry) => entry.latency_ms ?? null, (entry) => entry.packet_loss_pct ?? null],
+  interface: [
+    (entry) => entry.packet_success_pct ?? null,
+    (entry) => entry.packets_received ?? null,
+  ],
+  throughput: [
+    (entry) => (entry.interface_in_bps != null ? entry.interface_in_bps / 1_000_000 : null),
+    (entry) => (entry.interface_out_bps != null ? entry.interface_out_bps / 1_000_000 : null),
+  ],
+  system: [
+    (entry) => entry.cpu_usage_pct ?? null,
+    (entry) => entry.memory_used_pct ?? null,
+    (entry) => entry.interface_temp_c ?? null,
+    (entry) => entry.system_temp_c ?? null,
+  ],
+};
 
 function formatTimestamp(iso) {
   return new Date(iso).toLocaleTimeString();
 }
 
+function appendToCharts(samples) {
+  [
+    [healthChart, chartSeries.health],
+    [interfaceChart, chartSeries.interface],
+    [throughputChart, chartSeries.throughput],
+    [systemChart, chartSeries.system],
+  ].forEach(([chart, series]) => {
+    if (!chart) return;
+    samples.forEach((entry) => {
+      chart.data.labels.push(formatTimestamp(entry.timestamp));
+      series.forEach((extract, index) => chart.data.datasets[index].data.push(extract(entry)));
+    });
+    const overflow = chart.data.labels.length - historyCapacity;
+    if (overflow > 0) {
+      chart.data.labels.splice(0, overflow);
+      chart.data.datasets.forEach((dataset) => dataset.data.splice(0, overflow));
+    }
+    chart.update('none');
+  });
+}
+
 function buildOrUpdateCharts(history) {
   if (!healthChartCtx || !interfaceChartCtx || !throughputChartCtx || !systemChartCtx) return;
 
   const labels = history.map((entry) => formatTimestamp(entry.timestamp));
-  const latencyData = history.map((entry) => entry.latency_ms ?? null);
-  const packetLossData = history.map((entry) => entry.packet_loss_pct ?? null);
-  const successData = history.map((entry) => entry.packet_success_pct ?? null);
-  const packetsReceived = history.map((entry) => entry.packets_received ?? null);
-  const cpuUsage = history.map((entry) => entry.cpu_usage_pct ?? null);
-  const memoryUsage = history.map((entry) => entry.memory_used_pct ?? null);
-  const interfaceTemp = history.map((entry) => entry.interface_temp_c ?? null);
-  const systemTemp = history.map((entry) => entry.system_temp_c ?? null);
-  const ingress = history.map((entry) =>
-    entry.interface_in_bps != null ? entry.interface_in_bps / 1_000_000 : null
+  const [latencyData, packetLossData] = chartSeries.health.map((extract) => history.map(extract));
+  const [successData, packetsReceived] = chartSeries.interface.map((extract) =>
+    history.map(extract)
   );
-  const egress = history.map((entry) =>
-    entry.interface_out_bps != null ? entry.interface_out_bps / 1_000_000 : null
+  const [ingress, egress] = chartSeries.throughput.map((extract) => history.map(extract));
+  const [cpuUsage, memoryUsage, interfaceTemp, systemTemp] = chartSeries.system.map((extract) =>
+    history.map(extract)
   );
 
   if (!healthChart) {
@@ -298,28 +334,42 @@ function buildOrUpdateCharts(history) {
 }
 
 async function refreshHistory() {
-  const response = await fetch(`/api/hosts/${address}/history`);
+  const incremental = historyCursor !== undefined && healthChart;
+  const query = incremental ? `?since=${historyCursor}` : '';
+  const response = await fetch(`/api/hosts/${address}/history${query}`);
   if (!response.ok) return;
-  const history = await response.json();
-  if (!history.length) return;
-  latestSampleTimestamp = history[history.length - 1].timestamp;
-  buildOrUpdateCharts(history);
+  const samples = await response.json();
+  historyCursor = response.headers.get('X-History-Cursor') ?? historyCursor;
+  if (!samples.length) return;
+  latestSampleTimestamp = samples[samples.length - 1].timestamp;
+  if (incremental && !response.headers.get('X-History-Reset')) {
+    appendToCharts(samples);
+  } else {
+    buildOrUpdateCharts(samples);
+  }
+}
+
+function showDeleted() {
+  stateEl.textContent = 'deleted';
+  latencyEl.textContent = '—';
+  packetLossEl.textContent = '—';
+  sysNameEl.textContent = '—';
+  lastCheckedEl.textContent = '—';
+  notesEl.textContent = 'Host no longer tracked';
+  badge.className = 'badge badge--pending';
+  deleteButton.disabled = true;
 }
 
 async function refreshHost() {
   const response = await fetch(`/api/hosts/${address}`);
   if (!response.ok) {
-    stateEl.textContent = 'deleted';
-    latencyEl.textContent = '—';
-    packetLossEl.textContent = '—';
-    sysNameEl.textContent = '—';
-    lastCheckedEl.textContent = '—';
-    notesEl.textContent = 'Host no longer tracked';
-    badge.className = 'badge badge--pending';
-    deleteButton.disabled = true;
+    showDeleted();
     return;
   }
-  const host = await response.json();
+  renderHost(await response.json());
+}
+
+function renderHost(host) {
   badge.className = `badge badge--${host.state}`;
   latencyEl.textContent = host.latency_ms != null ? `${host.latency_ms.toFixed(1)} ms` : '—';
   latencyMinEl.textContent = host.latency_min_ms != null ? `${host.latency_min_ms.toFixed(1)} ms` : '—';
@@ -377,7 +427,29 @@ if (deleteButton) {
   });
 }
 
-refreshHost();
+function subscribeToHost() {
+  const source = new EventSource(`/api/stream?address=${encodeURIComponent(address)}`);
+  source.addEventListener('snapshot', (event) => {
+    const [host] = JSON.parse(event.data);
+    if (host) {
+      renderHost(host);
+    } else {
+      showDeleted();
+      source.close();
+    }
+  });
+  source.addEventListener('update', (event) => JSON.parse(event.data).forEach(renderHost));
+  source.addEventListener('removed', () => {
+    showDeleted();
+    source.close();
+  });
+}
+
 refreshHistory();
-const pollIntervalMs = Math.max(4000, Number(document.body.dataset.pollInterval || '8') * 1000);
-setInterval(refreshHost, pollIntervalMs);
+if (window.EventSource) {
+  subscribeToHost();
+} else {
+  refreshHost();
+  const pollIntervalMs = Math.max(4000, Number(document.body.dataset.pollInterval || '8') * 1000);
+  setInterval(refreshHost, pollIntervalMs);
+}
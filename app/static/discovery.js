@@ -0,0 +1,43 @@
+// Progress reporting for background discovery sweeps, shared by the dashboard and settings page.
+
+function describeDiscovery(job) {
+  const progress = `${job.swept}/${job.total} swept, ${job.responded} responding`;
+  if (job.state === 'running') return `Sweeping ${job.range}: ${progress}`;
+  const added = `added ${job.added} host(s)` + (job.skipped ? `, skipped ${job.skipped}` : '');
+  return `Sweep ${job.state}: ${progress}, ${added}`;
+}
+
+// Returns a function that shows a job's progress in statusEl, polling until it finishes.
+function discoveryWatcher(statusEl, cancelButton, onFinished) {
+  let timer = null;
+
+  function watch(job) {
+    clearTimeout(timer);
+    statusEl.textContent = describeDiscovery(job);
+    if (cancelButton) {
+      cancelButton.hidden = job.state !== 'running';
+      cancelButton.dataset.jobId = job.id;
+    }
+    if (job.state !== 'running') {
+      if (onFinished) onFinished(job);
+      return;
+    }
+    timer = setTimeout(async () => {
+      const response = await fetch(`/api/discovery/${job.id}`);
+      if (response.ok) watch(await response.json());
+    }, 1000);
+  }
+
+  if (cancelButton) {
+    cancelButton.addEventListener('click', async () => {
+      cancelButton.disabled = true;
+      try {
+        await fetch(`/api/discovery/${cancelButton.dataset.jobId}`, { method: 'DELETE' });
+      } finally {
+        cancelButton.disabled = false;
+      }
+    });
+  }
+
+  return watch;
+}
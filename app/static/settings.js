@@ -56,11 +56,12 @@ const rangeInput = document.getElementById('range');
 const communityInput = document.getElementById('community');
 const snmpPortInput = document.getElementById('snmp-port');
 const statusEl = document.getElementById('add-status');
+const watchDiscovery = discoveryWatcher(statusEl, document.getElementById('cancel-discovery'));
 
 if (addForm) {
   addForm.addEventListener('submit', async (event) => {
     event.preventDefault();
-    statusEl.textContent = 'Adding hosts...';
+    statusEl.textContent = 'Starting discovery sweep...';
     statusEl.classList.remove('text--error');
     const payload = {
       range: rangeInput.value.trim(),
@@ -82,8 +83,7 @@ if (addForm) {
         return;
       }
 
-      const result = await response.json();
-      statusEl.textContent = `Added ${result.added} host(s)` + (result.skipped ? `, skipped ${result.skipped}` : '');
+      watchDiscovery(await response.json());
     } catch (error) {
       statusEl.textContent = error.message || 'Unexpected error';
       statusEl.classList.add('text--error');
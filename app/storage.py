@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .history import FLOAT_FIELDS, INT_FIELDS, from_epoch, to_epoch
+from .models import HostSample, HostStatus
+from .rollups import TIERS, merge_sql, rollup_columns
+
+logger = logging.getLogger(__name__)
+
+METRIC_FIELDS = FLOAT_FIELDS + INT_FIELDS
+_COLUMNS = ("address", "ts", *METRIC_FIELDS, "psu_statuses", "reachable")
+_PARTITION_PREFIX = "samples_"
+_PARTITION_SECONDS = 86400
+_SAMPLES = "samples"
+_ROLLUP_COLUMNS = ("address", "ts", *rollup_columns())
+
+
+def _partition_name(epoch: float) -> str:
+    day = datetime.fromtimestamp(epoch, tz=timezone.utc)
+    return f"{_PARTITION_PREFIX}{day:%Y%m%d}"
+
+
+def _partition_start(name: str) -> float:
+    day = datetime.strptime(name[len(_PARTITION_PREFIX) :], "%Y%m%d")
+    return day.replace(tzinfo=timezone.utc).timestamp()
+
+
+class SampleStorage:
+    """Append-only SQLite (WAL) sample store partitioned into one table per UTC day.
+
+    Samples are queued from the event loop and written by a background thread
+    that group-commits everything queued within ``flush_interval`` seconds (or
+    ``batch_size`` rows) in one transaction. Retention drops whole day tables.
+    Closed rollup buckets go to one ``rollup_<tier>`` table per tier and are
+    kept for ``rollup_retention_days``.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        retention_days: int = 7,
+        batch_size: int = 5000,
+        flush_interval: float = 1.0,
+        rollup_retention_days: int = 90,
+    ) -> None:
+        self.path = path
+        self.retention_days = retention_days
+        self.rollup_retention_days = rollup_retention_days
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._queue: queue.SimpleQueue[tuple[str, tuple] | None] = queue.SimpleQueue()
+        self._partitions: set[str] = set()
+        self._partitions_lock = threading.Lock()
+        self._last_retention: float | None = None
+        self.rows_written = 0
+        connection = self._connect()
+        connection.execute("PRAGMA journal_mode=WAL")
+        self._partitions.update(self._list_partitions(connection))
+        for tier in TIERS:
+            columns = ", ".join(f"{column} REAL" for column in _ROLLUP_COLUMNS[2:])
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS rollup_{tier} ("
+                f"address TEXT NOT NULL, ts REAL NOT NULL, {columns}, "
+                "PRIMARY KEY (address, ts)) WITHOUT ROWID"
+            )
+        connection.commit()
+        connection.close()
+        self._writer = threading.Thread(target=self._write_loop, name="sample-storage", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @staticmethod
+    def _list_partitions(connection: sqlite3.Connection) -> list[str]:
+        rows = connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ?",
+            (f"{_PARTITION_PREFIX}%",),
+        )
+        return sorted(name for (name,) in rows)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def append(self, status: HostStatus, timestamp: datetime) -> None:
+        """Queue one sample for the writer thread; never blocks the caller."""
+
+        self._queue.put(
+            (
+                _SAMPLES,
+                (
+                    status.address,
+                    to_epoch(timestamp),
+                    *(getattr(status, name) for name in METRIC_FIELDS),
+                    json.dumps(status.psu_statuses) if status.psu_statuses else None,
+                    int(status.reachable),
+                ),
+            )
+        )
+
+    def append_rollup(self, tier: str, address: str, row: tuple[float, ...]) -> None:
+        """Queue one closed rollup bucket (see ``rollups._Bucket.row``)."""
+
+        self._queue.put((tier, (address, *row)))
+
+    def _partition_names(self) -> list[str]:
+        with self._partitions_lock:
+            return sorted(self._partitions)
+
+    def _ensure_partition(self, connection: sqlite3.Connection, name: str) -> None:
+        if name in self._partitions:
+            return
+        metrics = ", ".join(f"{field} REAL" for field in FLOAT_FIELDS)
+        counters = ", ".join(f"{field} INTEGER" for field in INT_FIELDS)
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {name} ("
+            f"address TEXT NOT NULL, ts REAL NOT NULL, {metrics}, {counters}, "
+            "psu_statuses TEXT, reachable INTEGER NOT NULL, "
+            "PRIMARY KEY (address, ts)) WITHOUT ROWID"
+        )
+        with self._partitions_lock:
+            self._partitions.add(name)
+
+    def _write_batch(self, connection: sqlite3.Connection, items: list[tuple[str, tuple]]) -> None:
+        by_table: dict[str, list[tuple]] = {}
+        for kind, row in items:
+            table = _partition_name(row[1]) if kind == _SAMPLES else f"rollup_{kind}"
+            by_table.setdefault(table, []).append(row)
+        with connection:
+            for table, rows in by_table.items():
+                if table.startswith(_PARTITION_PREFIX):
+                    self._ensure_partition(connection, table)
+                    columns = ", ".join(_COLUMNS)
+                    placeholders = ", ".join("?" for _ in _COLUMNS)
+                    statement = f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({placeholders})"
+                else:
+                    # a bucket open across a restart is saved once per process; add them up
+                    statement = merge_sql(table)
+                connection.executemany(statement, rows)
+        self.rows_written += len(items)
+
+    def _apply_retention(self, connection: sqlite3.Connection) -> None:
+        self._last_retention = time.monotonic()
+        cutoff = time.time() - self.retention_days * _PARTITION_SECONDS
+        for name in self._partition_names():
+            if _partition_start(name) + _PARTITION_SECONDS > cutoff:
+                break
+            with self._partitions_lock:
+                self._partitions.discard(name)
+            with connection:
+                connection.execute(f"DROP TABLE IF EXISTS {name}")
+            logger.info("Dropped expired history partition %s", name)
+        rollup_cutoff = time.time() - self.rollup_retention_days * _PARTITION_SECONDS
+        with connection:
+            for tier in TIERS:
+                connection.execute(f"DELETE FROM rollup_{tier} WHERE ts < ?", (rollup_cutoff,))
+
+    def _write_loop(self) -> None:
+        connection = self._connect()
+        running = True
+        while running:
+            rows: list[tuple[str, tuple]] = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = ()
+            deadline = time.monotonic() + self.flush_interval
+            while item:
+                rows.append(item)
+                if len(rows) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if item is None:
+                running = False
+            if rows:
+                try:
+                    self._write_batch(connection, rows)
+                except sqlite3.Error:
+                    logger.exception("Failed to write %d history samples", len(rows))
+            if self._last_retention is None or time.monotonic() - self._last_retention > 3600:
+                try:
+                    self._apply_retention(connection)
+                except sqlite3.Error:
+                    logger.exception("Failed to apply history retention")
+        connection.close()
+
+    def read_range(
+        self,
+        address: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        limit: int | None = None,
+    ) -> list[HostSample]:
+        """Return ``address``'s samples with ``start <= timestamp <= end``, oldest first.
+
+        Blocking; call it through ``asyncio.to_thread``.
+        """
+
+        start_epoch = to_epoch(start) if start else 0.0
+        end_epoch = to_epoch(end) if end else float("inf")
+        partitions = [
+            name
+            for name in self._partition_names()
+            if _partition_start(name) + _PARTITION_SECONDS > start_epoch
+            and _partition_start(name) <= end_epoch
+        ]
+        if not partitions:
+            return []
+        query = " UNION ALL ".join(
+            f"SELECT {', '.join(_COLUMNS[1:])} FROM {name} WHERE address = ? AND ts BETWEEN ? AND ?"
+            for name in partitions
+        )
+        params: list[object] = [address, start_epoch, min(end_epoch, 1e18)] * len(partitions)
+        if limit is not None:
+            # keep the newest ``limit`` samples
+            query = f"SELECT * FROM ({query} ORDER BY ts DESC LIMIT ?) ORDER BY ts"
+            params.append(limit)
+        else:
+            query += " ORDER BY ts"
+        connection = self._connect()
+        try:
+            rows = connection.execute(query, params).fetchall()
+        except sqlite3.OperationalError:
+            # a partition was dropped by retention while we were reading
+            return []
+        finally:
+            connection.close()
+        return [self._to_sample(row) for row in rows]
+
+    def read_rollups(
+        self, tier: str, address: str, start: float, end: float
+    ) -> list[tuple[float, ...]]:
+        """Return persisted rollup rows (without the address) for ``[start, end]``.
+
+        Blocking; call it through ``asyncio.to_thread``.
+        """
+
+        if tier not in TIERS:
+            raise ValueError(f"Unknown rollup tier {tier!r}")
+        connection = self._connect()
+        try:
+            return connection.execute(
+                f"SELECT {', '.join(_ROLLUP_COLUMNS[1:])} FROM rollup_{tier} "
+                "WHERE address = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+                (address, start, min(end, 1e18)),
+            ).fetchall()
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _to_sample(row: tuple) -> HostSample:
+        ts, *metrics, psu_raw, reachable = row
+        psu_statuses = json.loads(psu_raw) if psu_raw else []
+        return HostSample(
+            timestamp=from_epoch(ts),
+            psu_status=", ".join(psu_statuses) if psu_statuses else None,
+            psu_statuses=psu_statuses,
+            reachable=bool(reachable),
+            **dict(zip(METRIC_FIELDS, metrics)),
+        )
+
+    def close(self) -> None:
+        """Flush queued samples and stop the writer thread."""
+
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import logging
+import multiprocessing
+import queue
+from datetime import datetime
+from typing import Awaitable, Callable, Iterable
+
+from .models import HostConfig, HostStatus, InterfaceRate
+from .monitor import MonitorService
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+# HostStatus fields a worker measures; the API process owns everything else
+RESULT_FIELDS = (
+    "latency_ms",
+    "latency_min_ms",
+    "latency_max_ms",
+    "packet_loss_pct",
+    "packet_success_pct",
+    "packets_sent",
+    "packets_received",
+    "cpu_usage_pct",
+    "memory_used_pct",
+    "interface_temp_c",
+    "system_temp_c",
+    "interface_in_bps",
+    "interface_out_bps",
+    "psu_status",
+    "psu_statuses",
+    "reachable",
+    "snmp_sysname",
+    "snmp_breaker",
+    "snmp_skipped",
+    "suppressed_by",
+    "notes",
+)
+
+# (address, checked at, values in RESULT_FIELDS order, interface rates or None)
+InterfaceRow = tuple[int, "str | None", "float | None", "float | None"]
+ResultRecord = tuple[str, datetime, tuple, "list[InterfaceRow] | None"]
+
+_FLUSH_SECONDS = 0.25
+_FLUSH_RECORDS = 512
+
+
+def apply_result(status: HostStatus, record: ResultRecord) -> list[InterfaceRate] | None:
+    """Copy a worker's measurements onto the API process's status object."""
+
+    _address, checked_at, values, interfaces = record
+    for name, value in zip(RESULT_FIELDS, values):
+        setattr(status, name, value)
+    status.last_checked = checked_at
+    if interfaces is None:
+        return None
+    return [
+        InterfaceRate(if_index=if_index, name=name, in_bps=in_bps, out_bps=out_bps)
+        for if_index, name, in_bps, out_bps in interfaces
+    ]
+
+
+class _ShardService(MonitorService):
+    """A worker's monitor: runs the polling loop but ships results instead of storing them."""
+
+    def __init__(self, results: multiprocessing.Queue, hosts: Iterable[HostConfig] = ()) -> None:
+        super().__init__(hosts)
+        self._results = results
+        self._outbox: list[ResultRecord] = []
+
+    async def _finish_check(self, status: HostStatus, now: datetime) -> None:
+        host = self.hosts.get(status.address)
+        interfaces = None
+        if host is not None and host.all_interfaces:
+            interfaces = [
+                (rate.if_index, rate.name, rate.in_bps, rate.out_bps)
+                for rate in self.get_interfaces(status.address)
+            ]
+        values = tuple(getattr(status, name) for name in RESULT_FIELDS)
+        self._outbox.append((status.address, now, values, interfaces))
+        if len(self._outbox) >= _FLUSH_RECORDS:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._outbox:
+            batch, self._outbox = self._outbox, []
+            self._results.put(batch)
+
+
+def worker_main(
+    shard: int,
+    hosts: list[tuple],
+    commands: multiprocessing.Queue,
+    results: multiprocessing.Queue,
+) -> None:
+    """Entry point of a polling worker process; ``hosts`` is its initial shard."""
+
+    logging.basicConfig(level=logging.INFO)
+    # the worker polls its own shard in-process
+    settings.poll_workers = 0
+    # samples are recorded, and exported, by the API process
+    settings.export_url = None
+    asyncio.run(_serve(shard, [HostConfig(*fields) for fields in hosts], commands, results))
+
+
+async def _serve(
+    shard: int,
+    hosts: list[HostConfig],
+    commands: multiprocessing.Queue,
+    results: multiprocessing.Queue,
+) -> None:
+    # the shard is scheduled before the loop starts rather than trickling in as commands
+    service = _ShardService(results, hosts)
+    await service.start()
+
+    async def _flush_loop() -> None:
+        while True:
+            await asyncio.sleep(_FLUSH_SECONDS)
+            service.flush()
+
+    flusher = asyncio.create_task(_flush_loop())
+    logger.info("Polling worker %d started with %d hosts", shard, len(hosts))
+    try:
+        while True:
+            command, payload = await asyncio.to_thread(commands.get)
+            if command == "add":
+                service.add_hosts(HostConfig(*fields) for fields in payload)
+            elif command == "remove":
+                service.remove_hosts(payload)
+            elif command == "expedite":
+                service._expedite(*payload)
+            elif command == "settings":
+                settings.apply_overrides(payload)
+                service.settings_updated()
+            elif command == "rescan":
+                asyncio.create_task(service._check_all_hosts())
+            elif command == "stop":
+                break
+    finally:
+        flusher.cancel()
+        await service.stop()
+        service.flush()
+
+
+def _parents_first(hosts: Iterable[HostConfig]) -> list[HostConfig]:
+    """Order ``hosts`` so every parent in the batch comes before its children."""
+
+    batch = {host.address: host for host in hosts}
+    ordered: list[HostConfig] = []
+    placed: set[str] = set()
+
+    def _place(host: HostConfig, seen: set[str]) -> None:
+        if host.address in placed or host.address in seen:
+            return
+        seen.add(host.address)
+        parent = batch.get(host.parent) if host.parent else None
+        if parent is not None:
+            _place(parent, seen)
+        placed.add(host.address)
+        ordered.append(host)
+
+    for host in batch.values():
+        _place(host, set())
+    return ordered
+
+
+class ShardPool:
+    """Parent-side handle on the polling worker processes.
+
+    Hosts go to the least-loaded worker when added, except that a host with
+    a ``parent`` joins its parent's worker (a worker only sees the statuses
+    of its own hosts, so that is where suppression can be decided). After
+    removals, hosts outside any parent/child group are moved from the
+    fullest to the emptiest worker until shard sizes differ by at most one.
+    Result batches from every worker arrive on one
+    queue and are handed to ``on_results`` on the event loop.
+    """
+
+    def __init__(
+        self, count: int, on_results: Callable[[list[ResultRecord]], Awaitable[None]]
+    ) -> None:
+        self.count = max(1, count)
+        self._on_results = on_results
+        self._context = multiprocessing.get_context("spawn")
+        self._results: multiprocessing.Queue = self._context.Queue()
+        self._commands: list[multiprocessing.Queue] = []
+        self._processes: list[multiprocessing.Process] = []
+        self._members: list[dict[str, HostConfig]] = [{} for _ in range(self.count)]
+        self._shard_of: dict[str, int] = {}
+        # parent address -> addresses of its children in the pool
+        self._children: dict[str, set[str]] = {}
+        self._reader: asyncio.Task | None = None
+
+    def start(self, hosts: Iterable[HostConfig]) -> None:
+        for host in _parents_first(hosts):
+            if host.address not in self._shard_of:
+                self._assign(host, self._shard_for(host))
+        for shard in range(self.count):
+            commands = self._context.Queue()
+            initial = [dataclasses.astuple(host) for host in self._members[shard].values()]
+            process = self._context.Process(
+                target=worker_main,
+                args=(shard, initial, commands, self._results),
+                name=f"poll-worker-{shard}",
+                daemon=True,
+            )
+            process.start()
+            self._commands.append(commands)
+            self._processes.append(process)
+        self._reader = asyncio.create_task(self._read_results())
+
+    def sizes(self) -> list[int]:
+        return [len(members) for members in self._members]
+
+    def add(self, hosts: Iterable[HostConfig]) -> None:
+        batches: dict[int, list[HostConfig]] = {}
+        for host in _parents_first(hosts):
+            if host.address in self._shard_of:
+                continue
+            shard = self._shard_for(host)
+            self._assign(host, shard)
+            batches.setdefault(shard, []).append(host)
+        for shard, batch in batches.items():
+            self._send_add(shard, batch)
+
+    def remove(self, addresses: Iterable[str]) -> None:
+        batches: dict[int, list[str]] = {}
+        for address in addresses:
+            shard = self._shard_of.pop(address, None)
+            if shard is None:
+                continue
+            host = self._members[shard].pop(address)
+            if host.parent:
+                self._children.get(host.parent, set()).discard(address)
+            batches.setdefault(shard, []).append(address)
+        for shard, batch in batches.items():
+            self._commands[shard].put(("remove", batch))
+        self._rebalance()
+
+    def expedite(self, addresses: Iterable[str], delay: float) -> None:
+        batches: dict[int, list[str]] = {}
+        for address in addresses:
+            shard = self._shard_of.get(address)
+            if shard is not None:
+                batches.setdefault(shard, []).append(address)
+        for shard, batch in batches.items():
+            self._commands[shard].put(("expedite", (batch, delay)))
+
+    def broadcast(self, command: str, payload: object = None) -> None:
+        for commands in self._commands:
+            commands.put((command, payload))
+
+    async def stop(self) -> None:
+        self.broadcast("stop")
+        for process in self._processes:
+            await asyncio.to_thread(process.join, 10)
+            if process.is_alive():
+                logger.warning("Polling worker %s did not exit; terminating", process.name)
+                process.terminate()
+        self._results.put(None)
+        if self._reader is not None:
+            await self._reader
+
+    def _least_loaded(self) -> int:
+        return min(range(self.count), key=lambda index: len(self._members[index]))
+
+    def _shard_for(self, host: HostConfig) -> int:
+        if host.parent and host.parent in self._shard_of:
+            return self._shard_of[host.parent]
+        for child in self._children.get(host.address, ()):
+            # a parent registered after its children joins them
+            if child in self._shard_of:
+                return self._shard_of[child]
+        return self._least_loaded()
+
+    def _movable(self, host: HostConfig) -> bool:
+        """Whether moving ``host`` alone keeps every parent with its children."""
+
+        if host.parent and host.parent in self._shard_of:
+            return False
+        return not self._children.get(host.address)
+
+    def _assign(self, host: HostConfig, shard: int) -> None:
+        self._shard_of[host.address] = shard
+        self._members[shard][host.address] = host
+        if host.parent:
+            self._children.setdefault(host.parent, set()).add(host.address)
+
+    def _send_add(self, shard: int, hosts: list[HostConfig]) -> None:
+        self._commands[shard].put(("add", [dataclasses.astuple(host) for host in hosts]))
+
+    def _rebalance(self) -> None:
+        moves: dict[tuple[int, int], list[HostConfig]] = {}
+        while True:
+            sizes = self.sizes()
+            source = max(range(self.count), key=sizes.__getitem__)
+            target = min(range(self.count), key=sizes.__getitem__)
+            if sizes[source] - sizes[target] <= 1:
+                break
+            host = next(
+                (host for host in self._members[source].values() if self._movable(host)), None
+            )
+            if host is None:
+                break
+            del self._members[source][host.address]
+            self._assign(host, target)
+            moves.setdefault((source, target), []).append(host)
+        for (source, target), hosts in moves.items():
+            self._commands[source].put(("remove", [host.address for host in hosts]))
+            self._send_add(target, hosts)
+
+    async def _read_results(self) -> None:
+        while True:
+            try:
+                batch = await asyncio.to_thread(self._results.get)
+            except (EOFError, OSError, queue.Empty):  # pragma: no cover - worker crash
+                logger.exception("Polling worker result queue closed")
+                return
+            if batch is None:
+                return
+            try:
+                await self._on_results(batch)
+            except Exception:  # pragma: no cover - defensive
+                logger.exception("Failed to apply polling worker results")
@@ -0,0 +1,148 @@
+"""Push samples through SampleExporter to a local stand-in line-protocol receiver.
+
+The receiver is a minimal asyncio HTTP server that counts the lines it is
+sent. It can answer slowly (``--delay``) and refuse everything with ``503``
+for the first ``--outage`` seconds, so buffering, disk spill, draining and
+drop counters can be watched without a real time-series database. With
+``--serve`` only the receiver runs, for a monitor started with
+``MONITOR_EXPORT_URL=http://127.0.0.1:<port>/write``.
+
+Usage: python -m benchmarks.export_receiver [--hosts 1000] [--rounds 20]
+       [--delay 0] [--outage 0] [--serve PORT]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from app.export import SampleExporter
+from app.models import HostStatus
+
+
+class Receiver:
+    """Counts line-protocol lines POSTed to it, optionally slow or failing."""
+
+    def __init__(self, delay: float = 0.0, outage: float = 0.0) -> None:
+        self.delay = delay
+        self.outage_until = time.monotonic() + outage
+        self.lines = 0
+        self.requests = 0
+        self.refused = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                length = 0
+                while (header := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = header.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value.strip())
+                body = await reader.readexactly(length) if length else b""
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                self.requests += 1
+                if time.monotonic() < self.outage_until:
+                    self.refused += 1
+                    status = b"503 Service Unavailable"
+                else:
+                    self.lines += body.count(b"\n")
+                    status = b"204 No Content"
+                writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def _status(address: str) -> HostStatus:
+    return HostStatus(
+        name=address,
+        address=address,
+        latency_ms=random.uniform(1, 50),
+        packet_loss_pct=0.0,
+        packets_sent=3,
+        packets_received=3,
+        cpu_usage_pct=random.uniform(0, 100),
+        interface_in_bps=random.uniform(0, 1e9),
+        reachable=True,
+    )
+
+
+async def _run(args: argparse.Namespace) -> None:
+    receiver = Receiver(args.delay, args.outage)
+    server = await asyncio.start_server(receiver.handle, "127.0.0.1", args.serve or 0)
+    port = server.sockets[0].getsockname()[1]
+    if args.serve:
+        print(f"Receiving on http://127.0.0.1:{port}/write")
+        async with server:
+            while True:
+                await asyncio.sleep(5)
+                print(f"{receiver.lines} lines in {receiver.requests} requests")
+
+    with tempfile.TemporaryDirectory() as spill:
+        exporter = SampleExporter(
+            f"http://127.0.0.1:{port}/write",
+            batch_size=args.batch_size,
+            flush_seconds=0.5,
+            buffer_size=args.buffer_size,
+            spill_dir=Path(spill),
+        )
+        exporter.start()
+        statuses = [_status(f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}") for i in range(args.hosts)]
+        start = datetime.utcnow()
+        started = time.perf_counter()
+        for round_index in range(args.rounds):
+            timestamp = start + timedelta(seconds=round_index)
+            for status in statuses:
+                exporter.submit(status, timestamp)
+            await asyncio.sleep(args.interval)
+        submit_done = time.perf_counter()
+        # let the flush task catch up, including anything spilled during an outage
+        deadline = time.monotonic() + args.outage + 30
+        while time.monotonic() < deadline:
+            stats = exporter.snapshot()
+            if stats.sent + stats.dropped + stats.rejected >= args.hosts * args.rounds:
+                break
+            await asyncio.sleep(0.2)
+        await exporter.stop()
+        stats = exporter.snapshot()
+        elapsed = time.perf_counter() - started
+
+    server.close()
+    await server.wait_closed()
+    total = args.hosts * args.rounds
+    print(f"Submitted {total} samples in {submit_done - started:.2f}s, delivered in {elapsed:.2f}s")
+    print(
+        f"Receiver: {receiver.lines} lines, {receiver.requests} requests, {receiver.refused} refused"
+    )
+    print(
+        f"Exporter: sent {stats.sent} in {stats.batches} batches, {stats.failed_batches} failed "
+        f"batches, {stats.dropped} dropped, {stats.spilled_lines} still spilled"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hosts", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=0.1, help="seconds between rounds")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--buffer-size", type=int, default=100_000)
+    parser.add_argument("--delay", type=float, default=0.0, help="receiver latency per request")
+    parser.add_argument("--outage", type=float, default=0.0, help="seconds of 503 at start")
+    parser.add_argument("--serve", type=int, default=0, help="only run the receiver on PORT")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
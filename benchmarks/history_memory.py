@@ -0,0 +1,95 @@
+"""Compare the memory used by list[HostSample] history with the columnar ring buffers.
+
+Both stores are filled to capacity for every host with realistic samples and
+measured with tracemalloc.
+
+Usage: python -m benchmarks.history_memory [--hosts 1000] [--capacity 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from app.history import HistoryStore
+from app.models import HostSample, HostStatus
+
+
+def _status(address: str, index: int) -> HostStatus:
+    return HostStatus(
+        name=address,
+        address=address,
+        latency_ms=random.uniform(1, 50),
+        latency_min_ms=random.uniform(0.5, 1),
+        latency_max_ms=random.uniform(50, 80),
+        packet_loss_pct=0.0,
+        packet_success_pct=100.0,
+        packets_sent=3,
+        packets_received=3,
+        cpu_usage_pct=random.uniform(0, 100) if index % 2 else None,
+        memory_used_pct=random.uniform(0, 100) if index % 2 else None,
+        interface_in_bps=random.uniform(0, 1e9),
+        interface_out_bps=random.uniform(0, 1e9),
+        psu_statuses=["PSU1: ok", "PSU2: ok"],
+        reachable=True,
+    )
+
+
+def _measure(fill) -> tuple[int, float]:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    store = fill()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    return size, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hosts", type=int, default=1000)
+    parser.add_argument("--capacity", type=int, default=200)
+    args = parser.parse_args()
+
+    addresses = [f"10.{index // 65536}.{index // 256 % 256}.{index % 256}" for index in range(args.hosts)]
+    statuses = [_status(address, index) for index, address in enumerate(addresses)]
+    start = datetime.utcnow()
+    timestamps = [start + timedelta(seconds=30 * tick) for tick in range(args.capacity)]
+
+    def fill_lists() -> dict[str, list[HostSample]]:
+        history: dict[str, list[HostSample]] = {}
+        for status in statuses:
+            samples = history.setdefault(status.address, [])
+            for timestamp in timestamps:
+                samples.append(
+                    HostSample(timestamp=timestamp, **status.model_dump(include=set(HostSample.model_fields)))
+                )
+        return history
+
+    def fill_columns() -> HistoryStore:
+        store = HistoryStore(args.capacity)
+        for status in statuses:
+            store.add(status.address)
+            for timestamp in timestamps:
+                store.record(status, timestamp)
+        return store
+
+    list_bytes, list_time = _measure(fill_lists)
+    column_bytes, column_time = _measure(fill_columns)
+
+    print(f"{args.hosts} hosts x {args.capacity} samples")
+    print(f"{'store':<16}{'memory':>12}{'fill time':>12}")
+    print(f"{'list[HostSample]':<16}{list_bytes / 2**20:>9.1f} MiB{list_time:>10.2f} s")
+    print(f"{'ring buffers':<16}{column_bytes / 2**20:>9.1f} MiB{column_time:>10.2f} s")
+    print(f"saving: {100 * (1 - column_bytes / list_bytes):.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Compare per-request SnmpEngine construction with the shared asyncio SNMP client.
+
+Each simulated host check asks for what the monitor needs from one host.
+The per-GET mode is the original code path: twelve GETs, each on a freshly
+built ``SnmpEngine``. The reused mode sends the same twelve GETs on one
+warmed-up engine, and the shared mode sends one coalesced GET on the
+long-lived ``SnmpClient``. All three query a stub agent in a separate
+process on a local UDP port. The agent answers every GET at once, so no
+mode spends its time waiting out request timeouts.
+
+``SnmpEngine()`` construction and BER request encoding are also timed on
+their own. Most of a fresh engine's cost comes at its first GET, which
+sets up the MIB machinery, so construction alone understates it. The
+difference between the per-GET and reused rows is the cost of building
+an engine per request.
+
+Usage: python -m benchmarks.snmp_engine [--hosts 1000] [--sample 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import socket
+import time
+
+from pyasn1.codec.ber import decoder, encoder  # type: ignore
+from pysnmp.hlapi import (  # type: ignore
+    CommunityData,
+    ContextData,
+    ObjectIdentity,
+    ObjectType,
+    SnmpEngine,
+    UdpTransportTarget,
+    getCmd,
+)
+from pysnmp.proto import api  # type: ignore
+
+from app.models import HostConfig
+from app.monitor import MonitorService
+from app.snmp import SnmpClient
+
+GETS_PER_CHECK = 12
+_V2C = api.protoModules[api.protoVersion2c]
+
+
+def _stub_agent(ready: multiprocessing.Queue) -> None:
+    """Answer every SNMPv2c request with ``INTEGER 1`` for each requested OID."""
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    ready.put(sock.getsockname()[1])
+    while True:
+        data, peer = sock.recvfrom(65535)
+        message, _rest = decoder.decode(data, asn1Spec=_V2C.Message())
+        request = _V2C.apiMessage.getPDU(message)
+        response = _V2C.apiPDU.getResponse(request)
+        _V2C.apiPDU.setVarBinds(
+            response, [(oid, _V2C.Integer(1)) for oid, _value in _V2C.apiPDU.getVarBinds(request)]
+        )
+        _V2C.apiMessage.setPDU(message, response)
+        sock.sendto(encoder.encode(message), peer)
+
+
+def _oids() -> list[str]:
+    host = HostConfig(name="bench", address="127.0.0.1", snmp_community="public", snmp_port=161)
+    return MonitorService([])._snmp_oids(host)
+
+
+def _encode(oid_batches: list[list[str]]) -> None:
+    for oids in oid_batches:
+        pdu = _V2C.GetRequestPDU()
+        _V2C.apiPDU.setDefaults(pdu)
+        _V2C.apiPDU.setVarBinds(pdu, [(oid, _V2C.Null("")) for oid in oids])
+        message = _V2C.Message()
+        _V2C.apiMessage.setDefaults(message)
+        _V2C.apiMessage.setCommunity(message, "public")
+        _V2C.apiMessage.setPDU(message, pdu)
+        encoder.encode(message)
+
+
+def _timed(action, repeats: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeats):
+        action()
+    return (time.perf_counter() - started) / repeats
+
+
+def _engine_per_get(port: int, oids: list[str], checks: int, reuse: bool) -> float:
+    engine = SnmpEngine() if reuse else None
+    if engine is not None:
+        _get(engine, port, oids[0])
+
+    def check() -> None:
+        for oid in oids[:GETS_PER_CHECK]:
+            _get(engine or SnmpEngine(), port, oid)
+
+    return _timed(check, checks)
+
+
+def _get(engine: SnmpEngine, port: int, oid: str) -> None:
+    error_indication, *_rest = next(
+        getCmd(
+            engine,
+            CommunityData("public", mpModel=1),
+            UdpTransportTarget(("127.0.0.1", port), timeout=1, retries=0),
+            ContextData(),
+            ObjectType(ObjectIdentity(oid)),
+        )
+    )
+    if error_indication:
+        raise RuntimeError(f"stub agent did not answer: {error_indication}")
+
+
+async def _shared_client(port: int, oids: list[str], checks: int) -> float:
+    client = SnmpClient(timeout=1)
+    started = time.perf_counter()
+    for _ in range(checks):
+        await client.get("127.0.0.1", port, "public", oids)
+    elapsed = time.perf_counter() - started
+    client.close()
+    return elapsed / checks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hosts", type=int, default=1000, help="inventory size to extrapolate to")
+    parser.add_argument("--sample", type=int, default=5, help="host checks to time per mode")
+    args = parser.parse_args()
+
+    ready: multiprocessing.Queue = multiprocessing.Queue()
+    agent = multiprocessing.Process(target=_stub_agent, args=(ready,), daemon=True)
+    agent.start()
+    port = ready.get(timeout=10)
+    try:
+        oids = _oids()
+        construct = _timed(SnmpEngine, args.sample)
+        encode_per_get = _timed(lambda: _encode([[oid] for oid in oids[:GETS_PER_CHECK]]), 100)
+        encode_shared = _timed(lambda: _encode([oids]), 100)
+        fresh = _engine_per_get(port, oids, args.sample, reuse=False)
+        reused = _engine_per_get(port, oids, args.sample * 10, reuse=True)
+        shared = asyncio.run(_shared_client(port, oids, args.sample * 10))
+    finally:
+        agent.terminate()
+        agent.join()
+
+    print(f"SnmpEngine() construction: {construct * 1000:.2f} ms")
+    print(
+        f"request encoding per check: {encode_per_get * 1000:.2f} ms as {GETS_PER_CHECK} GETs, "
+        f"{encode_shared * 1000:.2f} ms as one GET"
+    )
+    print(f"{'mode':<10}{'per check':>14}{f'per cycle ({args.hosts} hosts)':>30}")
+    for label, cost in (("per-GET", fresh), ("reused", reused), ("shared", shared)):
+        print(f"{label:<10}{cost * 1000:>11.2f} ms{cost * args.hosts:>27.2f} s")
+    print(
+        f"building an engine per GET accounts for {(fresh - reused) / fresh:.0%} "
+        "of a per-GET check"
+    )
+
+
+if __name__ == "__main__":
+    main()
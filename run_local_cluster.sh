@@ -0,0 +1,52 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+usage() {
+  cat <<USAGE
+Usage: $(basename "$0") [NODES] [--help]
+
+Runs a cluster on localhost: NODES (default 3) monitor nodes on ports 8001
+upward, each polling its consistent-hash share of config/hosts.yaml, plus a
+front instance on port 8000 that aggregates them. Press Ctrl+C to stop all
+processes. Run inside the virtualenv created by install_and_run.sh.
+
+Environment overrides:
+  FRONT_PORT   Port of the aggregating front instance (default: 8000)
+  BASE_PORT    Port of the first node (default: 8001)
+USAGE
+}
+
+if [[ ${1-} == "--help" ]]; then
+  usage
+  exit 0
+fi
+
+REPO_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+NODES="${1:-3}"
+FRONT_PORT="${FRONT_PORT:-8000}"
+BASE_PORT="${BASE_PORT:-8001}"
+
+node_urls=()
+for ((i = 0; i < NODES; i++)); do
+  node_urls+=("\"http://127.0.0.1:$((BASE_PORT + i))\"")
+done
+MONITOR_CLUSTER_NODES="[$(IFS=,; echo "${node_urls[*]}")]"
+export MONITOR_CLUSTER_NODES
+
+pids=()
+trap 'kill "${pids[@]}" 2>/dev/null || true' EXIT INT TERM
+
+cd "$REPO_DIR"
+for ((i = 0; i < NODES; i++)); do
+  port=$((BASE_PORT + i))
+  printf "Starting node on port %s\\n" "$port"
+  MONITOR_CLUSTER_SELF="http://127.0.0.1:$port" \
+    MONITOR_HISTORY_DB_PATH="$REPO_DIR/data/history-$port.sqlite3" \
+    uvicorn app.main:app --host 127.0.0.1 --port "$port" &
+  pids+=("$!")
+done
+
+printf "Starting front on port %s for %s\\n" "$FRONT_PORT" "$MONITOR_CLUSTER_NODES"
+MONITOR_HISTORY_DB_PATH="" uvicorn app.main:app --host 127.0.0.1 --port "$FRONT_PORT" &
+pids+=("$!")
+wait
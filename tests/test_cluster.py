@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+
+from app.cluster import HashRing, _relayed_frames, parent_groups
+from app.models import HostConfig
+
+
+def _host(address: str, parent: str | None = None) -> HostConfig:
+    return HostConfig(name=address, address=address, snmp_community="public", snmp_port=161, parent=parent)
+
+
+def _events(frames: list[str]) -> list[tuple[str, object]]:
+    parsed = []
+    for frame in frames:
+        event, data = frame.strip().split("\n")
+        parsed.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return parsed
+
+
+def test_reconnect_snapshot_resyncs_node_hosts():
+    known: set[str] = set()
+    first = json.dumps([{"address": "10.0.0.1"}, {"address": "10.0.0.2"}])
+    assert _events(_relayed_frames("snapshot", first, known)) == [
+        ("update", [{"address": "10.0.0.1"}, {"address": "10.0.0.2"}])
+    ]
+    _relayed_frames("update", json.dumps([{"address": "10.0.0.3"}]), known)
+
+    # 10.0.0.2 and 10.0.0.3 were deleted while the node was unreachable
+    again = json.dumps([{"address": "10.0.0.1"}])
+    assert _events(_relayed_frames("snapshot", again, known)) == [
+        ("update", [{"address": "10.0.0.1"}]),
+        ("removed", ["10.0.0.2", "10.0.0.3"]),
+    ]
+    assert known == {"10.0.0.1"}
+
+
+def test_hash_ring_is_stable_when_a_node_is_added():
+    addresses = [f"10.0.{i // 256}.{i % 256}" for i in range(2000)]
+    before = HashRing(["http://a", "http://b"])
+    after = HashRing(["http://a", "http://b", "http://c"])
+    moved = [address for address in addresses if before.owner(address) != after.owner(address)]
+    assert all(after.owner(address) == "http://c" for address in moved)
+
+
+def test_children_are_placed_with_their_parent():
+    hosts = [
+        _host("10.0.0.1"),
+        *(_host(f"10.0.1.{i}", parent="10.0.0.1") for i in range(20)),
+        *(_host(f"10.0.2.{i}", parent=f"10.0.1.{i}") for i in range(20)),
+    ]
+    ring = HashRing([f"http://node{i}" for i in range(4)], groups=parent_groups(hosts))
+    assert {ring.owner(host.address) for host in hosts} == {ring.owner("10.0.0.1")}
+
+
+def test_parent_cycle_shares_one_group():
+    hosts = [
+        _host("10.0.0.1", parent="10.0.0.2"),
+        _host("10.0.0.2", parent="10.0.0.1"),
+        _host("10.0.0.3", parent="10.0.0.1"),
+    ]
+    assert set(parent_groups(hosts).values()) == {"10.0.0.1"}
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+
+import pytest
+
+from app.icmp import IcmpEngine
+
+
+def _icmp_available() -> bool:
+    for kind in (socket.SOCK_RAW, socket.SOCK_DGRAM):
+        try:
+            socket.socket(socket.AF_INET, kind, socket.IPPROTO_ICMP).close()
+            return True
+        except OSError:
+            continue
+    return False
+
+
+pytestmark = pytest.mark.skipif(not _icmp_available(), reason="no ICMP socket access")
+
+
+@pytest.mark.parametrize("max_outstanding", [1024, 16])
+def test_concurrent_pings_lose_no_replies(max_outstanding):
+    # 16 leaves the buffer too small for the burst, so sends have to be paced
+    async def scenario() -> tuple[int, int]:
+        engine = IcmpEngine(max_outstanding=max_outstanding)
+        try:
+            results = await asyncio.gather(
+                *(engine.ping("127.0.0.1", count=3, timeout=2.0) for _ in range(500))
+            )
+        finally:
+            engine.close()
+        return sum(len(result.rtts_ms) for result in results), sum(r.sent for r in results)
+
+    received, sent = asyncio.run(scenario())
+    assert sent == 1500
+    assert received == sent
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+from pysnmp.proto import rfc1905  # type: ignore
+
+from app.icmp import PingResult
+from app.interfaces import InterfaceTable
+from app.models import HostConfig
+from app.monitor import (
+    CPU_IDLE_OID,
+    ENT_SENSOR_OID,
+    IF_IN_OID,
+    IF_OUT_OID,
+    SYSNAME_OID,
+    SYSUPTIME_OID,
+    MonitorService,
+)
+from app.settings import settings
+from app.snmp import CircuitBreaker, SnmpResponseError, SnmpTimeout
+
+
+def _host(address: str, parent: str | None = None) -> HostConfig:
+    return HostConfig(name=address, address=address, snmp_community="public", snmp_port=161, parent=parent)
+
+
+class _StubAgent:
+    """Stands in for the SNMP client: answers the OIDs in ``values`` and records every GET."""
+
+    def __init__(self, values: dict[str, object] | None = None) -> None:
+        self.values = dict(values or {})
+        self.requests: list[list[str]] = []
+        self.timing_out = False
+
+    async def get(self, address, port, community, oids, **kwargs):
+        oids = list(oids)
+        self.requests.append(oids)
+        if self.timing_out:
+            raise SnmpTimeout(f"No SNMP response from {address}:{port}")
+        return 0, 0, [(oid, self.values.get(oid, rfc1905.noSuchObject)) for oid in oids]
+
+    def close(self) -> None:
+        pass
+
+
+def _stubbed_service(host: HostConfig, agent: _StubAgent, reachable: list[bool]) -> MonitorService:
+    """A service whose pings answer while ``reachable[0]`` is true and whose SNMP is ``agent``."""
+
+    service = MonitorService([host])
+    service.snmp = agent  # type: ignore[assignment]
+
+    async def fake_ping(address: str, count: int | None = None, timeout: float | None = None):
+        return PingResult(sent=1, rtts_ms=[1.0] if reachable[0] else [])
+
+    service._ping = fake_ping  # type: ignore[method-assign]
+    return service
+
+
+def test_hosts_added_to_empty_service_are_polled(monkeypatch):
+    monkeypatch.setattr(settings, "monitor_interval_seconds", 0.2)
+
+    async def scenario() -> list[str]:
+        service = MonitorService([])
+        checked: list[str] = []
+
+        async def fake_check(host: HostConfig) -> None:
+            checked.append(host.address)
+
+        service._check_host = fake_check  # type: ignore[method-assign]
+        await service.start()
+        # let the loop go to sleep on an empty heap
+        await asyncio.sleep(0.05)
+        service.add_hosts([_host("127.0.0.1")])
+        await asyncio.sleep(1.0)
+        await service.stop()
+        return checked
+
+    assert "127.0.0.1" in asyncio.run(scenario())
+
+
+def test_discovered_hosts_are_polled_by_the_scheduler(monkeypatch):
+    # a host's first check would otherwise fall anywhere in a long interval
+    monkeypatch.setattr(settings, "monitor_interval_seconds", 3600)
+    monkeypatch.setattr(settings, "max_concurrent_checks", 2)
+
+    async def scenario() -> tuple[list[str], int]:
+        service = MonitorService([])
+        checked: list[str] = []
+        running = peak = 0
+
+        async def alive(address: str) -> bool:
+            return True
+
+        async def fake_check(host: HostConfig) -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            checked.append(host.address)
+            running -= 1
+
+        service.discovery._probe = alive
+        service._check_host = fake_check  # type: ignore[method-assign]
+        await service.start()
+        job = service.start_discovery("10.0.0.1-10.0.0.8")
+        await asyncio.sleep(1.0)
+        await service.stop()
+        assert job.added == 8
+        return checked, peak
+
+    checked, peak = asyncio.run(scenario())
+    assert sorted(checked) == [f"10.0.0.{i}" for i in range(1, 9)]
+    assert peak <= 2
+
+
+def test_rediscovery_sweeps_the_whole_range():
+    async def scenario():
+        service = MonitorService([_host("10.0.0.1"), _host("10.0.0.2")])
+        service.owns = lambda address: address != "10.0.0.3"
+
+        async def alive(address: str) -> bool:
+            return True
+
+        service.discovery._probe = alive
+        job = service.start_discovery("10.0.0.1-10.0.0.4")
+        for _ in range(100):
+            if job.state != "running":
+                break
+            await asyncio.sleep(0.01)
+        await service.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.state == "completed"
+    assert job.swept == job.total == 4
+    assert (job.added, job.skipped) == (1, 3)
+
+
+def _table_after_failed_walk(walk) -> InterfaceTable:
+    async def scenario() -> InterfaceTable:
+        service = MonitorService([])
+        host = HostConfig(
+            name="switch", address="10.0.0.1", snmp_community="public", snmp_port=161, all_interfaces=True
+        )
+        table = InterfaceTable()
+        table.update({1: (100, 200)}, {1: "eth0"}, 2**64, datetime.utcnow())
+        service.interface_tables[host.address] = table
+        service.snmp.walk_columns = walk  # type: ignore[method-assign]
+        await service._collect_interface_table(host, datetime.utcnow())
+        return service.interface_tables[host.address]
+
+    return asyncio.run(scenario())
+
+
+def test_interface_walk_error_keeps_previous_table():
+    async def failing_walk(*args, **kwargs):
+        raise SnmpResponseError("error status 5 during a walk")
+
+    table = _table_after_failed_walk(failing_walk)
+    assert list(table.indexes) == [1]
+    assert list(table.in_octets) == [100]
+
+
+def test_interface_walk_with_non_counter_values_keeps_previous_table():
+    async def garbled_walk(address, port, community, columns, **kwargs):
+        return {column: [("1", "not a counter")] for column in columns}
+
+    table = _table_after_failed_walk(garbled_walk)
+    assert list(table.in_octets) == [100]
+
+
+def test_breaker_skips_snmp_while_open_and_probes_after_cool_down(monkeypatch):
+    monkeypatch.setattr(settings, "snmp_breaker_threshold", 2)
+    monkeypatch.setattr(settings, "snmp_breaker_cooldown_seconds", 60.0)
+    host = _host("10.0.0.1")
+    agent = _StubAgent()
+
+    async def scenario() -> None:
+        service = _stubbed_service(host, agent, reachable=[True])
+        status = service.statuses[host.address]
+        agent.timing_out = True
+        await service._check_host(host)
+        await service._check_host(host)
+        assert status.snmp_breaker == CircuitBreaker.OPEN
+
+        sent = len(agent.requests)
+        await service._check_host(host)
+        assert len(agent.requests) == sent
+        assert status.snmp_skipped == 1
+        assert status.reachable
+
+        breaker = service._snmp_breakers[host.address]
+        # the cool-down has passed; the half-open probe times out again
+        breaker.opened_at -= 60
+        await service._check_host(host)
+        assert len(agent.requests) == sent + 1
+        assert status.snmp_breaker == CircuitBreaker.OPEN
+        await service._check_host(host)
+        assert len(agent.requests) == sent + 1
+
+        # and after the next cool-down a probe that is answered closes it
+        breaker.opened_at -= 60
+        agent.timing_out = False
+        await service._check_host(host)
+        assert status.snmp_breaker == CircuitBreaker.CLOSED
+        await service._check_host(host)
+        assert len(agent.requests) > sent + 2
+        await service.stop()
+
+    asyncio.run(scenario())
+
+
+def test_unreachable_host_is_not_polled_over_snmp():
+    host = _host("10.0.0.1")
+    agent = _StubAgent()
+
+    async def scenario() -> None:
+        service = _stubbed_service(host, agent, reachable=[False])
+        await service._check_host(host)
+        status = service.statuses[host.address]
+        assert agent.requests == []
+        assert status.snmp_skipped == 1
+        assert status.snmp_breaker == CircuitBreaker.CLOSED
+        await service.stop()
+
+    asyncio.run(scenario())
+
+
+def test_oid_capability_cache(monkeypatch):
+    monkeypatch.setattr(settings, "snmp_capability_ttl_seconds", 60.0)
+    host = _host("10.0.0.1")
+    # an agent with entPhySensor rather than lm-sensors, and 32-bit counters only
+    answered = {
+        SYSUPTIME_OID: 1000,
+        SYSNAME_OID: "router",
+        CPU_IDLE_OID: 90,
+        ENT_SENSOR_OID.format(index=1): 40,
+        IF_IN_OID.format(index=1): 1,
+        IF_OUT_OID.format(index=1): 2,
+    }
+    agent = _StubAgent(answered)
+
+    async def scenario() -> None:
+        service = _stubbed_service(host, agent, reachable=[True])
+        candidates = set(service._snmp_oids(host))
+
+        async def next_request() -> set[str]:
+            agent.requests.clear()
+            await service._poll_snmp(host)
+            return set().union(*agent.requests)
+
+        assert await next_request() == candidates
+        assert await next_request() == set(answered)
+
+        # the cache expires after its TTL
+        learned_at, oids = service._oid_capabilities[host.address]
+        service._oid_capabilities[host.address] = (learned_at - 61, oids)
+        assert await next_request() == candidates
+        assert await next_request() == set(answered)
+
+        # sysUpTime going backwards means the agent restarted
+        agent.values[SYSUPTIME_OID] = 10
+        assert await next_request() == set(answered)
+        assert await next_request() == candidates
+        assert await next_request() == set(answered)
+
+        # a learned OID that stops answering
+        del agent.values[CPU_IDLE_OID]
+        assert await next_request() == set(answered)
+        assert await next_request() == candidates
+        assert await next_request() == set(answered) - {CPU_IDLE_OID}
+        await service.stop()
+
+    asyncio.run(scenario())
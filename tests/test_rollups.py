@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from app.history import to_epoch
+from app.models import HostStatus
+from app.rollups import RollupStore, merge_rows, to_rollup
+from app.storage import SampleStorage
+
+# recent enough that rollup retention keeps it
+_MINUTE = datetime.utcnow().replace(second=0, microsecond=0)
+
+
+def _record(storage: SampleStorage, latencies: list[float], first_second: int) -> RollupStore:
+    rollups = RollupStore(storage)
+    rollups.add("10.0.0.1")
+    for offset, latency in enumerate(latencies):
+        status = HostStatus(name="r1", address="10.0.0.1", latency_ms=latency, reachable=True)
+        rollups.record("10.0.0.1", status, _MINUTE.replace(second=first_second + offset))
+    return rollups
+
+
+def test_bucket_open_across_restart_keeps_earlier_samples(tmp_path):
+    path = tmp_path / "history.sqlite3"
+    before = SampleStorage(path)
+    _record(before, [10.0, 30.0], 0).flush()
+    before.close()
+
+    after = SampleStorage(path)
+    _record(after, [5.0], 30).flush()
+    after.close()
+
+    start = to_epoch(_MINUTE)
+    rows = SampleStorage(path).read_rollups("1m", "10.0.0.1", start, start)
+    assert len(rows) == 1
+    rollup = to_rollup("1m", rows[0])
+    assert rollup.count == 3
+    assert rollup.minimum["latency_ms"] == 5.0
+    assert rollup.maximum["latency_ms"] == 30.0
+    assert rollup.latency_ms == 15.0
+
+
+def test_merge_rows_matches_one_bucket():
+    whole = _record(None, [10.0, 30.0, 5.0], 0).open_row("10.0.0.1", "1m")
+    first = _record(None, [10.0, 30.0], 0).open_row("10.0.0.1", "1m")
+    second = _record(None, [5.0], 2).open_row("10.0.0.1", "1m")
+    assert merge_rows(first, second) == whole
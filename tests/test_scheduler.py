@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import time
+
+from app.scheduler import HostScheduler
+
+
+def test_readded_host_has_one_live_heap_item():
+    scheduler = HostScheduler(interval=10, jitter=0)
+    scheduler.add("10.0.0.1")
+    scheduler.remove("10.0.0.1")
+    scheduler.add("10.0.0.1")
+    due = scheduler.pop_due(time.monotonic() + 60)
+    assert [address for address, _lag in due] == ["10.0.0.1"]
+
+
+def test_rescheduled_host_is_due_once():
+    scheduler = HostScheduler(interval=10, jitter=0)
+    scheduler.add("10.0.0.1")
+    scheduler.expedite("10.0.0.1", 0)
+    assert [address for address, _lag in scheduler.pop_due(time.monotonic())] == ["10.0.0.1"]
+    scheduler.done("10.0.0.1", reachable=True)
+    assert scheduler.pop_due(time.monotonic()) == []
+    assert len(scheduler.pop_due(time.monotonic() + 60)) == 1
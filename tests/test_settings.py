@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import json
+
+from app import settings as settings_module
+from app.settings import Settings, load_settings, persist_settings
+
+
+def test_deployment_settings_are_not_persisted(tmp_path, monkeypatch):
+    path = tmp_path / "settings.json"
+    monkeypatch.setattr(settings_module, "SETTINGS_PATH", path)
+    saved = Settings(
+        cluster_self="http://127.0.0.1:8001",
+        cluster_nodes=["http://127.0.0.1:8001", "http://127.0.0.1:8002"],
+        history_db_path="/tmp/node-1.sqlite3",
+        poll_workers=4,
+        latency_threshold_ms=99.0,
+    )
+    persist_settings(saved)
+    stored = json.loads(path.read_text())
+    assert stored["latency_threshold_ms"] == 99.0
+    assert not {"cluster_self", "cluster_nodes", "history_db_path", "poll_workers"} & set(stored)
+
+
+def test_old_settings_files_do_not_override_identity(tmp_path, monkeypatch):
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({"cluster_self": "http://other:8000", "latency_threshold_ms": 42.0}))
+    monkeypatch.setattr(settings_module, "SETTINGS_PATH", path)
+    monkeypatch.setenv("MONITOR_CLUSTER_SELF", "http://127.0.0.1:8002")
+    loaded = load_settings()
+    assert loaded.cluster_self == "http://127.0.0.1:8002"
+    assert loaded.latency_threshold_ms == 42.0
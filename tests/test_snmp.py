@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.snmp import CircuitBreaker, SnmpClient, SnmpResponseError
+
+_COLUMN = "1.3.6.1.2.1.31.1.1.1.6"
+
+
+def _walk(responses: list[tuple[int, int, list]]) -> dict[str, list[tuple[str, object]]]:
+    client = SnmpClient()
+    replies = iter(responses)
+
+    async def get_bulk(*args, **kwargs):
+        return next(replies)
+
+    client.get_bulk = get_bulk  # type: ignore[method-assign]
+    return asyncio.run(client.walk_columns("192.0.2.1", 161, "public", [_COLUMN]))
+
+
+def test_walk_rejected_outright_is_empty():
+    assert _walk([(2, 1, [])]) == {_COLUMN: []}
+
+
+def test_error_part_way_through_a_walk_raises():
+    with pytest.raises(SnmpResponseError):
+        _walk([(0, 0, [(f"{_COLUMN}.1", 5)]), (5, 1, [])])
+
+
+def test_malformed_oid_in_a_walk_raises():
+    with pytest.raises(SnmpResponseError):
+        _walk([(0, 0, [(f"{_COLUMN}.x", 5)])])
+
+
+def test_breaker_opens_after_threshold_timeouts():
+    breaker = CircuitBreaker(threshold=3, cooldown=60)
+    for now in (0.0, 1.0):
+        assert breaker.allow(now)
+        breaker.record(False, now)
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record(False, 2.0)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow(3.0)
+    assert not breaker.allow(61.9)
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(threshold=2, cooldown=60)
+    breaker.record(False, 0.0)
+    breaker.record(True, 1.0)
+    breaker.record(False, 2.0)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_probe_decides_the_next_state():
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    breaker.record(False, 0.0)
+    # one probe after the cool-down; a second caller waits for its answer
+    assert breaker.allow(60.0)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow(61.0)
+    breaker.record(False, 62.0)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow(100.0)
+    assert breaker.allow(122.0)
+    breaker.record(True, 123.0)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow(124.0)
+
+
+def test_lost_half_open_probe_is_rearmed_after_the_cool_down():
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    breaker.record(False, 0.0)
+    assert breaker.allow(60.0)
+    assert not breaker.allow(119.0)
+    assert breaker.allow(120.0)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.models import HostConfig
+from app.workers import RESULT_FIELDS, ResultRecord, ShardPool
+
+
+def _host(address: str, parent: str | None = None) -> HostConfig:
+    return HostConfig(name=address, address=address, snmp_community="public", snmp_port=161, parent=parent)
+
+
+def _fast_polling(monkeypatch) -> None:
+    # workers are spawned processes and read their settings from the environment
+    monkeypatch.setenv("MONITOR_MONITOR_INTERVAL_SECONDS", "1")
+    monkeypatch.setenv("MONITOR_PING_COUNT", "1")
+    monkeypatch.setenv("MONITOR_PING_TIMEOUT_SECONDS", "0.5")
+    monkeypatch.setenv("MONITOR_SNMP_TIMEOUT_SECONDS", "0.2")
+    monkeypatch.setenv("MONITOR_HISTORY_DB_PATH", "")
+
+
+def test_shard_pool_delivers_results(monkeypatch):
+    _fast_polling(monkeypatch)
+    hosts = [_host("127.0.0.1"), _host("127.0.0.2"), _host("127.0.0.3")]
+
+    async def scenario() -> list[ResultRecord]:
+        received: list[ResultRecord] = []
+        arrived = asyncio.Event()
+
+        async def on_results(batch: list[ResultRecord]) -> None:
+            received.extend(batch)
+            arrived.set()
+
+        pool = ShardPool(2, on_results)
+        pool.start(hosts)
+        try:
+            assert sorted(pool.sizes()) == [1, 2]
+            await asyncio.wait_for(arrived.wait(), 30)
+        finally:
+            await pool.stop()
+        return received
+
+    records = asyncio.run(scenario())
+    assert records
+    assert {record[0] for record in records} <= {host.address for host in hosts}
+
+
+def test_workers_apply_changed_thresholds(monkeypatch):
+    _fast_polling(monkeypatch)
+    host = _host("127.0.0.1")
+    notes = RESULT_FIELDS.index("notes")
+
+    async def scenario() -> list[str]:
+        flagged: asyncio.Future[list[str]] = asyncio.get_running_loop().create_future()
+
+        async def on_results(batch: list[ResultRecord]) -> None:
+            for record in batch:
+                if any(note.startswith("High latency") for note in record[2][notes]):
+                    if not flagged.done():
+                        flagged.set_result(record[2][notes])
+
+        pool = ShardPool(1, on_results)
+        pool.start([host])
+        try:
+            # any measured round trip exceeds a zero threshold
+            pool.broadcast("settings", {"latency_threshold_ms": 0.0})
+            return await asyncio.wait_for(flagged, 30)
+        finally:
+            await pool.stop()
+
+    assert asyncio.run(scenario())
+
+
+def test_child_is_polled_in_its_parents_shard(monkeypatch):
+    _fast_polling(monkeypatch)
+    # reserved 240/4 addresses never answer, so the child's canary fails too
+    parent = _host("240.0.0.1")
+    child = _host("240.0.0.2", parent="240.0.0.1")
+    suppressed_by = RESULT_FIELDS.index("suppressed_by")
+
+    async def scenario() -> tuple[list[int], list[ResultRecord]]:
+        received: list[ResultRecord] = []
+        suppressed = asyncio.Event()
+
+        async def on_results(batch: list[ResultRecord]) -> None:
+            received.extend(batch)
+            if any(
+                record[0] == child.address and record[2][suppressed_by] == parent.address
+                for record in batch
+            ):
+                suppressed.set()
+
+        pool = ShardPool(2, on_results)
+        # the child arrives first and would otherwise get the other, emptier worker
+        pool.start([child, parent])
+        shards = [pool._shard_of[child.address], pool._shard_of[parent.address]]
+        try:
+            await asyncio.wait_for(suppressed.wait(), 30)
+        finally:
+            await pool.stop()
+        return shards, received
+
+    shards, records = asyncio.run(scenario())
+    assert shards[0] == shards[1]
+    assert any(record[0] == child.address for record in records)
+
+
+def test_rebalance_keeps_parent_groups_together():
+    pool = ShardPool(2, on_results=None)  # type: ignore[arg-type]
+    # no processes: only the placement bookkeeping is exercised
+    pool._commands = [_DiscardQueue(), _DiscardQueue()]
+    hosts = [_host("10.0.0.1"), *(_host(f"10.0.1.{i}", parent="10.0.0.1") for i in range(4))]
+    hosts += [_host(f"10.0.2.{i}") for i in range(4)]
+    pool.add(hosts)
+    group_shard = pool._shard_of["10.0.0.1"]
+    assert all(pool._shard_of[f"10.0.1.{i}"] == group_shard for i in range(4))
+    pool.remove([f"10.0.2.{i}" for i in range(4)])
+    assert all(pool._shard_of[f"10.0.1.{i}"] == group_shard for i in range(4))
+
+
+class _DiscardQueue:
+    def put(self, item: object) -> None:
+        pass